@@ -1,32 +1,259 @@
 """Goals API handler."""
 
+import hashlib
+import importlib.util
+import json
 import uuid
 from datetime import UTC, datetime
+from typing import Any
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Header, HTTPException, Query, Response
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import TypeAdapter
 
-from client import GoalsClient, get_settings
-from models import GoalCreate, GoalResponse, GoalUpdate
+from cache import CachedClient, Partition, TTLCache
+from client import (
+    GoalsClient,
+    decode_cursor,
+    encode_cursor,
+    get_settings,
+    run_sync,
+)
+from models import (
+    GoalCreate,
+    GoalPageResponse,
+    GoalResponse,
+    GoalUpdate,
+    goal_fields_model,
+)
 
 router = APIRouter(prefix="/goals", tags=["goals"])
 
 settings = get_settings()
-db = GoalsClient(settings.goals_table_name)
 
+# Upper bound on ids= so one request cannot fan out unbounded BatchGetItem calls
+MAX_BATCH_GET_IDS = 500
 
-@router.get("", response_model=list[GoalResponse])
-async def list_goals(user_id: str) -> list[GoalResponse]:
-    """List all goals for a user."""
-    items = db.query("user_id", user_id)
-    return [GoalResponse(**item) for item in items]
+# Page sizes for limit/cursor pagination; without either the full list is returned
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+
+# Primary key attributes, always returned with fields= so items stay addressable
+KEY_FIELDS = ("user_id", "goal_id")
+
+# Whole partitions are cached per container in front of DynamoDB; see
+# CachedClient for when entries are invalidated
+partition_cache: TTLCache[str, Partition] = TTLCache(
+    settings.partition_cache_max_size, settings.partition_cache_ttl_seconds
+)
+db = CachedClient(GoalsClient(settings.goals_table_name), partition_cache, KEY_FIELDS)
+
+# Browsers may keep responses but must revalidate them with If-None-Match
+REVALIDATE = "private, no-cache"
+
+# ORJSONResponse needs orjson, an optional dependency; without it the setting
+# falls back to the standard encoder
+response_class: type[JSONResponse] = (
+    ORJSONResponse
+    if settings.orjson_responses and importlib.util.find_spec("orjson")
+    else JSONResponse
+)
+
+# Items read back from our own table are validated once by a TypeAdapter and
+# dumped straight to JSON, instead of being built into models and validated
+# again for response_model; request bodies are still validated as before
+goal_list_adapter = TypeAdapter(list[GoalResponse])
+goal_page_adapter = TypeAdapter(GoalPageResponse)
+
+
+@router.get("", response_model=list[GoalResponse] | GoalPageResponse)
+async def list_goals(
+    user_id: str,
+    ids: str | None = Query(None, description="Comma-separated goal IDs to fetch"),
+    limit: int | None = Query(
+        None, ge=1, le=MAX_PAGE_SIZE, description="Page size; returns one page"
+    ),
+    cursor: str | None = Query(None, description="next_cursor of the previous page"),
+    fields: str | None = Query(
+        None, description="Comma-separated fields to return; keys are always included"
+    ),
+    if_none_match: str | None = Header(None),
+) -> Response:
+    """List all goals for a user, or only the goals with the given IDs.
+
+    With ids, the goals are read with BatchGetItem and returned in the
+    order requested; unknown IDs are left out.
+
+    With limit or cursor, one page is returned along with the cursor of the
+    next page, which is null on the last page.
+
+    With fields, only those attributes are read from DynamoDB (as a
+    ProjectionExpression) and returned; a full list already in the cache is
+    trimmed in memory instead.
+
+    The full list carries a weak ETag of the user's change counter, which
+    every write bumps. With a matching If-None-Match, only the counter is
+    read and 304 is returned.
+    """
+    selected = _parse_fields(fields)
+    projection = list(selected) if selected else None
+
+    if limit is not None or cursor is not None:
+        if ids is not None:
+            raise HTTPException(
+                status_code=422, detail="ids cannot be combined with limit or cursor"
+            )
+        items, next_cursor = await _read_goals_page(
+            user_id, limit or DEFAULT_PAGE_SIZE, cursor, projection
+        )
+        if selected is None:
+            return _json_response(
+                goal_page_adapter, {"items": items, "next_cursor": next_cursor}
+            )
+        return response_class(
+            {"items": _render_fields(items, selected), "next_cursor": next_cursor}
+        )
+
+    if ids is not None:
+        items = await _read_goals_by_ids(user_id, ids, projection)
+        headers = None
+    else:
+        # The counter is read first, so the items are at least as new as it
+        version = await run_sync(db.get_version, user_id)
+        etag = version_etag(user_id, version)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        items = await run_sync(
+            db.query, "user_id", user_id, projection, version=version
+        )
+        headers = cache_headers(etag)
+
+    if selected is None:
+        return _json_response(goal_list_adapter, items, headers)
+    return response_class(_render_fields(items, selected), headers=headers)
+
+
+def _json_response(
+    adapter: TypeAdapter[Any], content: Any, headers: dict[str, str] | None = None
+) -> Response:
+    """Validate trusted content in one pass and render it as JSON."""
+    return Response(
+        content=adapter.dump_json(adapter.validate_python(content)),
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+def weak_etag(data: bytes) -> str:
+    """Build a weak ETag from data identifying a representation."""
+    return f'W/"{hashlib.blake2b(data, digest_size=16).hexdigest()}"'
+
+
+def items_etag(items: list[dict[str, Any]]) -> str:
+    """Build the ETag of a list of goals from their IDs and updated_at."""
+    versions = sorted((item["goal_id"], item.get("updated_at") or "") for item in items)
+    return weak_etag(json.dumps(versions).encode())
+
+
+def version_etag(owner_id: str, version: int) -> str:
+    """Build the ETag of a user's goals from their change counter."""
+    return weak_etag(f"{owner_id}:{version}".encode())
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Compare an If-None-Match header with an ETag, weakly as for GET."""
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(",")
+    )
+
+
+def cache_headers(etag: str) -> dict[str, str]:
+    """Headers letting a browser revalidate a response with If-None-Match."""
+    return {"ETag": etag, "Cache-Control": REVALIDATE}
+
+
+def not_modified(etag: str) -> Response:
+    """An empty 304 for a request whose If-None-Match matched etag."""
+    return Response(status_code=304, headers=cache_headers(etag))
+
+
+def _parse_fields(fields: str | None) -> tuple[str, ...] | None:
+    """Resolve fields= to GoalResponse fields in declaration order."""
+    if fields is None:
+        return None
+    requested = {name for name in fields.split(",") if name}
+    unknown = requested - GoalResponse.model_fields.keys()
+    if unknown:
+        raise HTTPException(
+            status_code=422, detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+        )
+    requested.update(KEY_FIELDS)
+    return tuple(name for name in GoalResponse.model_fields if name in requested)
+
+
+def _render_fields(
+    items: list[dict[str, Any]], fields: tuple[str, ...]
+) -> list[dict[str, Any]]:
+    """Validate projected items against a GoalResponse trimmed to fields."""
+    model = goal_fields_model(fields)
+    return [model(**item).model_dump(mode="json") for item in items]
+
+
+async def _read_goals_by_ids(
+    user_id: str, ids: str, projection: list[str] | None
+) -> list[dict[str, Any]]:
+    """Read the goals listed in ids, in the order requested."""
+    goal_ids = list(dict.fromkeys(goal_id for goal_id in ids.split(",") if goal_id))
+    if not goal_ids or len(goal_ids) > MAX_BATCH_GET_IDS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"ids must list 1 to {MAX_BATCH_GET_IDS} goal IDs",
+        )
+    items = await run_sync(
+        db.batch_get,
+        [{"user_id": user_id, "goal_id": goal_id} for goal_id in goal_ids],
+        projection=projection,
+    )
+    by_id = {item["goal_id"]: item for item in items}
+    return [by_id[goal_id] for goal_id in goal_ids if goal_id in by_id]
+
+
+async def _read_goals_page(
+    user_id: str, limit: int, cursor: str | None, projection: list[str] | None
+) -> tuple[list[dict[str, Any]], str | None]:
+    """Read one page of a user's goals, starting after cursor."""
+    start_key = None
+    if cursor is not None:
+        try:
+            start_key = decode_cursor(cursor, KEY_FIELDS, user_id=user_id)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e)) from e
+    items, last_key = await run_sync(
+        db.query_page, "user_id", user_id, limit, start_key, projection
+    )
+    return items, encode_cursor(last_key)
 
 
 @router.get("/{goal_id}", response_model=GoalResponse)
-async def get_goal(goal_id: str, user_id: str) -> GoalResponse:
+async def get_goal(
+    goal_id: str,
+    user_id: str,
+    response: Response,
+    if_none_match: str | None = Header(None),
+) -> GoalResponse | Response:
     """Get a single goal by ID."""
-    item = db.get_item({"user_id": user_id, "goal_id": goal_id})
+    item = await run_sync(db.get_item, {"user_id": user_id, "goal_id": goal_id})
     if not item:
         raise HTTPException(status_code=404, detail="Goal not found")
+    etag = items_etag([item])
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers.update(cache_headers(etag))
     return GoalResponse(**item)
 
 
@@ -43,30 +270,26 @@ async def create_goal(user_id: str, goal: GoalCreate) -> GoalResponse:
         "created_at": now,
         "updated_at": now,
     }
-    db.put_item(item)
+    await run_sync(db.put_item, item)
     return GoalResponse(**item)
 
 
 @router.put("/{goal_id}", response_model=GoalResponse)
 async def update_goal(goal_id: str, user_id: str, goal: GoalUpdate) -> GoalResponse:
     """Update a goal."""
-    existing = db.get_item({"user_id": user_id, "goal_id": goal_id})
-    if not existing:
-        raise HTTPException(status_code=404, detail="Goal not found")
-
     update_data = goal.model_dump(exclude_unset=True)
     update_data["updated_at"] = datetime.now(UTC).isoformat()
 
-    updated_item = {**existing, **update_data}
-    db.put_item(updated_item)
+    updated_item = await run_sync(
+        db.update_item, {"user_id": user_id, "goal_id": goal_id}, update_data
+    )
+    if not updated_item:
+        raise HTTPException(status_code=404, detail="Goal not found")
     return GoalResponse(**updated_item)
 
 
 @router.delete("/{goal_id}", status_code=204)
 async def delete_goal(goal_id: str, user_id: str) -> None:
     """Delete a goal."""
-    existing = db.get_item({"user_id": user_id, "goal_id": goal_id})
-    if not existing:
+    if not await run_sync(db.delete_item, {"user_id": user_id, "goal_id": goal_id}):
         raise HTTPException(status_code=404, detail="Goal not found")
-
-    db.delete_item({"user_id": user_id, "goal_id": goal_id})
@@ -1,8 +1,9 @@
 """Data models for Goals API."""
 
 from enum import Enum
+from functools import lru_cache
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, create_model
 
 
 class TimestampMixin(BaseModel):
@@ -52,3 +53,25 @@ class GoalResponse(GoalBase, TimestampMixin):
 
     goal_id: str
     user_id: str
+
+
+@lru_cache(maxsize=64)
+def goal_fields_model(fields: tuple[str, ...]) -> type[BaseModel]:
+    """Build a GoalResponse variant with only the given fields, for fields=."""
+    return create_model(
+        "GoalFieldsResponse",
+        **{
+            name: (
+                GoalResponse.model_fields[name].annotation,
+                GoalResponse.model_fields[name],
+            )
+            for name in fields
+        },
+    )
+
+
+class GoalPageResponse(BaseModel):
+    """One page of goals; pass next_cursor as cursor to get the next page."""
+
+    items: list[GoalResponse]
+    next_cursor: str | None = None
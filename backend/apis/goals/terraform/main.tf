@@ -23,4 +23,5 @@ module "goals_api" {
   lambda_memory  = var.lambda_memory
   lambda_timeout = var.lambda_timeout
   dynamodb_table = var.dynamodb_table
+  versions_table = var.versions_table
 }
@@ -39,3 +39,9 @@ variable "dynamodb_table" {
   type        = string
   default     = "personal-growth-tracker-goals"
 }
+
+variable "versions_table" {
+  description = "DynamoDB per-user change counter table name"
+  type        = string
+  default     = "personal-growth-tracker-versions"
+}
@@ -1,5 +1,6 @@
 """Tests for Goals API handler."""
 
+from decimal import Decimal
 from unittest.mock import patch
 
 import pytest
@@ -45,6 +46,23 @@ class TestListGoals:
         assert len(data) == 1
         assert data[0]["title"] == "Learn Python"
 
+    def test_list_goals_decimal_numbers(self, client, mock_dynamodb):
+        """Test that DynamoDB Decimal numbers are rendered as JSON integers."""
+        mock_dynamodb.query.return_value = [
+            {
+                "user_id": "user-1",
+                "goal_id": "goal-1",
+                "title": "Learn Python",
+                "priority": Decimal("5"),
+            }
+        ]
+
+        response = client.get("/api/v1/goals?user_id=user-1")
+
+        assert response.status_code == 200
+        assert response.json()[0]["priority"] == 5
+        assert b'"priority":5' in response.content
+
     def test_list_goals_empty(self, client, mock_dynamodb):
         """Test empty goal list."""
         mock_dynamodb.query.return_value = []
@@ -54,6 +72,167 @@ class TestListGoals:
         assert response.status_code == 200
         assert response.json() == []
 
+    def test_list_goals_by_ids(self, client, mock_dynamodb):
+        """Test that ids are fetched in one batch and returned in order."""
+        mock_dynamodb.batch_get.return_value = [
+            {
+                "user_id": "user-1",
+                "goal_id": goal_id,
+                "title": "Learn Python",
+                "status": "in_progress",
+                "priority": 5,
+                "created_at": "2024-01-01T00:00:00Z",
+                "updated_at": "2024-01-01T00:00:00Z",
+            }
+            for goal_id in ("goal-2", "goal-1")
+        ]
+
+        response = client.get(
+            "/api/v1/goals?user_id=user-1&ids=goal-1,goal-2,missing,goal-1"
+        )
+
+        assert response.status_code == 200
+        assert [item["goal_id"] for item in response.json()] == ["goal-1", "goal-2"]
+        [keys] = mock_dynamodb.batch_get.call_args.args
+        assert keys == [
+            {"user_id": "user-1", "goal_id": "goal-1"},
+            {"user_id": "user-1", "goal_id": "goal-2"},
+            {"user_id": "user-1", "goal_id": "missing"},
+        ]
+        mock_dynamodb.query.assert_not_called()
+
+    @pytest.mark.parametrize("ids", [",", ",".join(str(i) for i in range(501))])
+    def test_list_goals_by_ids_invalid(self, client, mock_dynamodb, ids):
+        """Test that empty and oversized id lists are rejected."""
+        response = client.get(f"/api/v1/goals?user_id=user-1&ids={ids}")
+
+        assert response.status_code == 422
+        mock_dynamodb.batch_get.assert_not_called()
+
+    def test_list_goals_page(self, client, mock_dynamodb):
+        """Test that limit returns one page and a cursor for the next."""
+        mock_dynamodb.query_page.return_value = (
+            [
+                {
+                    "user_id": "user-1",
+                    "goal_id": "goal-1",
+                    "title": "Learn Python",
+                    "status": "in_progress",
+                    "priority": 5,
+                    "created_at": "2024-01-01T00:00:00Z",
+                    "updated_at": "2024-01-01T00:00:00Z",
+                }
+            ],
+            {"user_id": "user-1", "goal_id": "goal-1"},
+        )
+
+        response = client.get("/api/v1/goals?user_id=user-1&limit=1")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [item["goal_id"] for item in data["items"]] == ["goal-1"]
+        mock_dynamodb.query_page.assert_called_once_with(
+            "user_id", "user-1", 1, None, None
+        )
+
+        mock_dynamodb.query_page.return_value = ([], None)
+        response = client.get(
+            f"/api/v1/goals?user_id=user-1&cursor={data['next_cursor']}"
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"items": [], "next_cursor": None}
+        mock_dynamodb.query_page.assert_called_with(
+            "user_id", "user-1", 50, {"user_id": "user-1", "goal_id": "goal-1"}, None
+        )
+        mock_dynamodb.query.assert_not_called()
+
+    @pytest.mark.parametrize(
+        "params",
+        ["cursor=garbage", "limit=0", "limit=101", "ids=goal-1&limit=10"],
+    )
+    def test_list_goals_page_invalid(self, client, mock_dynamodb, params):
+        """Test that bad cursors, limits and ids with paging are rejected."""
+        response = client.get(f"/api/v1/goals?user_id=user-1&{params}")
+
+        assert response.status_code == 422
+        mock_dynamodb.query_page.assert_not_called()
+
+    def test_list_goals_fields(self, client, mock_dynamodb):
+        """Test that fields becomes a projection and trims the response."""
+        mock_dynamodb.query.return_value = [
+            {"user_id": "user-1", "goal_id": "goal-1", "title": "Learn Python"}
+        ]
+
+        response = client.get("/api/v1/goals?user_id=user-1&fields=title")
+
+        assert response.status_code == 200
+        assert response.json() == [
+            {"user_id": "user-1", "goal_id": "goal-1", "title": "Learn Python"}
+        ]
+        [_, _, projection] = mock_dynamodb.query.call_args.args
+        assert sorted(projection) == sorted(["user_id", "goal_id", "title"])
+
+    def test_list_goals_unknown_fields(self, client, mock_dynamodb):
+        """Test that fields outside the response model are rejected."""
+        response = client.get("/api/v1/goals?user_id=user-1&fields=title,secret")
+
+        assert response.status_code == 422
+        assert response.json()["detail"] == "Unknown fields: secret"
+        mock_dynamodb.query.assert_not_called()
+
+    def test_list_goals_not_modified(self, client, mock_dynamodb):
+        """Test that a matching If-None-Match is answered from the counter."""
+        mock_dynamodb.get_version.return_value = 3
+        mock_dynamodb.query.return_value = [
+            {
+                "user_id": "user-1",
+                "goal_id": "goal-1",
+                "title": "Learn Python",
+                "updated_at": "2024-01-01",
+            }
+        ]
+
+        response = client.get("/api/v1/goals?user_id=user-1")
+        etag = response.headers["ETag"]
+
+        assert etag.startswith('W/"')
+        assert response.headers["Cache-Control"] == "private, no-cache"
+
+        mock_dynamodb.query.reset_mock()
+        response = client.get(
+            "/api/v1/goals?user_id=user-1", headers={"If-None-Match": etag}
+        )
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["ETag"] == etag
+        mock_dynamodb.query.assert_not_called()
+        mock_dynamodb.get_version.assert_called_with("user-1")
+
+    def test_list_goals_modified(self, client, mock_dynamodb):
+        """Test that a stale If-None-Match gets the full list and a new ETag."""
+        mock_dynamodb.get_version.return_value = 3
+        mock_dynamodb.query.return_value = [
+            {
+                "user_id": "user-1",
+                "goal_id": "goal-1",
+                "title": "Learn Python",
+                "updated_at": "2024-01-01",
+            }
+        ]
+        etag = client.get("/api/v1/goals?user_id=user-1").headers["ETag"]
+
+        mock_dynamodb.get_version.return_value = 4
+        response = client.get(
+            "/api/v1/goals?user_id=user-1", headers={"If-None-Match": etag}
+        )
+
+        assert response.status_code == 200
+        assert response.json()[0]["goal_id"] == "goal-1"
+        assert response.headers["ETag"] != etag
+        assert mock_dynamodb.query.call_args.kwargs == {"version": 4}
+
 
 class TestGetGoal:
     """Tests for get goal endpoint."""
@@ -83,6 +262,24 @@ class TestGetGoal:
 
         assert response.status_code == 404
 
+    def test_get_goal_not_modified(self, client, mock_dynamodb):
+        """Test that a matching If-None-Match gets an empty 304."""
+        mock_dynamodb.get_item.return_value = {
+            "user_id": "user-1",
+            "goal_id": "goal-1",
+            "title": "Learn Python",
+            "updated_at": "2024-01-01",
+        }
+        etag = client.get("/api/v1/goals/goal-1?user_id=user-1").headers["ETag"]
+
+        response = client.get(
+            "/api/v1/goals/goal-1?user_id=user-1",
+            headers={"If-None-Match": f'W/"x", {etag}'},
+        )
+
+        assert response.status_code == 304
+        assert response.content == b""
+
 
 class TestCreateGoal:
     """Tests for create goal endpoint."""
@@ -119,7 +316,7 @@ class TestUpdateGoal:
 
     def test_update_goal_success(self, client, mock_dynamodb):
         """Test successful goal update."""
-        mock_dynamodb.get_item.return_value = {
+        existing = {
             "user_id": "user-1",
             "goal_id": "goal-1",
             "title": "Learn Python",
@@ -128,6 +325,10 @@ class TestUpdateGoal:
             "created_at": "2024-01-01T00:00:00Z",
             "updated_at": "2024-01-01T00:00:00Z",
         }
+        mock_dynamodb.update_item.side_effect = lambda key, updates: {
+            **existing,
+            **updates,
+        }
 
         response = client.put(
             "/api/v1/goals/goal-1?user_id=user-1",
@@ -139,7 +340,7 @@ class TestUpdateGoal:
 
     def test_update_goal_not_found(self, client, mock_dynamodb):
         """Test update non-existent goal."""
-        mock_dynamodb.get_item.return_value = None
+        mock_dynamodb.update_item.return_value = None
 
         response = client.put(
             "/api/v1/goals/nonexistent?user_id=user-1",
@@ -154,20 +355,15 @@ class TestDeleteGoal:
 
     def test_delete_goal_success(self, client, mock_dynamodb):
         """Test successful goal deletion."""
-        mock_dynamodb.get_item.return_value = {
-            "user_id": "user-1",
-            "goal_id": "goal-1",
-            "title": "Learn Python",
-        }
-
         response = client.delete("/api/v1/goals/goal-1?user_id=user-1")
 
         assert response.status_code == 204
         mock_dynamodb.delete_item.assert_called_once()
+        mock_dynamodb.get_item.assert_not_called()
 
     def test_delete_goal_not_found(self, client, mock_dynamodb):
         """Test delete non-existent goal."""
-        mock_dynamodb.get_item.return_value = None
+        mock_dynamodb.delete_item.return_value = False
 
         response = client.delete("/api/v1/goals/nonexistent?user_id=user-1")
 
@@ -0,0 +1,230 @@
+"""Tests for Goals API in-process cache."""
+
+from unittest.mock import MagicMock, call
+
+import pytest
+
+from cache import CachedClient, TTLCache
+
+
+class FakeTimer:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTTLCache:
+    """Tests for TTLCache."""
+
+    def test_hit_and_miss_counters(self):
+        """Test that lookups are counted."""
+        cache = TTLCache(max_size=2, ttl_seconds=10)
+        cache.set("a", True)
+
+        assert cache.get("a") is True
+        assert cache.get("b") is None
+        assert cache.stats() == {"hits": 1, "misses": 1, "evictions": 0, "size": 1}
+
+    def test_falsy_values_are_hits(self):
+        """Test that a cached False is distinguishable from a miss."""
+        cache = TTLCache(max_size=2, ttl_seconds=10)
+        cache.set("a", False)
+
+        assert cache.get("a") is False
+
+    def test_entries_expire(self):
+        """Test that entries are dropped after the TTL."""
+        timer = FakeTimer()
+        cache = TTLCache(max_size=2, ttl_seconds=10, timer=timer)
+        cache.set("a", True)
+
+        timer.now = 9.9
+        assert cache.get("a") is True
+        timer.now = 10.0
+        assert cache.get("a") is None
+        assert cache.stats()["size"] == 0
+
+    def test_evicts_least_recently_used(self):
+        """Test that the bound evicts the least recently read entry."""
+        cache = TTLCache(max_size=2, ttl_seconds=10)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats()["evictions"] == 1
+
+    def test_invalidate(self):
+        """Test dropping a single entry."""
+        cache = TTLCache(max_size=2, ttl_seconds=10)
+        cache.set("a", True)
+        cache.invalidate("a")
+        cache.invalidate("missing")
+
+        assert cache.get("a") is None
+
+    def test_disabled_with_zero_ttl(self):
+        """Test that a zero TTL disables caching."""
+        cache = TTLCache(max_size=2, ttl_seconds=0)
+        cache.set("a", True)
+
+        assert cache.get("a") is None
+
+    def test_stale_value_is_a_miss(self):
+        """Test that a value failing fresh is dropped and counted as a miss."""
+        cache = TTLCache(max_size=2, ttl_seconds=10)
+        cache.set("a", 1)
+
+        assert cache.get("a", fresh=lambda value: value == 2) is None
+        assert cache.get("a") is None
+        assert cache.stats() == {"hits": 0, "misses": 2, "evictions": 0, "size": 0}
+
+
+class TestCachedClient:
+    """Tests for CachedClient."""
+
+    ITEMS = [
+        {"user_id": "user-1", "goal_id": "goal-1", "title": "A"},
+        {"user_id": "user-1", "goal_id": "goal-2", "title": "B"},
+    ]
+
+    def make(self, ttl_seconds=10):
+        """Wrap a mock client holding ITEMS in a CachedClient."""
+        inner = MagicMock()
+        inner.query.return_value = [dict(item) for item in self.ITEMS]
+        cache = TTLCache(max_size=4, ttl_seconds=ttl_seconds)
+        return inner, CachedClient(inner, cache, ("user_id", "goal_id"))
+
+    def test_query_reads_partition_once(self):
+        """Test that repeated queries and projections share one cached read."""
+        inner, client = self.make()
+
+        assert client.query("user_id", "user-1") == self.ITEMS
+        assert client.query("user_id", "user-1", ["goal_id"]) == [
+            {"goal_id": "goal-1"},
+            {"goal_id": "goal-2"},
+        ]
+        inner.query.assert_called_once_with("user_id", "user-1")
+        assert client.stats()["hits"] == 1
+
+    def test_projected_miss_bypasses_cache(self):
+        """Test that a projected query on a miss sends the projection."""
+        inner, client = self.make()
+
+        client.query("user_id", "user-1", ["goal_id"])
+        client.query("user_id", "user-1")
+
+        assert inner.query.call_args_list == [
+            call("user_id", "user-1", ["goal_id"]),
+            call("user_id", "user-1"),
+        ]
+        assert client.stats()["size"] == 1
+
+    def test_query_checks_version(self):
+        """Test that an entry read under another change counter is refreshed."""
+        inner, client = self.make()
+
+        client.query("user_id", "user-1", version=1)
+        client.query("user_id", "user-1", version=1)
+        client.query("user_id", "user-1", version=2)
+
+        assert inner.query.call_count == 2
+
+    def test_get_item_from_cached_partition(self):
+        """Test that get_item is answered from a cached partition."""
+        inner, client = self.make()
+        client.query("user_id", "user-1")
+
+        assert (
+            client.get_item({"user_id": "user-1", "goal_id": "goal-2"})["title"] == "B"
+        )
+        assert client.get_item({"user_id": "user-1", "goal_id": "missing"}) is None
+        inner.get_item.assert_not_called()
+
+        client.get_item({"user_id": "other", "goal_id": "goal-1"})
+        inner.get_item.assert_called_once()
+
+    def test_get_item_checks_version(self):
+        """Test that get_item skips a partition read under another counter."""
+        inner, client = self.make()
+        client.query("user_id", "user-1", version=1)
+        key = {"user_id": "user-1", "goal_id": "goal-1"}
+
+        client.get_item(key, version=1)
+        inner.get_item.assert_not_called()
+
+        client.get_item(key, version=2)
+        inner.get_item.assert_called_once_with(key)
+
+    def test_read_racing_write_is_not_cached(self):
+        """Test that a read in flight during a local write is not cached."""
+        inner, client = self.make()
+        stale = [dict(item) for item in self.ITEMS]
+
+        def query_during_write(key_name, key_value):
+            # The write lands and invalidates while this read is in flight
+            client.update_item({"user_id": "user-1", "goal_id": "goal-1"}, {"x": 1})
+            return stale
+
+        inner.query.side_effect = query_during_write
+        assert client.query("user_id", "user-1") == stale
+
+        inner.query.side_effect = None
+        client.query("user_id", "user-1")
+        client.query("user_id", "user-1")
+
+        assert inner.query.call_count == 2
+
+    def test_writes_invalidate_partition(self):
+        """Test that put, update and delete drop the written partition."""
+        inner, client = self.make()
+        key = {"user_id": "user-1", "goal_id": "goal-1"}
+
+        for write in (
+            lambda: client.put_item(dict(key)),
+            lambda: client.update_item(key, {"title": "C"}),
+            lambda: client.delete_item(key),
+        ):
+            client.query("user_id", "user-1")
+            write()
+        client.query("user_id", "user-1")
+
+        assert inner.query.call_count == 4
+        inner.put_item.assert_called_once()
+        inner.update_item.assert_called_once_with(key, {"title": "C"})
+        inner.delete_item.assert_called_once_with(key)
+
+    def test_failed_write_invalidates_partition(self):
+        """Test that a write failing after it may have landed drops the entry."""
+        inner, client = self.make()
+        inner.put_item.side_effect = RuntimeError("counter bump throttled")
+        client.query("user_id", "user-1")
+
+        with pytest.raises(RuntimeError):
+            client.put_item({"user_id": "user-1", "goal_id": "item-1"})
+        client.query("user_id", "user-1")
+
+        assert inner.query.call_count == 2
+
+    def test_disabled_with_zero_ttl(self):
+        """Test that a zero staleness budget reads through every time."""
+        inner, client = self.make(ttl_seconds=0)
+
+        client.query("user_id", "user-1")
+        client.query("user_id", "user-1")
+
+        assert inner.query.call_count == 2
+
+    def test_other_calls_pass_through(self):
+        """Test that uncached operations reach the wrapped client."""
+        inner, client = self.make()
+        inner.get_version.return_value = 3
+
+        assert client.get_version("user-1") == 3
@@ -33,6 +33,18 @@ class TestHealthEndpoint:
         assert data["status"] == "healthy"
         assert data["api"] == "goals"
 
+    def test_cache_stats(self, client):
+        """Test that the partition cache counters are exposed."""
+        response = client.get("/health/cache")
+
+        assert response.status_code == 200
+        assert response.json()["partitions"].keys() == {
+            "hits",
+            "misses",
+            "evictions",
+            "size",
+        }
+
 
 class TestAPIRoutes:
     """Tests for API route configuration."""
@@ -1,17 +1,39 @@
 """Habits API handler."""
 
+import asyncio
+import hashlib
+import importlib.util
+import json
+import os
 import uuid
-from datetime import UTC, datetime
+from datetime import UTC, date, datetime
+from typing import Any
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Header, HTTPException, Query, Response
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import TypeAdapter
 
-from client import HabitsClient, get_settings
+from cache import TTLCache
+from client import (
+    HabitsClient,
+    decode_cursor,
+    encode_cursor,
+    get_client,
+    get_settings,
+    run_sync,
+)
 from models import (
     HabitCreate,
+    HabitDailyStatusResponse,
+    HabitLogBatchCreate,
+    HabitLogBatchResponse,
+    HabitLogBatchResult,
     HabitLogCreate,
     HabitLogResponse,
+    HabitPageResponse,
     HabitResponse,
     HabitUpdate,
+    habit_fields_model,
 )
 
 router = APIRouter(prefix="/habits", tags=["habits"])
@@ -19,21 +41,308 @@ router = APIRouter(prefix="/habits", tags=["habits"])
 settings = get_settings()
 db = HabitsClient(settings.habits_table_name, settings.habit_logs_table_name)
 
+# (user_id, habit_id) -> is_active for habits known to exist. Only positive
+# results are cached; writes in this container keep it consistent, writes in
+# other containers become visible after the TTL.
+ownership_cache: TTLCache[tuple[str, str], bool] = TTLCache(
+    settings.ownership_cache_max_size, settings.ownership_cache_ttl_seconds
+)
+
+# Upper bound on ids= so one request cannot fan out unbounded BatchGetItem calls
+MAX_BATCH_GET_IDS = 500
+
+# Page sizes for limit/cursor pagination; without either the full list is returned
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+
+# Primary key attributes, always returned with fields= so items stay addressable
+KEY_FIELDS = ("user_id", "habit_id")
+
+# Browsers may keep responses but must revalidate them with If-None-Match
+REVALIDATE = "private, no-cache"
+
+# ORJSONResponse needs orjson, an optional dependency; without it the setting
+# falls back to the standard encoder
+response_class: type[JSONResponse] = (
+    ORJSONResponse
+    if settings.orjson_responses and importlib.util.find_spec("orjson")
+    else JSONResponse
+)
+
+# Items read back from our own table are validated once by a TypeAdapter and
+# dumped straight to JSON, instead of being built into models and validated
+# again for response_model; request bodies are still validated as before
+habit_list_adapter = TypeAdapter(list[HabitResponse])
+habit_page_adapter = TypeAdapter(HabitPageResponse)
+habit_log_list_adapter = TypeAdapter(list[HabitLogResponse])
+daily_status_adapter = TypeAdapter(HabitDailyStatusResponse)
+
+
+async def _require_habit(user_id: str, habit_id: str) -> None:
+    """Raise 404 unless the habit exists and belongs to the user."""
+    key = (user_id, habit_id)
+    if ownership_cache.get(key) is not None:
+        return
+
+    habit = await run_sync(db.get_habit, user_id, habit_id)
+    if not habit:
+        raise HTTPException(status_code=404, detail="Habit not found")
+    ownership_cache.set(key, habit.get("is_active", True))
+
+
+async def schedule_habit_deletion(
+    user_id: str, habit_id: str, background_tasks: BackgroundTasks
+) -> None:
+    """Delete the remaining logs of a habit, then the habit, after the request.
+
+    On Lambda the function invokes itself asynchronously, since Mangum only
+    returns the response once background tasks have finished. Elsewhere (e.g.
+    uvicorn) a FastAPI background task is used.
+    """
+    function_name = os.environ.get("AWS_LAMBDA_FUNCTION_NAME")
+    if not function_name:
+        background_tasks.add_task(db.delete_habit_and_logs, user_id, habit_id)
+        return
+
+    await run_sync(
+        get_client("lambda", settings.aws_region).invoke,
+        FunctionName=function_name,
+        InvocationType="Event",
+        Payload=json.dumps({"delete_habit_logs": habit_id, "user_id": user_id}),
+    )
+
 
 # Habits CRUD endpoints
-@router.get("", response_model=list[HabitResponse])
-async def list_habits(user_id: str) -> list[HabitResponse]:
-    """List all habits for a user."""
-    items = db.query_habits(user_id)
-    return [HabitResponse(**item) for item in items]
+@router.get("", response_model=list[HabitResponse] | HabitPageResponse)
+async def list_habits(
+    user_id: str,
+    ids: str | None = Query(None, description="Comma-separated habit IDs to fetch"),
+    limit: int | None = Query(
+        None, ge=1, le=MAX_PAGE_SIZE, description="Page size; returns one page"
+    ),
+    cursor: str | None = Query(None, description="next_cursor of the previous page"),
+    fields: str | None = Query(
+        None, description="Comma-separated fields to return; keys are always included"
+    ),
+    if_none_match: str | None = Header(None),
+) -> Response:
+    """List all habits for a user, or only the habits with the given IDs.
+
+    With ids, the habits are read with BatchGetItem and returned in the
+    order requested; unknown IDs are left out.
+
+    With limit or cursor, one page is returned along with the cursor of the
+    next page, which is null on the last page.
+
+    With fields, only those attributes are read from DynamoDB (as a
+    ProjectionExpression) and returned.
+
+    The full list carries a weak ETag of the user's change counter, which
+    every write bumps. With a matching If-None-Match, only the counter is
+    read and 304 is returned.
+    """
+    selected = _parse_fields(fields)
+    projection = list(selected) if selected else None
+
+    if limit is not None or cursor is not None:
+        if ids is not None:
+            raise HTTPException(
+                status_code=422, detail="ids cannot be combined with limit or cursor"
+            )
+        items, next_cursor = await _read_habits_page(
+            user_id, limit or DEFAULT_PAGE_SIZE, cursor, projection
+        )
+        if selected is None:
+            return _json_response(
+                habit_page_adapter, {"items": items, "next_cursor": next_cursor}
+            )
+        return response_class(
+            {"items": _render_fields(items, selected), "next_cursor": next_cursor}
+        )
+
+    if ids is not None:
+        items = await _read_habits_by_ids(user_id, ids, projection)
+        headers = None
+    else:
+        # The counter is read first, so the items are at least as new as it
+        etag = version_etag(user_id, await run_sync(db.get_version, user_id))
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        items = await run_sync(db.query_habits, user_id, projection)
+        headers = cache_headers(etag)
+
+    if selected is None:
+        return _json_response(habit_list_adapter, items, headers)
+    return response_class(_render_fields(items, selected), headers=headers)
+
+
+def _json_response(
+    adapter: TypeAdapter[Any], content: Any, headers: dict[str, str] | None = None
+) -> Response:
+    """Validate trusted content in one pass and render it as JSON."""
+    return Response(
+        content=adapter.dump_json(adapter.validate_python(content)),
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+def weak_etag(data: bytes) -> str:
+    """Build a weak ETag from data identifying a representation."""
+    return f'W/"{hashlib.blake2b(data, digest_size=16).hexdigest()}"'
+
+
+def items_etag(items: list[dict[str, Any]]) -> str:
+    """Build the ETag of a list of habits from their IDs and updated_at."""
+    versions = sorted(
+        (item["habit_id"], item.get("updated_at") or "") for item in items
+    )
+    return weak_etag(json.dumps(versions).encode())
+
+
+def version_etag(user_id: str, version: int, *variant: object) -> str:
+    """Build the ETag of data derived from a user's change counter.
+
+    variant tells apart representations served from the same URL, e.g. the
+    year that contributions default to.
+    """
+    return weak_etag(":".join(map(str, (user_id, version, *variant))).encode())
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Compare an If-None-Match header with an ETag, weakly as for GET."""
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(",")
+    )
+
+
+def cache_headers(etag: str, cache_control: str = REVALIDATE) -> dict[str, str]:
+    """Headers letting a browser revalidate a response with If-None-Match."""
+    return {"ETag": etag, "Cache-Control": cache_control}
+
+
+def not_modified(etag: str, cache_control: str = REVALIDATE) -> Response:
+    """An empty 304 for a request whose If-None-Match matched etag."""
+    return Response(status_code=304, headers=cache_headers(etag, cache_control))
+
+
+def conditional_response(
+    response: Response, if_none_match: str | None, cache_control: str = REVALIDATE
+) -> Response:
+    """Tag a rendered response with an ETag of its body, or answer 304.
+
+    Used for responses not tagged by the change counter (see version_etag),
+    so a match only saves the transfer and the client's parsing.
+    """
+    etag = weak_etag(response.body)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, cache_control)
+    response.headers.update(cache_headers(etag, cache_control))
+    return response
+
+
+def _parse_fields(fields: str | None) -> tuple[str, ...] | None:
+    """Resolve fields= to HabitResponse fields in declaration order."""
+    if fields is None:
+        return None
+    requested = {name for name in fields.split(",") if name}
+    unknown = requested - HabitResponse.model_fields.keys()
+    if unknown:
+        raise HTTPException(
+            status_code=422, detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+        )
+    requested.update(KEY_FIELDS)
+    return tuple(name for name in HabitResponse.model_fields if name in requested)
+
+
+def _render_fields(
+    items: list[dict[str, Any]], fields: tuple[str, ...]
+) -> list[dict[str, Any]]:
+    """Validate projected items against a HabitResponse trimmed to fields."""
+    model = habit_fields_model(fields)
+    return [model(**item).model_dump(mode="json") for item in items]
+
+
+async def _read_habits_by_ids(
+    user_id: str, ids: str, projection: list[str] | None
+) -> list[dict[str, Any]]:
+    """Read the habits listed in ids, in the order requested."""
+    habit_ids = list(dict.fromkeys(habit_id for habit_id in ids.split(",") if habit_id))
+    if not habit_ids or len(habit_ids) > MAX_BATCH_GET_IDS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"ids must list 1 to {MAX_BATCH_GET_IDS} habit IDs",
+        )
+    items = await run_sync(
+        db.batch_get_habits, user_id, habit_ids, projection=projection
+    )
+    by_id = {item["habit_id"]: item for item in items}
+    return [by_id[habit_id] for habit_id in habit_ids if habit_id in by_id]
+
+
+async def _read_habits_page(
+    user_id: str, limit: int, cursor: str | None, projection: list[str] | None
+) -> tuple[list[dict[str, Any]], str | None]:
+    """Read one page of a user's habits, starting after cursor."""
+    start_key = None
+    if cursor is not None:
+        try:
+            start_key = decode_cursor(cursor, KEY_FIELDS, user_id=user_id)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e)) from e
+    items, last_key = await run_sync(
+        db.query_habits_page, user_id, limit, start_key, projection
+    )
+    return items, encode_cursor(last_key)
+
+
+# Declared before /{habit_id} so that "today" is not captured as a habit ID
+@router.get("/today", response_model=HabitDailyStatusResponse)
+async def get_today_status(
+    user_id: str,
+    target_date: str | None = Query(None, alias="date", pattern=r"^\d{4}-\d{2}-\d{2}$"),
+    if_none_match: str | None = Header(None),
+) -> Response:
+    """Get every habit's log for a date (defaults to today) in one request."""
+    target_date = target_date or date.today().isoformat()
+
+    habits, day_logs = await asyncio.gather(
+        run_sync(db.query_habits, user_id),
+        run_sync(db.query_habit_logs_by_user, user_id, target_date, target_date),
+    )
+    logs = {log["habit_id"]: log for log in day_logs}
+    response = _json_response(
+        daily_status_adapter,
+        {
+            "date": target_date,
+            "logs": {
+                habit["habit_id"]: logs.get(habit["habit_id"]) for habit in habits
+            },
+        },
+    )
+    return conditional_response(response, if_none_match)
 
 
 @router.get("/{habit_id}", response_model=HabitResponse)
-async def get_habit(habit_id: str, user_id: str) -> HabitResponse:
+async def get_habit(
+    habit_id: str,
+    user_id: str,
+    response: Response,
+    if_none_match: str | None = Header(None),
+) -> HabitResponse | Response:
     """Get a single habit by ID."""
-    item = db.get_habit(user_id, habit_id)
+    item = await run_sync(db.get_habit, user_id, habit_id)
     if not item:
         raise HTTPException(status_code=404, detail="Habit not found")
+    etag = items_etag([item])
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers.update(cache_headers(etag))
     return HabitResponse(**item)
 
 
@@ -50,7 +359,8 @@ async def create_habit(user_id: str, habit: HabitCreate) -> HabitResponse:
         "created_at": now,
         "updated_at": now,
     }
-    db.put_habit(item)
+    await run_sync(db.put_habit, item)
+    ownership_cache.set((user_id, habit_id), item["is_active"])
     return HabitResponse(**item)
 
 
@@ -59,29 +369,50 @@ async def update_habit(
     habit_id: str, user_id: str, habit: HabitUpdate
 ) -> HabitResponse:
     """Update a habit."""
-    existing = db.get_habit(user_id, habit_id)
-    if not existing:
-        raise HTTPException(status_code=404, detail="Habit not found")
-
     update_data = habit.model_dump(exclude_unset=True)
     update_data["updated_at"] = datetime.now(UTC).isoformat()
 
-    updated_item = {**existing, **update_data}
-    db.put_habit(updated_item)
+    updated_item = await run_sync(db.update_habit, user_id, habit_id, update_data)
+    if not updated_item:
+        ownership_cache.invalidate((user_id, habit_id))
+        raise HTTPException(status_code=404, detail="Habit not found")
+    ownership_cache.set((user_id, habit_id), updated_item.get("is_active", True))
     return HabitResponse(**updated_item)
 
 
-@router.delete("/{habit_id}", status_code=204)
-async def delete_habit(habit_id: str, user_id: str) -> None:
-    """Delete a habit and all its logs."""
-    existing = db.get_habit(user_id, habit_id)
-    if not existing:
+@router.delete(
+    "/{habit_id}",
+    status_code=204,
+    response_class=Response,
+    responses={
+        202: {"description": "Logs partly deleted, the rest and the habit later"}
+    },
+)
+async def delete_habit(
+    habit_id: str, user_id: str, background_tasks: BackgroundTasks
+) -> Response:
+    """Delete a habit and all its logs.
+
+    The logs are deleted before the habit, so a failure leaves the habit in
+    place and the delete can be retried. Up to habit_logs_sync_delete_limit
+    logs are deleted within the request. When logs are still left after that,
+    the request is answered with 202 and the number of logs deleted so far;
+    the remaining logs and then the habit are deleted asynchronously.
+    """
+    ownership_cache.invalidate((user_id, habit_id))
+    if not await run_sync(db.get_habit, user_id, habit_id):
         raise HTTPException(status_code=404, detail="Habit not found")
 
-    # Delete all logs for this habit
-    db.batch_delete_habit_logs(habit_id)
-    # Delete the habit
-    db.delete_habit(user_id, habit_id)
+    limit = settings.habit_logs_sync_delete_limit
+    deleted = await run_sync(db.batch_delete_habit_logs, habit_id, max_items=limit)
+    if deleted >= limit and await run_sync(db.has_habit_logs, habit_id):
+        await schedule_habit_deletion(user_id, habit_id, background_tasks)
+        return JSONResponse(status_code=202, content={"deleted": deleted})
+
+    if not await run_sync(db.delete_habit, user_id, habit_id):
+        raise HTTPException(status_code=404, detail="Habit not found")
+    ownership_cache.invalidate((user_id, habit_id))
+    return Response(status_code=204)
 
 
 # Habit Logs endpoints
@@ -91,15 +422,15 @@ async def list_habit_logs(
     user_id: str,
     start_date: str | None = None,
     end_date: str | None = None,
-) -> list[HabitLogResponse]:
+    if_none_match: str | None = Header(None),
+) -> Response:
     """List habit logs for a habit with optional date range."""
     # Verify habit exists and belongs to user
-    habit = db.get_habit(user_id, habit_id)
-    if not habit:
-        raise HTTPException(status_code=404, detail="Habit not found")
+    await _require_habit(user_id, habit_id)
 
-    items = db.query_habit_logs(habit_id, start_date, end_date)
-    return [HabitLogResponse(**item) for item in items]
+    items = await run_sync(db.query_habit_logs, habit_id, start_date, end_date)
+    response = _json_response(habit_log_list_adapter, items)
+    return conditional_response(response, if_none_match)
 
 
 @router.post("/{habit_id}/logs", response_model=HabitLogResponse, status_code=201)
@@ -108,9 +439,7 @@ async def create_habit_log(
 ) -> HabitLogResponse:
     """Create or update a habit log (mark habit as completed)."""
     # Verify habit exists and belongs to user
-    habit = db.get_habit(user_id, habit_id)
-    if not habit:
-        raise HTTPException(status_code=404, detail="Habit not found")
+    await _require_habit(user_id, habit_id)
 
     now = datetime.now(UTC).isoformat()
 
@@ -122,20 +451,72 @@ async def create_habit_log(
         "completed_at": now if log.completed else None,
         "note": log.note,
     }
-    db.put_habit_log(item)
+    await run_sync(db.put_habit_log, item)
     return HabitLogResponse(**item)
 
 
+@router.post("/logs:batch", response_model=HabitLogBatchResponse)
+async def create_habit_logs_batch(
+    user_id: str, batch: HabitLogBatchCreate
+) -> HabitLogBatchResponse:
+    """Create or update many habit logs in one request.
+
+    Ownership of every habit is checked with a single query. Each entry gets
+    its own status: 201 when written, 404 when the habit does not belong to
+    the user, 503 when DynamoDB kept throttling the write (safe to retry).
+    """
+    habits = await run_sync(db.query_habits, user_id)
+    owned = {habit["habit_id"] for habit in habits}
+    now = datetime.now(UTC).isoformat()
+
+    items = {
+        (log.habit_id, log.date): {
+            "habit_id": log.habit_id,
+            "user_id": user_id,
+            "date": log.date,
+            "completed": log.completed,
+            "completed_at": now if log.completed else None,
+            "note": log.note,
+        }
+        for log in batch.logs
+        if log.habit_id in owned
+    }
+    unprocessed = []
+    if items:
+        unprocessed = await run_sync(db.batch_put_habit_logs, list(items.values()))
+    failed = {(item["habit_id"], item["date"]) for item in unprocessed}
+
+    results = []
+    for log in batch.logs:
+        key = (log.habit_id, log.date)
+        if key not in items:
+            result = HabitLogBatchResult(
+                habit_id=log.habit_id,
+                date=log.date,
+                status_code=404,
+                detail="Habit not found",
+            )
+        elif key in failed:
+            result = HabitLogBatchResult(
+                habit_id=log.habit_id,
+                date=log.date,
+                status_code=503,
+                detail="Log not written, retry later",
+            )
+        else:
+            result = HabitLogBatchResult(
+                habit_id=log.habit_id,
+                date=log.date,
+                status_code=201,
+                log=HabitLogResponse(**items[key]),
+            )
+        results.append(result)
+    return HabitLogBatchResponse(results=results)
+
+
 @router.delete("/{habit_id}/logs/{date}", status_code=204)
 async def delete_habit_log(habit_id: str, date: str, user_id: str) -> None:
     """Delete a habit log (unmark habit completion)."""
-    # Verify habit exists and belongs to user
-    habit = db.get_habit(user_id, habit_id)
-    if not habit:
-        raise HTTPException(status_code=404, detail="Habit not found")
-
-    existing = db.get_habit_log(habit_id, date)
-    if not existing:
+    # The log's user_id is checked by the delete itself
+    if not await run_sync(db.delete_habit_log, habit_id, date, user_id):
         raise HTTPException(status_code=404, detail="Habit log not found")
-
-    db.delete_habit_log(habit_id, date)
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""Backfill the reminder_slot attribute of existing habits.
+
+Populates the sparse reminder_slot index read by the scheduled
+{"due_now": true} reminder run, e.g. after the index is first deployed or
+after REMINDER_SLOT_MINUTES or DEFAULT_REMINDER_TIME changes.
+
+Usage:
+    python backfill_reminder_slots.py
+"""
+
+import argparse
+import logging
+
+from client import HabitsClient, get_settings
+
+logger = logging.getLogger(__name__)
+
+
+def backfill(db: HabitsClient) -> int:
+    """Sync the reminder slot of every habit.
+
+    Args:
+        db: Habits DynamoDB client
+
+    Returns:
+        Number of habits whose reminder slot changed
+    """
+    changed = 0
+    for habit in db.iter_all_habits():
+        if db.sync_reminder_slot(habit).get("reminder_slot") != habit.get(
+            "reminder_slot"
+        ):
+            changed += 1
+    return changed
+
+
+def main() -> None:
+    """Backfill reminder slots for every habit."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    settings = get_settings()
+    db = HabitsClient(settings.habits_table_name, settings.habit_logs_table_name)
+
+    changed = backfill(db)
+    logger.info(f"Updated reminder slots of {changed} habits")
+
+
+if __name__ == "__main__":
+    main()
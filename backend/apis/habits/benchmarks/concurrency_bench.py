@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Benchmark concurrent requests against the Habits API.
+
+Serves the app in-process through httpx's ASGI transport with a stub
+database whose calls block for a fixed latency, the way boto3 blocks on a
+DynamoDB round trip, and fires concurrent GET /habits/today requests for
+several executor sizes. With one worker the calls run one at a time, as they
+did when handlers called boto3 directly on the event loop.
+
+Usage:
+    python benchmarks/concurrency_bench.py [--requests 200] [--workers 1 16 64]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("AWS_DEFAULT_REGION", "ap-northeast-1")
+
+import client  # noqa: E402
+from main import app  # noqa: E402
+
+
+class SlowHabitsClient:
+    """Stand-in for HabitsClient whose reads block like a DynamoDB call."""
+
+    def __init__(self, latency_seconds: float) -> None:
+        self.latency_seconds = latency_seconds
+
+    def query_habits(self, user_id: str) -> list[dict]:
+        time.sleep(self.latency_seconds)
+        return [
+            {"user_id": user_id, "habit_id": f"habit-{i}", "name": f"Habit {i}"}
+            for i in range(5)
+        ]
+
+    def query_habit_logs_by_user(
+        self, user_id: str, start_date: str, end_date: str
+    ) -> list[dict]:
+        time.sleep(self.latency_seconds)
+        return [
+            {
+                "habit_id": "habit-0",
+                "user_id": user_id,
+                "date": start_date,
+                "completed": True,
+            }
+        ]
+
+
+async def fire(requests: int) -> float:
+    """Send concurrent today-status requests and return the elapsed time."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+        started = time.perf_counter()
+        responses = await asyncio.gather(
+            *(
+                c.get(f"/api/v1/habits/today?user_id=user-{i}&date=2024-01-15")
+                for i in range(requests)
+            )
+        )
+        elapsed = time.perf_counter() - started
+    assert all(r.status_code == 200 for r in responses)
+    return elapsed
+
+
+def main() -> None:
+    """Run the benchmark and print per-executor-size timings."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument(
+        "--db-latency-ms",
+        type=float,
+        default=20.0,
+        help="Simulated DynamoDB response time",
+    )
+    args = parser.parse_args()
+
+    latency = args.db_latency_ms / 1000
+    # Each request makes two DynamoDB reads
+    serial = args.requests * 2 * latency
+    print(
+        f"{args.requests} requests, db latency {args.db_latency_ms} ms, "
+        f"serial {serial:.2f} s"
+    )
+
+    settings = client.get_settings()
+    with patch("api_handler.db", SlowHabitsClient(latency)):
+        for workers in args.workers:
+            settings.db_max_workers = workers
+            client.get_executor.cache_clear()
+            elapsed = asyncio.run(fire(args.requests))
+            client.get_executor().shutdown()
+            print(
+                f"workers {workers:>3}: {elapsed:6.2f} s total, "
+                f"{args.requests / elapsed:7.1f} req/s, "
+                f"{serial / elapsed:5.1f}x vs serial"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Benchmark contribution response encoding.
+
+Compares the model-based path the service used to take (a ContributionData
+per day, rendered through FastAPI's JSONResponse) with the array-based
+encode_contributions.
+
+Usage:
+    python benchmarks/contribution_bench.py [--number 200]
+"""
+
+import argparse
+import random
+import sys
+import timeit
+from pathlib import Path
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from contribution import (  # noqa: E402
+    calculate_contribution_level,
+    encode_contributions,
+    generate_year_dates,
+)
+from models import ContributionData, ContributionResponse  # noqa: E402
+
+YEAR = 2024
+HABIT_COUNT = 5
+
+
+def build_contributions(
+    date_counts: dict[str, int], year: int, habit_count: int
+) -> ContributionResponse:
+    """Build the per-day response models, as the service used to."""
+    max_count = habit_count if habit_count > 0 else 1
+    data = [
+        ContributionData(
+            date=d,
+            count=date_counts.get(d, 0),
+            level=calculate_contribution_level(date_counts.get(d, 0), max_count),
+        )
+        for d in generate_year_dates(year)
+    ]
+    return ContributionResponse(
+        year=year,
+        total_contributions=sum(entry.count for entry in data),
+        data=data,
+    )
+
+
+def model_response(date_counts: dict[str, int]) -> bytes:
+    """Render the response the way FastAPI does for response_model."""
+    return JSONResponse(
+        jsonable_encoder(build_contributions(date_counts, YEAR, HABIT_COUNT))
+    ).body
+
+
+def main() -> None:
+    """Run the benchmark and print per-request timings."""
+    parser = argparse.ArgumentParser(description="Contribution encoding benchmark")
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    date_counts = {
+        d: rng.randint(1, HABIT_COUNT)
+        for d in generate_year_dates(YEAR)
+        if rng.random() < 0.7
+    }
+    assert model_response(date_counts) == encode_contributions(
+        date_counts, YEAR, HABIT_COUNT
+    ), "encoded body differs from the model response"
+
+    results = {
+        "model": timeit.timeit(lambda: model_response(date_counts), number=args.number),
+        "array": timeit.timeit(
+            lambda: encode_contributions(date_counts, YEAR, HABIT_COUNT),
+            number=args.number,
+        ),
+    }
+    for name, total in results.items():
+        print(f"{name:>6}: {total / args.number * 1000:.3f} ms/request")
+    print(f"speedup: {results['model'] / results['array']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
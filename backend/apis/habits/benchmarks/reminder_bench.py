@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""Benchmark batch reminder runs.
+
+Seeds synthetic users into moto-backed tables and sends their reminders to a
+local stub Slack webhook with the shipped Slack settings: messages to the
+webhook are spaced slack_min_interval_seconds apart and batch runs post
+digests per reminder_digest_window_seconds (both can be overridden through
+the environment).
+
+The serial baseline handles one user at a time, evaluating and sending each
+reminder before moving on like repeated single-user runs. It is dominated by
+the send interval, so it runs over --serial-users and is projected to all
+users. Batch runs go through run_reminders at each concurrency.
+
+Usage:
+    python benchmarks/reminder_bench.py [--users 10000] [--serial-users 20]
+        [--concurrency 1 16 64]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import boto3
+from moto import mock_aws
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from client import HabitsClient, get_settings  # noqa: E402
+from reminder import evaluate_reminder, run_reminders  # noqa: E402
+from slack_notifier import (  # noqa: E402
+    ReminderDigest,
+    deliver_slack_notification,
+    format_reminder_message,
+)
+
+HABITS_TABLE = "bench-habits"
+HABIT_LOGS_TABLE = "bench-habit-logs"
+HABIT_CONTRIBUTIONS_TABLE = "bench-habit-contributions"
+DAY = date(2024, 1, 15)
+
+
+class StubWebhook(BaseHTTPRequestHandler):
+    """Slack webhook stand-in that answers 200 after a fixed latency."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    latency_seconds = 0.0
+    posts = 0
+    posts_lock = threading.Lock()
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with self.posts_lock:
+            StubWebhook.posts += 1
+        time.sleep(self.latency_seconds)
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+def create_tables() -> None:
+    """Create the habits and habit logs tables."""
+    dynamodb = boto3.resource("dynamodb", region_name="ap-northeast-1")
+    dynamodb.create_table(
+        TableName=HABITS_TABLE,
+        KeySchema=[
+            {"AttributeName": "user_id", "KeyType": "HASH"},
+            {"AttributeName": "habit_id", "KeyType": "RANGE"},
+        ],
+        AttributeDefinitions=[
+            {"AttributeName": "user_id", "AttributeType": "S"},
+            {"AttributeName": "habit_id", "AttributeType": "S"},
+        ],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    dynamodb.create_table(
+        TableName=HABIT_LOGS_TABLE,
+        KeySchema=[
+            {"AttributeName": "habit_id", "KeyType": "HASH"},
+            {"AttributeName": "date", "KeyType": "RANGE"},
+        ],
+        AttributeDefinitions=[
+            {"AttributeName": "habit_id", "AttributeType": "S"},
+            {"AttributeName": "date", "AttributeType": "S"},
+            {"AttributeName": "user_id", "AttributeType": "S"},
+        ],
+        GlobalSecondaryIndexes=[
+            {
+                "IndexName": "user_id-date-index",
+                "KeySchema": [
+                    {"AttributeName": "user_id", "KeyType": "HASH"},
+                    {"AttributeName": "date", "KeyType": "RANGE"},
+                ],
+                "Projection": {"ProjectionType": "ALL"},
+            }
+        ],
+        BillingMode="PAY_PER_REQUEST",
+    )
+
+
+def seed(users: int) -> None:
+    """Give every user two reminder habits, one of them completed today."""
+    dynamodb = boto3.resource("dynamodb", region_name="ap-northeast-1")
+    with dynamodb.Table(HABITS_TABLE).batch_writer() as habits:
+        for i in range(users):
+            for habit in ("a", "b"):
+                habits.put_item(
+                    Item={
+                        "user_id": f"user-{i}",
+                        "habit_id": f"habit-{i}-{habit}",
+                        "name": f"Habit {habit}",
+                        "reminder_enabled": True,
+                    }
+                )
+    with dynamodb.Table(HABIT_LOGS_TABLE).batch_writer() as logs:
+        for i in range(users):
+            logs.put_item(
+                Item={
+                    "habit_id": f"habit-{i}-a",
+                    "user_id": f"user-{i}",
+                    "date": DAY.isoformat(),
+                    "completed": True,
+                }
+            )
+
+
+async def run_serial(
+    db: HabitsClient, user_ids: list[str], webhook_url: str
+) -> tuple[int, int]:
+    """Remind users one at a time; return the reminders sent and failed."""
+    sent = failed = 0
+    for user_id in user_ids:
+        _, notice = evaluate_reminder(db, user_id, DAY)
+        if notice is None:
+            continue
+        if await deliver_slack_notification(
+            webhook_url, format_reminder_message(**notice)
+        ):
+            sent += 1
+        else:
+            failed += 1
+    return sent, failed
+
+
+async def run_batch(
+    db: HabitsClient, user_ids: list[str], webhook_url: str, concurrency: int
+) -> tuple[int, int]:
+    """Remind users through run_reminders; return the reminders sent and failed."""
+    window_seconds = get_settings().reminder_digest_window_seconds
+    digest = ReminderDigest(window_seconds) if window_seconds > 0 else None
+    results = await run_reminders(
+        db, user_ids, webhook_url, DAY, concurrency, digest=digest
+    )
+    sent = sum(1 for r in results if r.success and r.incomplete_count)
+    return sent, sum(1 for r in results if not r.success)
+
+
+def report(label: str, elapsed: float, users: int, sent: int, failed: int) -> None:
+    """Print the timing and outcome of one run."""
+    print(
+        f"{label:<16} {elapsed:8.2f} s {elapsed / users * 1000:9.2f} ms/user "
+        f"{sent:>6} sent {failed:>4} failed {StubWebhook.posts:>6} posts"
+    )
+
+
+def main() -> None:
+    """Run the benchmark and print serial and per-concurrency timings."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument(
+        "--serial-users",
+        type=int,
+        default=20,
+        help="Users in the serial baseline, projected to --users",
+    )
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument(
+        "--webhook-latency-ms",
+        type=float,
+        default=20.0,
+        help="Simulated Slack response time",
+    )
+    args = parser.parse_args()
+
+    os.environ.setdefault("AWS_DEFAULT_REGION", "ap-northeast-1")
+    settings = get_settings()
+    StubWebhook.latency_seconds = args.webhook_latency_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubWebhook)
+    threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+    ).start()
+    webhook_url = f"http://127.0.0.1:{server.server_port}/hook"
+
+    with mock_aws():
+        create_tables()
+        seed(args.users)
+        db = HabitsClient(HABITS_TABLE, HABIT_LOGS_TABLE, HABIT_CONTRIBUTIONS_TABLE)
+        user_ids = list(db.iter_user_ids(reminder_enabled=True))
+        print(
+            f"{len(user_ids)} users, webhook latency {args.webhook_latency_ms} ms, "
+            f"send interval {settings.slack_min_interval_seconds} s, "
+            f"digest window {settings.reminder_digest_window_seconds} s"
+        )
+
+        serial_users = user_ids[: args.serial_users]
+        StubWebhook.posts = 0
+        started = time.perf_counter()
+        sent, failed = asyncio.run(run_serial(db, serial_users, webhook_url))
+        elapsed = time.perf_counter() - started
+        report(
+            f"serial ({len(serial_users)})", elapsed, len(serial_users), sent, failed
+        )
+        print(
+            f"{'serial, projected':<16} "
+            f"{elapsed / len(serial_users) * len(user_ids):8.2f} s"
+        )
+
+        for concurrency in args.concurrency:
+            StubWebhook.posts = 0
+            started = time.perf_counter()
+            sent, failed = asyncio.run(
+                run_batch(db, user_ids, webhook_url, concurrency)
+            )
+            elapsed = time.perf_counter() - started
+            report(f"batch c={concurrency}", elapsed, len(user_ids), sent, failed)
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
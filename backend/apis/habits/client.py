@@ -1,12 +1,26 @@
 """DynamoDB client for Habits API."""
 
-from functools import lru_cache
-from typing import Any
+import asyncio
+import base64
+import json
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from functools import cached_property, lru_cache, partial
+from itertools import chain, islice
+from typing import Any, TypeVar
 
 import boto3
-from boto3.dynamodb.conditions import Key
+from boto3.dynamodb.conditions import Attr, ConditionBase, Key
+from botocore.config import Config
+from botocore.exceptions import ClientError
 from pydantic_settings import BaseSettings
 
+T = TypeVar("T")
+
 
 class Settings(BaseSettings):
     """Habits API settings."""
@@ -14,9 +28,41 @@ class Settings(BaseSettings):
     aws_region: str = "ap-northeast-1"
     habits_table_name: str = "personal-growth-tracker-habits"
     habit_logs_table_name: str = "personal-growth-tracker-habit-logs"
+    habit_contributions_table_name: str = "personal-growth-tracker-habit-contributions"
+    # Shared by every API; holds one change counter per (owner_id, scope)
+    versions_table_name: str = "personal-growth-tracker-versions"
     debug: bool = False
     cors_origins: list[str] = ["*"]
+    # Threads available for blocking DynamoDB calls made from async handlers
+    db_max_workers: int = 16
+    # Render responses with orjson when it is installed (optional dependency)
+    orjson_responses: bool = False
     slack_webhook_url: str | None = None
+    # Slack accepts roughly one message per second per incoming webhook, so
+    # messages to one webhook are spaced this far apart. Per-user reminders
+    # therefore take users x interval in a batch run; reminder digests keep
+    # that to a few messages per run.
+    slack_min_interval_seconds: float = 1.0
+    slack_max_connections: int = 8
+    slack_max_attempts: int = 4
+    contributions_max_range_days: int = 3 * 366
+    # Browser cache lifetime of contributions for past years; logs backfilled
+    # into a past year show up once it expires
+    contributions_past_max_age_seconds: int = 365 * 24 * 60 * 60
+    batch_write_max_workers: int = 4
+    habit_logs_sync_delete_limit: int = 1000
+    reminder_max_concurrency: int = 16
+    # Batch runs buffer reminders per webhook for up to this long and post
+    # them as one digest (flushed early once every user is evaluated), i.e. at
+    # most one message per window rather than one per slack_min_interval per
+    # user; 0 sends each user's reminder alone
+    reminder_digest_window_seconds: float = 10.0
+    # Scheduled reminders run once per slot; reminder_time is local time
+    reminder_slot_minutes: int = 15
+    reminder_utc_offset_minutes: int = 9 * 60
+    default_reminder_time: str = "21:00"
+    ownership_cache_ttl_seconds: float = 60.0
+    ownership_cache_max_size: int = 1024
 
     model_config = {
         "env_file": ".env",
@@ -32,6 +78,390 @@ def get_settings() -> Settings:
     return Settings()
 
 
+@lru_cache
+def get_executor() -> ThreadPoolExecutor:
+    """Get the bounded thread pool that runs blocking DynamoDB calls."""
+    return ThreadPoolExecutor(
+        max_workers=get_settings().db_max_workers, thread_name_prefix="dynamodb"
+    )
+
+
+async def run_sync(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking client call on the bounded executor.
+
+    Keeps boto3 I/O off the event loop, so one slow DynamoDB request does not
+    stall the other requests served by the same worker.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), partial(func, *args, **kwargs))
+
+
+# Shared by every client in the process: one resource per (region, endpoint)
+# keeps one botocore session and HTTP connection pool per DynamoDB endpoint.
+# The pool is sized above db_max_workers so executor threads never wait for a
+# connection.
+DYNAMODB_CONFIG = Config(
+    max_pool_connections=32,
+    tcp_keepalive=True,
+    retries={"mode": "standard", "max_attempts": 3},
+)
+
+_registry_lock = threading.Lock()
+_resources: dict[tuple[str, str | None], Any] = {}
+_tables: dict[tuple[str, str | None, str], Any] = {}
+_clients: dict[tuple[str, str], Any] = {}
+
+
+def get_dynamodb_resource(region: str, endpoint_url: str | None = None) -> Any:
+    """Get the process-wide DynamoDB resource for a region and endpoint."""
+    key = (region, endpoint_url)
+    resource = _resources.get(key)
+    if resource is None:
+        with _registry_lock:
+            resource = _resources.get(key)
+            if resource is None:
+                # A dedicated session, since the default boto3 session is not
+                # thread-safe and the first call may come from any thread
+                resource = boto3.session.Session().resource(
+                    "dynamodb",
+                    region_name=region,
+                    endpoint_url=endpoint_url,
+                    config=DYNAMODB_CONFIG,
+                )
+                _resources[key] = resource
+    return resource
+
+
+def get_table(table_name: str, region: str, endpoint_url: str | None = None) -> Any:
+    """Get the process-wide Table for (region, endpoint, table)."""
+    key = (region, endpoint_url, table_name)
+    table = _tables.get(key)
+    if table is None:
+        table = get_dynamodb_resource(region, endpoint_url).Table(table_name)
+        table = _tables.setdefault(key, table)
+    return table
+
+
+def get_client(service_name: str, region: str) -> Any:
+    """Get the process-wide low-level client of an AWS service for a region."""
+    key = (service_name, region)
+    client = _clients.get(key)
+    if client is None:
+        with _registry_lock:
+            client = _clients.get(key)
+            if client is None:
+                client = boto3.session.Session().client(
+                    service_name, region_name=region
+                )
+                _clients[key] = client
+    return client
+
+
+def _paginate(
+    operation: Callable[..., dict[str, Any]],
+    page_size: int | None,
+    max_items: int | None,
+    request_kwargs: dict[str, Any],
+) -> Iterator[list[dict[str, Any]]]:
+    """Yield pages from a Query or Scan operation, following LastEvaluatedKey."""
+    remaining = max_items
+    while remaining is None or remaining > 0:
+        limit = page_size
+        if remaining is not None:
+            limit = min(limit, remaining) if limit else remaining
+        if limit:
+            request_kwargs["Limit"] = limit
+
+        response = operation(**request_kwargs)
+        items = response.get("Items", [])
+        if remaining is not None:
+            items = items[:remaining]
+            remaining -= len(items)
+        if items:
+            yield items
+
+        last_evaluated_key = response.get("LastEvaluatedKey")
+        if not last_evaluated_key:
+            return
+        request_kwargs["ExclusiveStartKey"] = last_evaluated_key
+
+
+def paginate_query(
+    table: Any,
+    page_size: int | None = None,
+    max_items: int | None = None,
+    **query_kwargs: Any,
+) -> Iterator[list[dict[str, Any]]]:
+    """Yield query result pages, following LastEvaluatedKey.
+
+    Args:
+        table: DynamoDB Table resource to query
+        page_size: Optional hint for the number of items per request (Limit)
+        max_items: Optional cap on the total number of items yielded
+        **query_kwargs: Arguments passed through to Table.query
+
+    Yields:
+        Non-empty lists of items, one per DynamoDB page
+    """
+    return _paginate(table.query, page_size, max_items, query_kwargs)
+
+
+def paginate_scan(
+    table: Any,
+    page_size: int | None = None,
+    max_items: int | None = None,
+    **scan_kwargs: Any,
+) -> Iterator[list[dict[str, Any]]]:
+    """Yield scan result pages, following LastEvaluatedKey."""
+    return _paginate(table.scan, page_size, max_items, scan_kwargs)
+
+
+def encode_cursor(key: dict[str, Any] | None) -> str | None:
+    """Encode a LastEvaluatedKey as an opaque, URL-safe pagination cursor."""
+    if not key:
+        return None
+    raw = json.dumps(key, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(
+    cursor: str, key_names: Iterable[str], **expected: str
+) -> dict[str, Any]:
+    """Decode a cursor made by encode_cursor back into an ExclusiveStartKey.
+
+    Args:
+        cursor: Cursor from a previous page
+        key_names: Attributes of the table's primary key, which a cursor must
+            carry and nothing else
+        **expected: Key attributes the cursor must carry, e.g. the partition
+            being listed, so that a cursor cannot start another user's query
+
+    Raises:
+        ValueError: If the cursor is malformed or does not match expected
+    """
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError as e:
+        raise ValueError("Invalid cursor") from e
+    if (
+        not isinstance(key, dict)
+        or set(key) != set(key_names)
+        or not all(isinstance(value, str) for value in key.values())
+        or any(key.get(name) != value for name, value in expected.items())
+    ):
+        raise ValueError("Invalid cursor")
+    return key
+
+
+def _with_date_range(
+    key_condition: ConditionBase, start_date: str | None, end_date: str | None
+) -> ConditionBase:
+    """Narrow a key condition to an optional date range."""
+    if start_date and end_date:
+        return key_condition & Key("date").between(start_date, end_date)
+    if start_date:
+        return key_condition & Key("date").gte(start_date)
+    if end_date:
+        return key_condition & Key("date").lte(end_date)
+    return key_condition
+
+
+# Maximum number of requests accepted by a single BatchWriteItem call
+BATCH_WRITE_CHUNK_SIZE = 25
+BATCH_WRITE_MAX_ATTEMPTS = 8
+BATCH_WRITE_BACKOFF_BASE_SECONDS = 0.05
+BATCH_WRITE_BACKOFF_MAX_SECONDS = 2.0
+# BatchGetItem accepts at most 100 keys per request
+BATCH_GET_CHUNK_SIZE = 100
+BATCH_GET_MAX_WORKERS = 4
+BATCH_GET_MAX_ATTEMPTS = 8
+
+
+def _sleep_before_retry(attempt: int) -> None:
+    """Sleep before retrying unprocessed batch items (exponential, full jitter)."""
+    backoff = min(
+        BATCH_WRITE_BACKOFF_BASE_SECONDS * 2**attempt,
+        BATCH_WRITE_BACKOFF_MAX_SECONDS,
+    )
+    time.sleep(random.uniform(0, backoff))
+
+
+def try_batch_write(
+    client: Any, table_name: str, requests: list[dict[str, Any]]
+) -> list[dict[str, Any]]:
+    """Issue one BatchWriteItem, retrying UnprocessedItems with backoff.
+
+    Args:
+        client: DynamoDB client (e.g. a resource's meta.client)
+        table_name: Table the write requests target
+        requests: At most BATCH_WRITE_CHUNK_SIZE PutRequest/DeleteRequest items
+
+    Returns:
+        Write requests still unprocessed after BATCH_WRITE_MAX_ATTEMPTS
+    """
+    request_items = {table_name: requests}
+    for attempt in range(BATCH_WRITE_MAX_ATTEMPTS):
+        response = client.batch_write_item(RequestItems=request_items)
+        request_items = response.get("UnprocessedItems")
+        if not request_items:
+            return []
+        if attempt < BATCH_WRITE_MAX_ATTEMPTS - 1:
+            _sleep_before_retry(attempt)
+    return request_items[table_name]
+
+
+def batch_write_with_retry(
+    client: Any, table_name: str, requests: list[dict[str, Any]]
+) -> None:
+    """Write a chunk with try_batch_write, raising if any items stay unprocessed.
+
+    Args:
+        client: DynamoDB client (e.g. a resource's meta.client)
+        table_name: Table the write requests target
+        requests: At most BATCH_WRITE_CHUNK_SIZE PutRequest/DeleteRequest items
+
+    Raises:
+        RuntimeError: If items are still unprocessed after all attempts
+    """
+    unprocessed = try_batch_write(client, table_name, requests)
+    if unprocessed:
+        raise RuntimeError(
+            f"BatchWriteItem left {len(unprocessed)} unprocessed items in {table_name}"
+        )
+
+
+def batch_get_with_retry(
+    client: Any, table_name: str, keys: list[dict[str, Any]], **kwargs: Any
+) -> list[dict[str, Any]]:
+    """Read up to BATCH_GET_CHUNK_SIZE keys, re-requesting unprocessed ones.
+
+    Args:
+        client: DynamoDB client (e.g. a resource's meta.client)
+        table_name: Table the keys belong to
+        keys: At most BATCH_GET_CHUNK_SIZE primary keys
+        **kwargs: Extra per-table options, e.g. ProjectionExpression
+
+    Returns:
+        The items found, in no particular order
+
+    Raises:
+        RuntimeError: If keys are still unprocessed after all attempts
+    """
+    request_items = {table_name: {"Keys": keys, **kwargs}}
+    items: list[dict[str, Any]] = []
+    for attempt in range(BATCH_GET_MAX_ATTEMPTS):
+        response = client.batch_get_item(RequestItems=request_items)
+        items.extend(response["Responses"].get(table_name, []))
+        request_items = response.get("UnprocessedKeys")
+        if not request_items:
+            return items
+        if attempt < BATCH_GET_MAX_ATTEMPTS - 1:
+            _sleep_before_retry(attempt)
+    unprocessed = len(request_items[table_name]["Keys"])
+    raise RuntimeError(
+        f"BatchGetItem left {unprocessed} unprocessed keys in {table_name}"
+    )
+
+
+def projection_expression(projection: Iterable[str] | None) -> dict[str, Any]:
+    """Build ProjectionExpression arguments with every name aliased.
+
+    Aliases keep reserved words such as "name", "level" and "order" usable.
+
+    Returns:
+        Keyword arguments for query or BatchGetItem, empty for all attributes
+    """
+    if not projection:
+        return {}
+    names = {f"#p{i}": name for i, name in enumerate(projection)}
+    return {"ProjectionExpression": ", ".join(names), "ExpressionAttributeNames": names}
+
+
+def batch_get_items(
+    client: Any,
+    table_name: str,
+    keys: Iterable[dict[str, Any]],
+    projection: Iterable[str] | None = None,
+) -> list[dict[str, Any]]:
+    """Get many items by key, fetching BatchGetItem chunks concurrently.
+
+    Args:
+        client: DynamoDB client (e.g. a resource's meta.client)
+        table_name: Table the keys belong to
+        keys: Primary keys; duplicates are fetched once
+        projection: Attributes to return, defaults to all
+
+    Returns:
+        The items found, in no particular order
+    """
+    unique_keys = {tuple(sorted(key.items())): key for key in keys}.values()
+    options = projection_expression(projection)
+
+    chunks = list(_chunks(unique_keys, BATCH_GET_CHUNK_SIZE))
+    if len(chunks) <= 1:
+        return [
+            item
+            for chunk in chunks
+            for item in batch_get_with_retry(client, table_name, chunk, **options)
+        ]
+    with ThreadPoolExecutor(
+        max_workers=min(BATCH_GET_MAX_WORKERS, len(chunks))
+    ) as executor:
+        results = executor.map(
+            lambda chunk: batch_get_with_retry(client, table_name, chunk, **options),
+            chunks,
+        )
+        return list(chain.from_iterable(results))
+
+
+def _chunks(items: Iterable[Any], size: int) -> Iterator[list[Any]]:
+    """Split an iterable into lists of at most size items."""
+    it = iter(items)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+# Maximum number of day counters touched by a single UpdateItem expression
+CONTRIBUTION_UPDATE_CHUNK_SIZE = 100
+
+# Marker attribute of a contribution aggregate that was counted from the logs;
+# deltas are only added to built aggregates
+CONTRIBUTIONS_BUILT = "built"
+
+# Scope of this API's counters in the versions table; one counter per user
+# covers their habits, logs and contributions
+VERSION_SCOPE = "habits"
+
+
+def _date_counts(item: dict[str, Any]) -> dict[str, int]:
+    """Extract the positive per-date counters from a contribution aggregate item."""
+    return {
+        key: int(value)
+        for key, value in item.items()
+        if key not in ("user_id", "year", CONTRIBUTIONS_BUILT) and value > 0
+    }
+
+
+REMINDER_SLOT_INDEX = "reminder_slot-index"
+# Habit attributes that determine the reminder slot
+REMINDER_FIELDS = frozenset({"reminder_enabled", "reminder_time", "is_active"})
+
+
+def reminder_slot(
+    habit: Mapping[str, Any], slot_minutes: int, default_time: str
+) -> int | None:
+    """Get the minute of day at which the habit's reminder slot starts.
+
+    Habits without an enabled reminder have no slot and stay out of the
+    sparse reminder index. Habits without a reminder_time use default_time.
+    """
+    if not habit.get("reminder_enabled", False) or not habit.get("is_active", True):
+        return None
+    hours, minutes = (habit.get("reminder_time") or default_time).split(":")
+    minute_of_day = int(hours) * 60 + int(minutes)
+    return minute_of_day - minute_of_day % slot_minutes
+
+
 class HabitsClient:
     """DynamoDB client for Habits operations."""
 
@@ -39,16 +469,88 @@ class HabitsClient:
         self,
         habits_table_name: str | None = None,
         habit_logs_table_name: str | None = None,
+        habit_contributions_table_name: str | None = None,
+        versions_table_name: str | None = None,
+        endpoint_url: str | None = None,
     ) -> None:
-        """Initialize client with table names."""
+        """Initialize client with table names.
+
+        Tables come from the process-wide registry on first use, so building
+        a client is cheap and does not load the DynamoDB service model at
+        import time.
+        """
         settings = get_settings()
-        self._dynamodb = boto3.resource("dynamodb", region_name=settings.aws_region)
-        self._habits_table = self._dynamodb.Table(
-            habits_table_name or settings.habits_table_name
-        )
-        self._habit_logs_table = self._dynamodb.Table(
+        self._region = settings.aws_region
+        self._endpoint_url = endpoint_url
+        self._habits_table_name = habits_table_name or settings.habits_table_name
+        self._habit_logs_table_name = (
             habit_logs_table_name or settings.habit_logs_table_name
         )
+        self._contributions_table_name = (
+            habit_contributions_table_name or settings.habit_contributions_table_name
+        )
+        self._versions_table_name = versions_table_name or settings.versions_table_name
+
+    @cached_property
+    def _dynamodb(self) -> Any:
+        """DynamoDB resource, created on first use."""
+        return get_dynamodb_resource(self._region, self._endpoint_url)
+
+    @cached_property
+    def _habits_table(self) -> Any:
+        return get_table(self._habits_table_name, self._region, self._endpoint_url)
+
+    @cached_property
+    def _habit_logs_table(self) -> Any:
+        return get_table(self._habit_logs_table_name, self._region, self._endpoint_url)
+
+    @cached_property
+    def _contributions_table(self) -> Any:
+        return get_table(
+            self._contributions_table_name, self._region, self._endpoint_url
+        )
+
+    @cached_property
+    def _versions_table(self) -> Any:
+        return get_table(self._versions_table_name, self._region, self._endpoint_url)
+
+    # Change counters
+    #
+    # Every write below bumps the owning user's counter once it has landed,
+    # so a reader that sees a counter also sees every write it counts. A
+    # failed bump is raised, failing the request so that it can be retried.
+    def get_version(self, user_id: str) -> int:
+        """Get the change counter of a user's habits with one small GetItem.
+
+        The read is strongly consistent, so a write is visible to the next
+        read of its counter. Read the counter before the data it validates:
+        data read first may predate a write whose bump is then seen.
+
+        Returns:
+            The counter, or 0 if nothing has been written for the user yet
+        """
+        response = self._versions_table.get_item(
+            Key={"owner_id": user_id, "scope": VERSION_SCOPE},
+            ProjectionExpression="#version",
+            ExpressionAttributeNames={"#version": "version"},
+            ConsistentRead=True,
+        )
+        return int(response.get("Item", {}).get("version", 0))
+
+    def bump_version(self, user_id: str) -> int:
+        """Atomically increment a user's change counter after a write.
+
+        Returns:
+            The new counter
+        """
+        response = self._versions_table.update_item(
+            Key={"owner_id": user_id, "scope": VERSION_SCOPE},
+            UpdateExpression="ADD #version :one",
+            ExpressionAttributeNames={"#version": "version"},
+            ExpressionAttributeValues={":one": 1},
+            ReturnValues="UPDATED_NEW",
+        )
+        return int(response["Attributes"]["version"])
 
     # Habits operations
     def get_habit(self, user_id: str, habit_id: str) -> dict[str, Any] | None:
@@ -59,72 +561,656 @@ class HabitsClient:
         return response.get("Item")
 
     def put_habit(self, item: dict[str, Any]) -> None:
-        """Put a habit into the table."""
+        """Put a habit into the table, indexed by its reminder slot."""
+        item = {k: v for k, v in item.items() if k != "reminder_slot"}
+        slot = self._reminder_slot(item)
+        if slot is not None:
+            item["reminder_slot"] = slot
         self._habits_table.put_item(Item=item)
+        self.bump_version(item["user_id"])
 
-    def delete_habit(self, user_id: str, habit_id: str) -> None:
-        """Delete a habit by key."""
-        self._habits_table.delete_item(Key={"user_id": user_id, "habit_id": habit_id})
+    def update_habit(
+        self, user_id: str, habit_id: str, updates: dict[str, Any]
+    ) -> dict[str, Any] | None:
+        """Update attributes of an existing habit in a single round trip.
 
-    def query_habits(self, user_id: str) -> list[dict[str, Any]]:
-        """Query habits by user_id."""
-        response = self._habits_table.query(
-            KeyConditionExpression=Key("user_id").eq(user_id)
+        Returns:
+            The habit after the update, or None if the habit does not exist
+        """
+        names = {"#key": "habit_id"}
+        values = {}
+        assignments = []
+        for i, (name, value) in enumerate(updates.items()):
+            names[f"#f{i}"] = name
+            values[f":v{i}"] = value
+            assignments.append(f"#f{i} = :v{i}")
+
+        try:
+            response = self._habits_table.update_item(
+                Key={"user_id": user_id, "habit_id": habit_id},
+                UpdateExpression="SET " + ", ".join(assignments),
+                ConditionExpression="attribute_exists(#key)",
+                ExpressionAttributeNames=names,
+                ExpressionAttributeValues=values,
+                ReturnValues="ALL_NEW",
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                return None
+            raise
+
+        item = response["Attributes"]
+        if REMINDER_FIELDS.intersection(updates):
+            item = self.sync_reminder_slot(item)
+        self.bump_version(user_id)
+        return item
+
+    def sync_reminder_slot(self, item: dict[str, Any]) -> dict[str, Any]:
+        """Bring a stored habit's reminder_slot in line with its reminder fields.
+
+        Returns:
+            The habit with its current reminder_slot
+        """
+        slot = self._reminder_slot(item)
+        if item.get("reminder_slot") == slot:
+            return item
+
+        if slot is None:
+            update: dict[str, Any] = {"UpdateExpression": "REMOVE reminder_slot"}
+        else:
+            update = {
+                "UpdateExpression": "SET reminder_slot = :slot",
+                "ExpressionAttributeValues": {":slot": slot},
+            }
+        try:
+            self._habits_table.update_item(
+                Key={"user_id": item["user_id"], "habit_id": item["habit_id"]},
+                ConditionExpression="attribute_exists(habit_id)",
+                **update,
+            )
+        except ClientError as e:
+            # Deleted concurrently; there is nothing left to index
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                raise
+
+        item = {k: v for k, v in item.items() if k != "reminder_slot"}
+        if slot is not None:
+            item["reminder_slot"] = slot
+        return item
+
+    def _reminder_slot(self, habit: Mapping[str, Any]) -> int | None:
+        """Get a habit's reminder slot under the current settings."""
+        settings = get_settings()
+        return reminder_slot(
+            habit, settings.reminder_slot_minutes, settings.default_reminder_time
         )
-        return response.get("Items", [])
 
-    # Habit logs operations
-    def get_habit_log(self, habit_id: str, date: str) -> dict[str, Any] | None:
-        """Get a single habit log by key."""
-        response = self._habit_logs_table.get_item(
-            Key={"habit_id": habit_id, "date": date}
+    def delete_habit(self, user_id: str, habit_id: str) -> bool:
+        """Delete a habit by key in a single round trip.
+
+        Returns:
+            True if the habit was deleted, False if it does not exist
+        """
+        try:
+            self._habits_table.delete_item(
+                Key={"user_id": user_id, "habit_id": habit_id},
+                ConditionExpression="attribute_exists(habit_id)",
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                return False
+            raise
+        self.bump_version(user_id)
+        return True
+
+    def delete_habit_and_logs(self, user_id: str, habit_id: str) -> int:
+        """Delete all logs of a habit, then the habit itself.
+
+        The habit outlives its logs, so a failed call can be retried.
+
+        Returns:
+            Number of deleted logs
+        """
+        deleted = self.batch_delete_habit_logs(habit_id)
+        self.delete_habit(user_id, habit_id)
+        return deleted
+
+    def iter_user_ids(self, reminder_enabled: bool = False) -> Iterator[str]:
+        """Lazily iterate the distinct user IDs that own at least one habit.
+
+        Args:
+            reminder_enabled: Only include users with an active habit that has
+                reminders enabled
+        """
+        seen: set[str] = set()
+        scan_kwargs: dict[str, Any] = {"ProjectionExpression": "user_id"}
+        if reminder_enabled:
+            scan_kwargs["FilterExpression"] = Attr("reminder_enabled").eq(True) & Attr(
+                "is_active"
+            ).ne(False)
+        pages = paginate_scan(self._habits_table, **scan_kwargs)
+        for item in chain.from_iterable(pages):
+            if item["user_id"] not in seen:
+                seen.add(item["user_id"])
+                yield item["user_id"]
+
+    def iter_all_habits(self) -> Iterator[dict[str, Any]]:
+        """Lazily iterate every habit in the table."""
+        return chain.from_iterable(paginate_scan(self._habits_table))
+
+    def iter_habits_in_reminder_slot(
+        self, slot: int, page_size: int | None = None
+    ) -> Iterator[dict[str, Any]]:
+        """Lazily iterate every user's habits whose reminder falls in a slot.
+
+        Reads the sparse reminder_slot index, so the cost depends on the
+        number of habits due in the slot rather than on the table size.
+        """
+        pages = paginate_query(
+            self._habits_table,
+            page_size,
+            IndexName=REMINDER_SLOT_INDEX,
+            KeyConditionExpression=Key("reminder_slot").eq(slot),
         )
-        return response.get("Item")
+        return chain.from_iterable(pages)
 
+    def batch_get_habits(
+        self,
+        user_id: str,
+        habit_ids: Iterable[str],
+        projection: Iterable[str] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Get a user's habits by ID with BatchGetItem.
+
+        Args:
+            user_id: Owner of the habits
+            habit_ids: Habit IDs; unknown IDs are left out of the result
+            projection: Attributes to return, defaults to all
+
+        Returns:
+            The habits found, in no particular order
+        """
+        return batch_get_items(
+            self._dynamodb.meta.client,
+            self._habits_table_name,
+            ({"user_id": user_id, "habit_id": habit_id} for habit_id in habit_ids),
+            projection,
+        )
+
+    def query_habits(
+        self, user_id: str, projection: list[str] | None = None
+    ) -> list[dict[str, Any]]:
+        """Query habits by user_id, optionally returning only some attributes."""
+        return list(self.iter_habits(user_id, projection=projection))
+
+    def query_habits_page(
+        self,
+        user_id: str,
+        limit: int,
+        start_key: dict[str, Any] | None = None,
+        projection: list[str] | None = None,
+    ) -> tuple[list[dict[str, Any]], dict[str, Any] | None]:
+        """Query one page of habits by user_id.
+
+        Returns:
+            The habits and the key to continue from, or None after the last page
+        """
+        kwargs: dict[str, Any] = {
+            "KeyConditionExpression": Key("user_id").eq(user_id),
+            "Limit": limit,
+            **projection_expression(projection),
+        }
+        if start_key:
+            kwargs["ExclusiveStartKey"] = start_key
+        response = self._habits_table.query(**kwargs)
+        return response.get("Items", []), response.get("LastEvaluatedKey")
+
+    def iter_habits(
+        self,
+        user_id: str,
+        page_size: int | None = None,
+        max_items: int | None = None,
+        projection: list[str] | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Lazily iterate habits by user_id across all result pages."""
+        pages = paginate_query(
+            self._habits_table,
+            page_size,
+            max_items,
+            KeyConditionExpression=Key("user_id").eq(user_id),
+            **projection_expression(projection),
+        )
+        return chain.from_iterable(pages)
+
+    # Habit logs operations
     def put_habit_log(self, item: dict[str, Any]) -> None:
-        """Put a habit log into the table."""
-        self._habit_logs_table.put_item(Item=item)
+        """Put a habit log into the table and update contribution counters."""
+        response = self._habit_logs_table.put_item(Item=item, ReturnValues="ALL_OLD")
+        old_item = response.get("Attributes", {})
+        delta = int(item.get("completed", False)) - int(
+            old_item.get("completed", False)
+        )
+        if delta:
+            self.apply_contribution_deltas(
+                item["user_id"],
+                {item["date"]: delta},
+                {(item["habit_id"], item["date"]): bool(item.get("completed", False))},
+            )
+        self.bump_version(item["user_id"])
+
+    def delete_habit_log(self, habit_id: str, date: str, user_id: str) -> bool:
+        """Delete a user's habit log and update contribution counters.
 
-    def delete_habit_log(self, habit_id: str, date: str) -> None:
-        """Delete a habit log by key."""
-        self._habit_logs_table.delete_item(Key={"habit_id": habit_id, "date": date})
+        Ownership is checked by the delete condition, so no prior read of the
+        habit or the log is needed.
+
+        Returns:
+            True if the log was deleted, False if no such log belongs to the user
+        """
+        try:
+            response = self._habit_logs_table.delete_item(
+                Key={"habit_id": habit_id, "date": date},
+                ConditionExpression=Attr("user_id").eq(user_id),
+                ReturnValues="ALL_OLD",
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                return False
+            raise
+        if response["Attributes"].get("completed", False):
+            self.apply_contribution_deltas(
+                user_id, {date: -1}, {(habit_id, date): False}
+            )
+        self.bump_version(user_id)
+        return True
 
     def query_habit_logs(
         self, habit_id: str, start_date: str | None = None, end_date: str | None = None
     ) -> list[dict[str, Any]]:
         """Query habit logs by habit_id with optional date range."""
-        key_condition = Key("habit_id").eq(habit_id)
-        if start_date and end_date:
-            key_condition = key_condition & Key("date").between(start_date, end_date)
-        elif start_date:
-            key_condition = key_condition & Key("date").gte(start_date)
-        elif end_date:
-            key_condition = key_condition & Key("date").lte(end_date)
+        return list(self.iter_habit_logs(habit_id, start_date, end_date))
 
-        response = self._habit_logs_table.query(KeyConditionExpression=key_condition)
-        return response.get("Items", [])
+    def iter_habit_logs(
+        self,
+        habit_id: str,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        page_size: int | None = None,
+        max_items: int | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Lazily iterate habit logs by habit_id across all result pages."""
+        pages = paginate_query(
+            self._habit_logs_table,
+            page_size,
+            max_items,
+            KeyConditionExpression=_with_date_range(
+                Key("habit_id").eq(habit_id), start_date, end_date
+            ),
+        )
+        return chain.from_iterable(pages)
+
+    def has_habit_logs(self, habit_id: str) -> bool:
+        """Check whether a habit has any logs left, reading at most one key."""
+        response = self._habit_logs_table.query(
+            KeyConditionExpression=Key("habit_id").eq(habit_id),
+            ProjectionExpression="habit_id",
+            Limit=1,
+        )
+        return bool(response["Items"])
 
     def query_habit_logs_by_user(
         self, user_id: str, start_date: str | None = None, end_date: str | None = None
     ) -> list[dict[str, Any]]:
         """Query habit logs by user_id using GSI."""
-        key_condition = Key("user_id").eq(user_id)
-        if start_date and end_date:
-            key_condition = key_condition & Key("date").between(start_date, end_date)
-        elif start_date:
-            key_condition = key_condition & Key("date").gte(start_date)
-        elif end_date:
-            key_condition = key_condition & Key("date").lte(end_date)
+        return list(self.iter_habit_logs_by_user(user_id, start_date, end_date))
 
-        response = self._habit_logs_table.query(
+    def iter_habit_logs_by_user(
+        self,
+        user_id: str,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        page_size: int | None = None,
+        max_items: int | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Lazily iterate habit logs by user_id using GSI across all pages."""
+        pages = paginate_query(
+            self._habit_logs_table,
+            page_size,
+            max_items,
             IndexName="user_id-date-index",
-            KeyConditionExpression=key_condition,
+            KeyConditionExpression=_with_date_range(
+                Key("user_id").eq(user_id), start_date, end_date
+            ),
+        )
+        return chain.from_iterable(pages)
+
+    def batch_delete_habit_logs(
+        self, habit_id: str, max_items: int | None = None
+    ) -> int:
+        """Delete a habit's logs and update contribution counters.
+
+        Log keys are streamed page by page and deleted with BatchWriteItem
+        chunks fanned out over a bounded thread pool.
+
+        Args:
+            habit_id: Habit whose logs are deleted
+            max_items: Optional cap on the number of logs deleted by this call
+
+        Returns:
+            Number of deleted logs
+        """
+        settings = get_settings()
+        max_workers = settings.batch_write_max_workers
+        logs = chain.from_iterable(
+            paginate_query(
+                self._habit_logs_table,
+                max_items=max_items,
+                KeyConditionExpression=Key("habit_id").eq(habit_id),
+                # user_id and completed are needed for the counter deltas
+                ProjectionExpression="habit_id, #date, user_id, completed",
+                ExpressionAttributeNames={"#date": "date"},
+            )
+        )
+
+        deleted = 0
+        deltas: dict[str, dict[str, int]] = defaultdict(dict)
+        removed: dict[str, dict[tuple[str, str], bool]] = defaultdict(dict)
+        user_ids: set[str] = set()
+
+        def record(future: Future[list[dict[str, Any]]]) -> None:
+            nonlocal deleted
+            chunk = future.result()
+            deleted += len(chunk)
+            for log in chunk:
+                user_ids.add(log["user_id"])
+                if log.get("completed", False):
+                    deltas[log["user_id"]][log["date"]] = -1
+                    removed[log["user_id"]][(log["habit_id"], log["date"])] = False
+
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                in_flight: set[Future[list[dict[str, Any]]]] = set()
+                for chunk in _chunks(logs, BATCH_WRITE_CHUNK_SIZE):
+                    # Bound the number of pending chunks held in memory
+                    if len(in_flight) >= 2 * max_workers:
+                        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            record(future)
+                    in_flight.add(executor.submit(self._delete_log_chunk, chunk))
+                for future in in_flight:
+                    record(future)
+        finally:
+            # Keep counters consistent with whatever was deleted, even on failure
+            for user_id, user_deltas in deltas.items():
+                self.apply_contribution_deltas(user_id, user_deltas, removed[user_id])
+            for user_id in user_ids:
+                self.bump_version(user_id)
+        return deleted
+
+    def _delete_log_chunk(self, logs: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Delete up to BATCH_WRITE_CHUNK_SIZE logs in one BatchWriteItem."""
+        batch_write_with_retry(
+            self._dynamodb.meta.client,
+            self._habit_logs_table.name,
+            [
+                {
+                    "DeleteRequest": {
+                        "Key": {"habit_id": log["habit_id"], "date": log["date"]}
+                    }
+                }
+                for log in logs
+            ],
+        )
+        return logs
+
+    def batch_put_habit_logs(self, logs: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Write many habit logs and update contribution counters.
+
+        BatchWriteItem cannot return the items it replaces, so the previous
+        completion state is read with BatchGetItem first. Chunks are written
+        concurrently; a concurrent write to the same log between the read and
+        the write can skew that day's counter until it is rebuilt.
+
+        Args:
+            logs: Habit logs with distinct (habit_id, date) keys
+
+        Returns:
+            Logs that were still unprocessed after retries and were not written
+        """
+        previous = batch_get_items(
+            self._dynamodb.meta.client,
+            self._habit_logs_table_name,
+            ({"habit_id": log["habit_id"], "date": log["date"]} for log in logs),
+            projection=["habit_id", "date", "completed"],
+        )
+        completed_before = {
+            (old["habit_id"], old["date"]): old.get("completed", False)
+            for old in previous
+        }
+
+        written: list[dict[str, Any]] = []
+        unprocessed: list[dict[str, Any]] = []
+        chunks = list(_chunks(logs, BATCH_WRITE_CHUNK_SIZE))
+        max_workers = min(get_settings().batch_write_max_workers, len(chunks)) or 1
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    executor.submit(self._put_log_chunk, chunk) for chunk in chunks
+                ]
+                for chunk, future in zip(chunks, futures, strict=True):
+                    chunk_unprocessed = future.result()
+                    unprocessed.extend(chunk_unprocessed)
+                    failed = {
+                        (log["habit_id"], log["date"]) for log in chunk_unprocessed
+                    }
+                    written.extend(
+                        log
+                        for log in chunk
+                        if (log["habit_id"], log["date"]) not in failed
+                    )
+        finally:
+            # Keep counters consistent with whatever was written, even on failure
+            deltas: dict[str, Counter[str]] = defaultdict(Counter)
+            states: dict[str, dict[tuple[str, str], bool]] = defaultdict(dict)
+            for log in written:
+                key = (log["habit_id"], log["date"])
+                before = completed_before.get(key, False)
+                after = log.get("completed", False)
+                deltas[log["user_id"]][log["date"]] += int(after) - int(before)
+                states[log["user_id"]][key] = bool(after)
+            for user_id, user_deltas in deltas.items():
+                self.apply_contribution_deltas(user_id, user_deltas, states[user_id])
+            for user_id in {log["user_id"] for log in written}:
+                self.bump_version(user_id)
+        return unprocessed
+
+    def _put_log_chunk(self, logs: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Put up to BATCH_WRITE_CHUNK_SIZE logs; return those left unprocessed."""
+        unprocessed = try_batch_write(
+            self._dynamodb.meta.client,
+            self._habit_logs_table.name,
+            [{"PutRequest": {"Item": log}} for log in logs],
+        )
+        return [request["PutRequest"]["Item"] for request in unprocessed]
+
+    # Contribution aggregate operations
+    #
+    # One item per (user_id, year) holds a counter attribute per ISO date with
+    # the number of completed habit logs on that day. Only items carrying the
+    # CONTRIBUTIONS_BUILT marker were counted from the logs; anything else is
+    # reported as missing and rebuilt.
+    def get_contribution_counts(self, user_id: str, year: int) -> dict[str, int] | None:
+        """Get the per-date completion counters for a user's year.
+
+        Returns:
+            The counters, or None if the year's aggregate has not been built
+        """
+        response = self._contributions_table.get_item(
+            Key={"user_id": user_id, "year": year}
+        )
+        item = response.get("Item")
+        if item is None or CONTRIBUTIONS_BUILT not in item:
+            return None
+        return _date_counts(item)
+
+    def query_contribution_counts(
+        self, user_id: str, start_year: int, end_year: int
+    ) -> dict[int, dict[str, int]]:
+        """Get the built per-date completion counters for a range of years.
+
+        All years are read with one query; years without a built aggregate are
+        left out.
+        """
+        pages = paginate_query(
+            self._contributions_table,
+            KeyConditionExpression=Key("user_id").eq(user_id)
+            & Key("year").between(start_year, end_year),
+        )
+        return {
+            int(item["year"]): _date_counts(item)
+            for item in chain.from_iterable(pages)
+            if CONTRIBUTIONS_BUILT in item
+        }
+
+    def apply_contribution_deltas(
+        self,
+        user_id: str,
+        deltas: Mapping[str, int],
+        written: Mapping[tuple[str, str], bool],
+    ) -> None:
+        """Atomically add per-date deltas to the user's contribution counters.
+
+        Call this after the log writes have landed. Deltas are only added to a
+        built aggregate; a year without one is rebuilt from the logs, with the
+        written logs taken from the caller since the user_id GSI may not have
+        caught up with them yet.
+
+        Args:
+            user_id: User whose logs were written
+            deltas: Change of the completion count per ISO date
+            written: Completion state of every written log that changed a
+                count, by (habit_id, date); deleted logs are False
+        """
+        by_year: dict[int, list[tuple[str, int]]] = defaultdict(list)
+        for log_date, delta in deltas.items():
+            if delta:
+                by_year[int(log_date[:4])].append((log_date, delta))
+
+        for year, year_deltas in by_year.items():
+            try:
+                for chunk in _chunks(year_deltas, CONTRIBUTION_UPDATE_CHUNK_SIZE):
+                    self._contributions_table.update_item(
+                        Key={"user_id": user_id, "year": year},
+                        UpdateExpression="ADD "
+                        + ", ".join(f"#d{i} :d{i}" for i in range(len(chunk))),
+                        ConditionExpression=Attr(CONTRIBUTIONS_BUILT).exists(),
+                        ExpressionAttributeNames={
+                            f"#d{i}": log_date for i, (log_date, _) in enumerate(chunk)
+                        },
+                        ExpressionAttributeValues={
+                            f":d{i}": delta for i, (_, delta) in enumerate(chunk)
+                        },
+                    )
+            except ClientError as e:
+                if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                    raise
+                # The marker is never removed, so no chunk of this year landed
+                self.rebuild_contribution_counts(
+                    user_id,
+                    year,
+                    {
+                        key: completed
+                        for key, completed in written.items()
+                        if int(key[1][:4]) == year
+                    },
+                )
+
+    def put_contribution_counts(
+        self, user_id: str, year: int, date_counts: Mapping[str, int]
+    ) -> None:
+        """Replace a user's contribution counters for a year with built ones."""
+        self._contributions_table.put_item(
+            Item={
+                "user_id": user_id,
+                "year": year,
+                CONTRIBUTIONS_BUILT: True,
+                **date_counts,
+            }
+        )
+        self.bump_version(user_id)
+
+    def rebuild_contribution_counts(
+        self,
+        user_id: str,
+        year: int,
+        written: Mapping[tuple[str, str], bool] | None = None,
+    ) -> dict[str, int]:
+        """Recount a user's year from habit logs and store it as built.
+
+        The logs are read from the eventually consistent user_id GSI, so a
+        writer passes the logs it has just written; their state overrides
+        what the index returns. An unbuilt item, e.g. one only ever updated by
+        deltas before the marker existed, is replaced. If another rebuild
+        stored a built aggregate first, it is kept, as deltas may have been
+        added to it since; the counters of the written days are then set from
+        this recount in case the other rebuild missed those writes.
+
+        Args:
+            user_id: User whose year is rebuilt
+            year: Year to rebuild
+            written: Completion state of logs the caller has just written in
+                the year, by (habit_id, date); deleted logs are False
+
+        Returns:
+            The stored per-date counters
+        """
+        written = written or {}
+        logs = self.iter_habit_logs_by_user(user_id, f"{year}-01-01", f"{year}-12-31")
+        states = {
+            (log["habit_id"], log["date"]): bool(log.get("completed", False))
+            for log in logs
+        }
+        states.update(written)
+        counts = dict(
+            Counter(
+                log_date for (_, log_date), completed in states.items() if completed
+            )
         )
-        return response.get("Items", [])
+        try:
+            self._contributions_table.put_item(
+                Item={
+                    "user_id": user_id,
+                    "year": year,
+                    CONTRIBUTIONS_BUILT: True,
+                    **counts,
+                },
+                ConditionExpression=Attr(CONTRIBUTIONS_BUILT).not_exists(),
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                raise
+        else:
+            return counts
 
-    def batch_delete_habit_logs(self, habit_id: str) -> None:
-        """Delete all habit logs for a habit."""
-        logs = self.query_habit_logs(habit_id)
-        with self._habit_logs_table.batch_writer() as batch:
-            for log in logs:
-                batch.delete_item(Key={"habit_id": habit_id, "date": log["date"]})
+        recount = [
+            (log_date, counts.get(log_date, 0))
+            for log_date in sorted({log_date for _, log_date in written})
+        ]
+        if not recount:
+            return self.get_contribution_counts(user_id, year) or {}
+        item: dict[str, Any] = {}
+        for chunk in _chunks(recount, CONTRIBUTION_UPDATE_CHUNK_SIZE):
+            response = self._contributions_table.update_item(
+                Key={"user_id": user_id, "year": year},
+                UpdateExpression="SET "
+                + ", ".join(f"#d{i} = :d{i}" for i in range(len(chunk))),
+                ExpressionAttributeNames={
+                    f"#d{i}": log_date for i, (log_date, _) in enumerate(chunk)
+                },
+                ExpressionAttributeValues={
+                    f":d{i}": count for i, (_, count) in enumerate(chunk)
+                },
+                ReturnValues="ALL_NEW",
+            )
+            item = response["Attributes"]
+        return _date_counts(item)
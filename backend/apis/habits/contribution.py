@@ -1,8 +1,9 @@
 """Contribution calculation for habit tracking."""
 
+from array import array
+from collections.abc import Iterator, Mapping
 from datetime import date, timedelta
-
-from models import ContributionData, ContributionResponse
+from functools import lru_cache
 
 
 def calculate_contribution_level(count: int, max_count: int) -> int:
@@ -41,44 +42,116 @@ def generate_year_dates(year: int) -> list[str]:
     return dates
 
 
-def calculate_contributions(
-    habit_logs: list[dict], year: int, habit_count: int
-) -> ContributionResponse:
-    """Calculate contribution data for a year.
+@lru_cache(maxsize=8)
+def _year_date_fragments(year: int) -> tuple[str, ...]:
+    """Get the leading JSON fragment of each day's entry, indexed by day of year."""
+    return tuple(f'{{"date":"{d}","count":' for d in generate_year_dates(year))
+
+
+@lru_cache(maxsize=32)
+def _level_table(max_count: int) -> bytes:
+    """Get contribution levels indexed by count, for counts up to max_count."""
+    return bytes(
+        calculate_contribution_level(c, max_count) for c in range(max_count + 1)
+    )
+
+
+def _count_buffer(date_counts: Mapping[str, int], start: date, end: date) -> array:
+    """Place per-date counts into a fixed-size day-index buffer for a date range."""
+    first_ordinal = start.toordinal()
+    counts = array("H", bytes(2 * (end.toordinal() - first_ordinal + 1)))
+    for log_date, count in date_counts.items():
+        # Only canonical YYYY-MM-DD keys can match a generated day
+        if len(log_date) != 10:
+            continue
+        try:
+            day_index = date.fromisoformat(log_date).toordinal() - first_ordinal
+        except ValueError:
+            continue
+        if 0 <= day_index < len(counts):
+            counts[day_index] = count
+    return counts
+
+
+def _range_date_fragments(start: date, end: date) -> Iterator[str]:
+    """Yield the leading JSON fragment of each day's entry in a date range."""
+    for year in range(start.year, end.year + 1):
+        first_day = date(year, 1, 1)
+        fragments = _year_date_fragments(year)
+        lo = (start - first_day).days if year == start.year else 0
+        hi = (end - first_day).days + 1 if year == end.year else len(fragments)
+        yield from fragments[lo:hi]
+
+
+def encode_contributions(
+    date_counts: Mapping[str, int], year: int, habit_count: int
+) -> bytes:
+    """Encode a year's contribution response as JSON without per-day models.
+
+    Counts are placed in a fixed-size day-of-year buffer and mapped to levels
+    through a lookup table. The output is byte-identical to FastAPI's
+    rendering of the equivalent ContributionResponse model.
 
     Args:
-        habit_logs: List of habit log entries with 'date' and 'completed' fields
-        year: The year to calculate contributions for
+        date_counts: Number of completed habit logs keyed by ISO date
+        year: The year to encode contributions for
         habit_count: Total number of active habits
 
     Returns:
-        ContributionResponse with daily contribution data
+        UTF-8 encoded ContributionResponse JSON body
     """
-    # Count completions per date
-    date_counts: dict[str, int] = {}
-    for log in habit_logs:
-        if log.get("completed", False):
-            log_date = log["date"]
-            date_counts[log_date] = date_counts.get(log_date, 0) + 1
-
-    # Get max count for level calculation
     max_count = habit_count if habit_count > 0 else 1
+    counts = _count_buffer(date_counts, date(year, 1, 1), date(year, 12, 31))
 
-    # Generate all dates for the year
-    all_dates = generate_year_dates(year)
+    levels = _level_table(max_count)
+    data = ",".join(
+        f'{fragment}{count},"level":{levels[min(count, max_count)]}}}'
+        for fragment, count in zip(_year_date_fragments(year), counts, strict=True)
+    )
+    return (
+        f'{{"year":{year},"total_contributions":{sum(counts)},"data":[{data}]}}'
+    ).encode()
 
-    # Build contribution data
-    contribution_data = []
-    total_contributions = 0
 
-    for d in all_dates:
-        count = date_counts.get(d, 0)
-        total_contributions += count
-        level = calculate_contribution_level(count, max_count)
-        contribution_data.append(ContributionData(date=d, count=count, level=level))
+def encode_contribution_range(
+    date_counts: Mapping[str, int],
+    start: date,
+    end: date,
+    habit_count: int,
+    columnar: bool = False,
+) -> bytes:
+    """Encode contributions for an arbitrary date range in a single pass.
 
-    return ContributionResponse(
-        year=year,
-        total_contributions=total_contributions,
-        data=contribution_data,
+    Args:
+        date_counts: Number of completed habit logs keyed by ISO date
+        start: First day of the range
+        end: Last day of the range (inclusive)
+        habit_count: Total number of active habits
+        columnar: Emit parallel counts/levels arrays instead of per-day objects
+
+    Returns:
+        UTF-8 encoded ContributionRangeResponse, or
+        ContributionColumnarResponse when columnar is set
+    """
+    max_count = habit_count if habit_count > 0 else 1
+    counts = _count_buffer(date_counts, start, end)
+    table = _level_table(max_count)
+    levels = [table[min(count, max_count)] for count in counts]
+
+    header = (
+        f'{{"start_date":"{start.isoformat()}","end_date":"{end.isoformat()}",'
+        f'"total_contributions":{sum(counts)},'
+    )
+    if columnar:
+        return (
+            f'{header}"counts":[{",".join(map(str, counts))}],'
+            f'"levels":[{",".join(map(str, levels))}]}}'
+        ).encode()
+
+    data = ",".join(
+        f'{fragment}{count},"level":{level}}}'
+        for fragment, count, level in zip(
+            _range_date_fragments(start, end), counts, levels, strict=True
+        )
     )
+    return f'{header}"data":[{data}]}}'.encode()
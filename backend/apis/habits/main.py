@@ -1,28 +1,46 @@
 """Habits API Lambda entrypoint."""
 
+import asyncio
 import logging
-from datetime import date
+from collections import defaultdict
+from datetime import UTC, date, datetime
+from typing import TypeVar
 
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, Header, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from mangum import Mangum
-from pydantic import BaseModel
 
-from api_handler import router
-from client import HabitsClient, get_settings
-from contribution import calculate_contributions
-from models import ContributionResponse
-from slack_notifier import format_reminder_message, send_slack_notification
+from api_handler import (
+    REVALIDATE,
+    cache_headers,
+    etag_matches,
+    not_modified,
+    ownership_cache,
+    response_class,
+    router,
+    version_etag,
+)
+from api_handler import db as habits_db
+from client import get_settings, run_sync
+from models import (
+    ContributionColumnarResponse,
+    ContributionRangeResponse,
+    ContributionResponse,
+    ReminderResponse,
+)
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+T = TypeVar("T")
+
 app = FastAPI(
     title="Habits API",
     version="1.0.0",
     docs_url="/docs" if settings.debug else None,
     redoc_url="/redoc" if settings.debug else None,
+    default_response_class=response_class,
 )
 
 # CORS middleware
@@ -46,34 +64,133 @@ async def global_exception_handler(request: Request, exc: Exception) -> JSONResp
     )
 
 
-app.include_router(router, prefix="/api/v1")
+def _unwrap(result: T | BaseException) -> T:
+    """Return a result collected with return_exceptions=True, or raise it.
+
+    Reads are issued together, but their results are checked in the order the
+    handler used to run them so that error responses stay the same.
+    """
+    if isinstance(result, BaseException):
+        raise result
+    return result
 
 
 # Contribution endpoint (outside of router for cleaner URL)
-@app.get("/api/v1/habits/contributions", response_model=ContributionResponse)
+@app.get(
+    "/api/v1/habits/contributions",
+    response_model=ContributionResponse
+    | ContributionRangeResponse
+    | ContributionColumnarResponse,
+)
 async def get_contributions(
-    user_id: str, year: int | None = None
-) -> ContributionResponse:
-    """Get contribution data for a user's habits in a given year."""
-    if year is None:
-        year = date.today().year
-
-    db = HabitsClient(settings.habits_table_name, settings.habit_logs_table_name)
+    user_id: str,
+    year: int | None = None,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    columnar: bool = False,
+    if_none_match: str | None = Header(None),
+) -> Response:
+    """Get contribution data for a user's habits.
+
+    By default a single calendar year is returned. Passing start_date and
+    end_date returns an arbitrary range (capped by
+    contributions_max_range_days), and columnar=true switches the body to
+    parallel counts/levels arrays.
+
+    Responses carry a weak ETag of the user's change counter, which every
+    habit and log write bumps; with a matching If-None-Match only the counter
+    is read. Past years are cached by the browser for
+    contributions_past_max_age_seconds, as they rarely change.
+    """
+    from contribution import encode_contribution_range, encode_contributions
+
+    is_range = start_date is not None or end_date is not None
+    if is_range:
+        if start_date is None or end_date is None:
+            raise HTTPException(
+                status_code=422,
+                detail="start_date and end_date must be given together",
+            )
+        if year is not None:
+            raise HTTPException(
+                status_code=422,
+                detail="year cannot be combined with start_date and end_date",
+            )
+        if end_date < start_date:
+            raise HTTPException(
+                status_code=422, detail="end_date must not be before start_date"
+            )
+        if (end_date - start_date).days + 1 > settings.contributions_max_range_days:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Date range exceeds {settings.contributions_max_range_days} days",
+            )
+    else:
+        if year is None:
+            year = date.today().year
+        start_date, end_date = date(year, 1, 1), date(year, 12, 31)
+
+    cache_control = REVALIDATE
+    if end_date.year < date.today().year:
+        cache_control = (
+            f"private, max-age={settings.contributions_past_max_age_seconds}"
+        )
+    # The counter is read first, so the data is at least as new as it
+    etag = version_etag(
+        user_id,
+        await run_sync(habits_db.get_version, user_id),
+        start_date,
+        end_date,
+        columnar,
+    )
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, cache_control)
+
+    # Read the habits and the precomputed per-day counters for every year
+    # concurrently; the counters are only used once the user has active habits
+    habits, counts_by_year = await asyncio.gather(
+        run_sync(habits_db.query_habits, user_id),
+        run_sync(
+            habits_db.query_contribution_counts, user_id, start_date.year, end_date.year
+        ),
+        return_exceptions=True,
+    )
 
     # Get active habits count
-    habits = db.query_habits(user_id)
-    active_habits = [h for h in habits if h.get("is_active", True)]
+    active_habits = [h for h in _unwrap(habits) if h.get("is_active", True)]
     habit_count = len(active_habits)
 
     if habit_count == 0:
         raise HTTPException(status_code=404, detail="No habits found for user")
 
-    # Get all logs for the year
-    start_date = f"{year}-01-01"
-    end_date = f"{year}-12-31"
-    logs = db.query_habit_logs_by_user(user_id, start_date, end_date)
+    # Build the counters from the logs for years without a built aggregate
+    counts_by_year = _unwrap(counts_by_year)
+    date_counts: dict[str, int] = {}
+    for counts_year in range(start_date.year, end_date.year + 1):
+        year_counts = counts_by_year.get(counts_year)
+        if year_counts is None:
+            year_counts = await run_sync(
+                habits_db.rebuild_contribution_counts, user_id, counts_year
+            )
+        date_counts.update(year_counts)
+
+    if is_range or columnar:
+        content = encode_contribution_range(
+            date_counts, start_date, end_date, habit_count, columnar
+        )
+    else:
+        content = encode_contributions(date_counts, start_date.year, habit_count)
+
+    return Response(
+        content=content,
+        media_type="application/json",
+        headers=cache_headers(etag, cache_control),
+    )
+
 
-    return calculate_contributions(logs, year, habit_count)
+# Registered after the contribution route so that /habits/contributions is not
+# captured by /habits/{habit_id}
+app.include_router(router, prefix="/api/v1")
 
 
 @app.get("/health")
@@ -82,13 +199,10 @@ async def health_check() -> dict[str, str]:
     return {"status": "healthy", "api": "habits"}
 
 
-class ReminderResponse(BaseModel):
-    """Response model for reminder endpoint."""
-
-    success: bool
-    message: str
-    incomplete_count: int
-    total_count: int
+@app.get("/health/cache")
+async def cache_stats() -> dict[str, dict[str, int]]:
+    """In-process cache counters for this container."""
+    return {"ownership": ownership_cache.stats()}
 
 
 @app.post("/api/v1/habits/reminder", response_model=ReminderResponse)
@@ -98,81 +212,36 @@ async def send_reminder(user_id: str) -> ReminderResponse:
     This endpoint checks for incomplete habits for the current day
     and sends a Slack notification if there are any.
     """
+    from reminder import evaluate_reminder
+    from slack_notifier import deliver_slack_notification, format_reminder_message
+
     if not settings.slack_webhook_url:
         raise HTTPException(
             status_code=503,
             detail="Slack webhook URL is not configured",
         )
 
-    db = HabitsClient(settings.habits_table_name, settings.habit_logs_table_name)
-
-    # Get all active habits
-    habits = db.query_habits(user_id)
-    active_habits = [h for h in habits if h.get("is_active", True)]
-
-    if not active_habits:
-        return ReminderResponse(
-            success=True,
-            message="No active habits found",
-            incomplete_count=0,
-            total_count=0,
-        )
-
-    # Get today's logs
-    today = date.today().isoformat()
-    logs = db.query_habit_logs_by_user(user_id, today, today)
-    completed_habit_ids = {
-        log["habit_id"] for log in logs if log.get("completed", False)
-    }
-
-    # Filter for habits that are due today
-    today_weekday = date.today().weekday()  # 0=Monday, 6=Sunday
-    due_habits = []
-    for habit in active_habits:
-        frequency = habit.get("frequency", "daily")
-        if frequency == "daily":
-            due_habits.append(habit)
-        elif frequency == "weekdays" and today_weekday < 5:
-            due_habits.append(habit)
-        elif frequency == "weekly" and today_weekday == 0:  # Monday
-            due_habits.append(habit)
-
-    if not due_habits:
-        return ReminderResponse(
-            success=True,
-            message="No habits due today",
-            incomplete_count=0,
-            total_count=0,
-        )
-
-    # Find incomplete habits with reminder enabled
-    incomplete_habits = [
-        h
-        for h in due_habits
-        if h["habit_id"] not in completed_habit_ids and h.get("reminder_enabled", False)
-    ]
-
-    completed_count = len(
-        [h for h in due_habits if h["habit_id"] in completed_habit_ids]
+    day = date.today()
+    habits, logs = await asyncio.gather(
+        run_sync(habits_db.query_habits, user_id),
+        run_sync(
+            habits_db.query_habit_logs_by_user,
+            user_id,
+            day.isoformat(),
+            day.isoformat(),
+        ),
+        return_exceptions=True,
     )
-    total_count = len(due_habits)
-
-    if not incomplete_habits:
-        return ReminderResponse(
-            success=True,
-            message="All habits with reminders are completed",
-            incomplete_count=0,
-            total_count=total_count,
-        )
+    habits = _unwrap(habits)
+    if not any(h.get("is_active", True) for h in habits):
+        # The logs are not needed, so neither is their outcome
+        logs = []
+    result, notice = evaluate_reminder(habits_db, user_id, day, habits, _unwrap(logs))
+    if notice is None:
+        return result
 
-    # Format and send message
-    message = format_reminder_message(
-        incomplete_habits=incomplete_habits,
-        total_habits=total_count,
-        completed_count=completed_count,
-    )
-
-    success = send_slack_notification(settings.slack_webhook_url, message)
+    message = format_reminder_message(**notice)
+    success = await deliver_slack_notification(settings.slack_webhook_url, message)
 
     if not success:
         raise HTTPException(
@@ -180,12 +249,7 @@ async def send_reminder(user_id: str) -> ReminderResponse:
             detail="Failed to send Slack notification",
         )
 
-    return ReminderResponse(
-        success=True,
-        message=f"Reminder sent for {len(incomplete_habits)} incomplete habits",
-        incomplete_count=len(incomplete_habits),
-        total_count=total_count,
-    )
+    return result
 
 
 def lambda_reminder_handler(event: dict, context: object) -> dict:
@@ -193,8 +257,23 @@ def lambda_reminder_handler(event: dict, context: object) -> dict:
 
     This function is designed to be triggered by EventBridge (CloudWatch Events)
     on a schedule to send reminders for incomplete habits.
+
+    An event with {"all_users": true} runs in batch mode: every user with an
+    active reminder-enabled habit is evaluated concurrently (bounded by
+    reminder_max_concurrency) and per-user outcomes are returned.
+
+    An event with {"due_now": true} is meant to fire once per reminder slot
+    (reminder_slot_minutes) and only evaluates habits whose reminder_time
+    falls in the current slot, across all users.
+
+    With reminder_digest_window_seconds > 0, the default, batch runs post one
+    Block Kit digest per webhook instead of one message per user, which
+    slack_min_interval_seconds would space a second apart.
     """
-    import asyncio
+    if event.get("all_users", False) or event.get("due_now", False):
+        return asyncio.get_event_loop().run_until_complete(
+            run_batch_reminders(due_now=event.get("due_now", False))
+        )
 
     # Default user_id for personal app
     user_id = event.get("user_id", "default")
@@ -221,4 +300,79 @@ def lambda_reminder_handler(event: dict, context: object) -> dict:
     return asyncio.get_event_loop().run_until_complete(run_reminder())
 
 
-handler = Mangum(app, lifespan="off")
+async def run_batch_reminders(due_now: bool = False) -> dict:
+    """Send reminders to every user with reminder-enabled habits.
+
+    Args:
+        due_now: Only consider habits whose reminder falls in the current
+            reminder slot, read from the sparse reminder_slot index
+    """
+    from reminder import current_reminder_slot, run_reminders
+    from slack_notifier import ReminderDigest
+
+    if not settings.slack_webhook_url:
+        return {
+            "statusCode": 503,
+            "body": {"detail": "Slack webhook URL is not configured"},
+        }
+
+    habits_by_user: dict[str, list[dict]] | None = None
+    if due_now:
+        day, slot = current_reminder_slot(
+            datetime.now(UTC),
+            settings.reminder_slot_minutes,
+            settings.reminder_utc_offset_minutes,
+        )
+        # The paginated reads are collected on the executor, off the event loop
+        habits_by_user = defaultdict(list)
+        for habit in await run_sync(
+            lambda: list(habits_db.iter_habits_in_reminder_slot(slot))
+        ):
+            habits_by_user[habit["user_id"]].append(habit)
+        user_ids = list(habits_by_user)
+    else:
+        day = date.today()
+        user_ids = await run_sync(
+            lambda: list(habits_db.iter_user_ids(reminder_enabled=True))
+        )
+
+    digest = None
+    if settings.reminder_digest_window_seconds > 0:
+        digest = ReminderDigest(settings.reminder_digest_window_seconds)
+    results = await run_reminders(
+        habits_db,
+        user_ids,
+        settings.slack_webhook_url,
+        day,
+        settings.reminder_max_concurrency,
+        habits_by_user,
+        digest,
+    )
+    failed = sum(1 for r in results if not r.success)
+    logger.info(f"Reminders evaluated for {len(results)} users, {failed} failed")
+    return {
+        "statusCode": 200,
+        "body": {"results": [r.model_dump() for r in results]},
+    }
+
+
+http_handler = Mangum(app, lifespan="off")
+
+
+def handler(event: dict, context: object) -> dict:
+    """Lambda entry point for HTTP requests and async habit deletions.
+
+    DELETE /api/v1/habits/{habit_id} invokes this function asynchronously with
+    {"delete_habit_logs": habit_id, "user_id": user_id} when a habit has too
+    many logs to delete within the request; the logs are deleted, then the
+    habit. Events without user_id only delete the logs.
+    """
+    if "delete_habit_logs" in event:
+        habit_id = event["delete_habit_logs"]
+        if "user_id" in event:
+            deleted = habits_db.delete_habit_and_logs(event["user_id"], habit_id)
+        else:
+            deleted = habits_db.batch_delete_habit_logs(habit_id)
+        logger.info(f"Deleted {deleted} logs of habit {habit_id}")
+        return {"deleted": deleted}
+    return http_handler(event, context)
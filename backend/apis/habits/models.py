@@ -1,8 +1,9 @@
 """Data models for Habits API."""
 
 from enum import Enum
+from functools import lru_cache
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, create_model, field_validator
 
 
 class TimestampMixin(BaseModel):
@@ -57,6 +58,28 @@ class HabitResponse(HabitBase, TimestampMixin):
     user_id: str
 
 
+@lru_cache(maxsize=64)
+def habit_fields_model(fields: tuple[str, ...]) -> type[BaseModel]:
+    """Build a HabitResponse variant with only the given fields, for fields=."""
+    return create_model(
+        "HabitFieldsResponse",
+        **{
+            name: (
+                HabitResponse.model_fields[name].annotation,
+                HabitResponse.model_fields[name],
+            )
+            for name in fields
+        },
+    )
+
+
+class HabitPageResponse(BaseModel):
+    """One page of habits; pass next_cursor as cursor to get the next page."""
+
+    items: list[HabitResponse]
+    next_cursor: str | None = None
+
+
 class HabitLogBase(BaseModel):
     """Base schema for habit logs."""
 
@@ -78,6 +101,56 @@ class HabitLogResponse(HabitLogBase):
     completed_at: str | None = None
 
 
+# Maximum number of logs written by one batch request
+HABIT_LOG_BATCH_MAX_ENTRIES = 100
+
+
+class HabitLogBatchEntry(HabitLogCreate):
+    """One log in a batch write."""
+
+    habit_id: str = Field(..., min_length=1)
+
+
+class HabitLogBatchCreate(BaseModel):
+    """Schema for writing many habit logs at once."""
+
+    logs: list[HabitLogBatchEntry] = Field(
+        ..., min_length=1, max_length=HABIT_LOG_BATCH_MAX_ENTRIES
+    )
+
+    @field_validator("logs")
+    @classmethod
+    def unique_logs(cls, logs: list[HabitLogBatchEntry]) -> list[HabitLogBatchEntry]:
+        """Reject several entries for the same habit and date."""
+        keys = {(log.habit_id, log.date) for log in logs}
+        if len(keys) != len(logs):
+            raise ValueError("Each habit_id and date pair may appear only once")
+        return logs
+
+
+class HabitLogBatchResult(BaseModel):
+    """Outcome of one entry of a batch write."""
+
+    habit_id: str
+    date: str
+    status_code: int
+    detail: str | None = None
+    log: HabitLogResponse | None = None
+
+
+class HabitLogBatchResponse(BaseModel):
+    """Per-entry results of a batch write, in request order."""
+
+    results: list[HabitLogBatchResult]
+
+
+class HabitDailyStatusResponse(BaseModel):
+    """Schema for every habit's completion status on a date."""
+
+    date: str
+    logs: dict[str, HabitLogResponse | None]  # keyed by habit_id
+
+
 class ContributionData(BaseModel):
     """Schema for contribution data."""
 
@@ -92,3 +165,41 @@ class ContributionResponse(BaseModel):
     year: int
     total_contributions: int
     data: list[ContributionData]
+
+
+class ContributionRangeResponse(BaseModel):
+    """Schema for contribution response over an arbitrary date range."""
+
+    start_date: str
+    end_date: str
+    total_contributions: int
+    data: list[ContributionData]
+
+
+class ContributionColumnarResponse(BaseModel):
+    """Schema for columnar contribution response.
+
+    counts[i] and levels[i] describe the day start_date + i.
+    """
+
+    start_date: str
+    end_date: str
+    total_contributions: int
+    counts: list[int]
+    levels: list[int]  # 0-4
+
+
+class ReminderResponse(BaseModel):
+    """Response model for reminder endpoint."""
+
+    success: bool
+    message: str
+    incomplete_count: int
+    total_count: int
+
+
+class UserReminderResult(ReminderResponse):
+    """Outcome of one user's reminder in a batch run."""
+
+    user_id: str
+    status_code: int
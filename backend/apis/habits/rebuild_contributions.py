@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Rebuild precomputed contribution counters from habit logs.
+
+Backfills the per-user, per-year aggregate items read by
+GET /api/v1/habits/contributions, e.g. after the aggregates table is first
+deployed or to repair drift.
+
+Usage:
+    python rebuild_contributions.py                       # every user
+    python rebuild_contributions.py --user-id default     # one user
+    python rebuild_contributions.py --user-id default --year 2024
+"""
+
+import argparse
+import logging
+from collections import Counter, defaultdict
+
+from client import HabitsClient, get_settings
+
+logger = logging.getLogger(__name__)
+
+
+def rebuild_user(
+    db: HabitsClient, user_id: str, year: int | None = None
+) -> dict[int, int]:
+    """Rebuild a user's contribution counters in a single pass over their logs.
+
+    Args:
+        db: Habits DynamoDB client
+        user_id: User whose aggregates are rebuilt
+        year: Restrict the rebuild to a single year
+
+    Returns:
+        Total completions per rebuilt year
+    """
+    start_date = f"{year}-01-01" if year else None
+    end_date = f"{year}-12-31" if year else None
+
+    counts_by_year: dict[int, Counter[str]] = defaultdict(Counter)
+    if year:
+        counts_by_year[year] = Counter()
+    for log in db.iter_habit_logs_by_user(user_id, start_date, end_date):
+        if log.get("completed", False):
+            counts_by_year[int(log["date"][:4])][log["date"]] += 1
+
+    for log_year, date_counts in counts_by_year.items():
+        db.put_contribution_counts(user_id, log_year, date_counts)
+    return {
+        log_year: sum(date_counts.values())
+        for log_year, date_counts in counts_by_year.items()
+    }
+
+
+def main() -> None:
+    """Rebuild contribution counters for the requested users."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--user-id",
+        action="append",
+        dest="user_ids",
+        help="User to rebuild (repeatable); defaults to every user with habits",
+    )
+    parser.add_argument("--year", type=int, help="Only rebuild this year")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    settings = get_settings()
+    db = HabitsClient(settings.habits_table_name, settings.habit_logs_table_name)
+
+    for user_id in args.user_ids or db.iter_user_ids():
+        totals = rebuild_user(db, user_id, args.year)
+        logger.info(f"Rebuilt {user_id}: {dict(sorted(totals.items()))}")
+
+
+if __name__ == "__main__":
+    main()
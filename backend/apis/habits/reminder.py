@@ -0,0 +1,212 @@
+"""Reminder evaluation and dispatch for Habits API."""
+
+import asyncio
+import logging
+from collections.abc import Iterable, Mapping
+from datetime import UTC, date, datetime, timedelta
+from typing import Any
+
+from client import HabitsClient, run_sync
+from models import ReminderResponse, UserReminderResult
+from slack_notifier import (
+    ReminderDigest,
+    deliver_slack_notification,
+    format_reminder_message,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def select_due_habits(habits: Iterable[dict[str, Any]], day: date) -> list[dict]:
+    """Filter active habits that are due on a day according to their frequency."""
+    weekday = day.weekday()  # 0=Monday, 6=Sunday
+    due_habits = []
+    for habit in habits:
+        if not habit.get("is_active", True):
+            continue
+        frequency = habit.get("frequency", "daily")
+        if frequency == "daily":
+            due_habits.append(habit)
+        elif frequency == "weekdays" and weekday < 5:
+            due_habits.append(habit)
+        elif frequency == "weekly" and weekday == 0:  # Monday
+            due_habits.append(habit)
+    return due_habits
+
+
+def current_reminder_slot(
+    now: datetime, slot_minutes: int, utc_offset_minutes: int
+) -> tuple[date, int]:
+    """Get the local day and the reminder slot (minute of day) containing now."""
+    local = now.astimezone(UTC) + timedelta(minutes=utc_offset_minutes)
+    minute_of_day = local.hour * 60 + local.minute
+    return local.date(), minute_of_day - minute_of_day % slot_minutes
+
+
+def evaluate_reminder(
+    db: HabitsClient,
+    user_id: str,
+    day: date,
+    habits: list[dict[str, Any]] | None = None,
+    logs: Iterable[dict[str, Any]] | None = None,
+) -> tuple[ReminderResponse, dict[str, Any] | None]:
+    """Work out which of a user's habits still need a reminder.
+
+    Args:
+        db: Habits DynamoDB client
+        user_id: User to evaluate
+        day: Day whose logs are checked
+        habits: Habits to consider, e.g. those due in a reminder slot;
+            defaults to all of the user's habits
+        logs: The user's logs for the day if already read
+
+    Returns:
+        The reminder response and the reminder to send (keyword arguments of
+        format_reminder_message), or None when there is nothing to remind about
+    """
+    if habits is None:
+        habits = db.query_habits(user_id)
+    if not any(h.get("is_active", True) for h in habits):
+        return ReminderResponse(
+            success=True,
+            message="No active habits found",
+            incomplete_count=0,
+            total_count=0,
+        ), None
+
+    if logs is None:
+        logs = db.iter_habit_logs_by_user(user_id, day.isoformat(), day.isoformat())
+    completed_habit_ids = {
+        log["habit_id"] for log in logs if log.get("completed", False)
+    }
+
+    due_habits = select_due_habits(habits, day)
+    if not due_habits:
+        return ReminderResponse(
+            success=True,
+            message="No habits due today",
+            incomplete_count=0,
+            total_count=0,
+        ), None
+
+    # Find incomplete habits with reminder enabled
+    incomplete_habits = [
+        h
+        for h in due_habits
+        if h["habit_id"] not in completed_habit_ids and h.get("reminder_enabled", False)
+    ]
+    completed_count = len(
+        [h for h in due_habits if h["habit_id"] in completed_habit_ids]
+    )
+    total_count = len(due_habits)
+
+    if not incomplete_habits:
+        return ReminderResponse(
+            success=True,
+            message="All habits with reminders are completed",
+            incomplete_count=0,
+            total_count=total_count,
+        ), None
+
+    notice = {
+        "incomplete_habits": incomplete_habits,
+        "total_habits": total_count,
+        "completed_count": completed_count,
+    }
+    return ReminderResponse(
+        success=True,
+        message=f"Reminder sent for {len(incomplete_habits)} incomplete habits",
+        incomplete_count=len(incomplete_habits),
+        total_count=total_count,
+    ), notice
+
+
+def _failure(
+    user_id: str, message: str, result: ReminderResponse | None = None
+) -> UserReminderResult:
+    """Build a failed per-user outcome, keeping any evaluated counts."""
+    return UserReminderResult(
+        user_id=user_id,
+        status_code=500,
+        success=False,
+        message=message,
+        incomplete_count=result.incomplete_count if result else 0,
+        total_count=result.total_count if result else 0,
+    )
+
+
+async def run_reminders(
+    db: HabitsClient,
+    user_ids: Iterable[str],
+    webhook_url: str,
+    day: date,
+    max_concurrency: int,
+    habits_by_user: Mapping[str, list[dict[str, Any]]] | None = None,
+    digest: ReminderDigest | None = None,
+) -> list[UserReminderResult]:
+    """Run reminders for many users with bounded parallelism.
+
+    Errors are reported per user instead of being raised so that one
+    failing user does not abort the run.
+
+    Args:
+        db: Habits DynamoDB client
+        user_ids: Users to remind
+        webhook_url: Slack webhook URL
+        day: Day whose logs are checked
+        max_concurrency: Maximum number of users evaluated at once
+        habits_by_user: Habits to consider per user; users without an entry
+            are evaluated against all of their habits
+        digest: Buffer reminders into per-webhook digests instead of
+            sending one message per user
+
+    Returns:
+        Per-user outcomes in the order of user_ids
+    """
+    user_ids = list(user_ids)
+    semaphore = asyncio.Semaphore(max_concurrency)
+    pending = len(user_ids)
+
+    async def run_one(user_id: str) -> UserReminderResult:
+        nonlocal pending
+        habits = habits_by_user.get(user_id) if habits_by_user else None
+        result = notice = delivered = None
+        try:
+            async with semaphore:
+                result, notice = await run_sync(
+                    evaluate_reminder, db, user_id, day, habits
+                )
+            if notice is not None and digest is not None:
+                delivered = digest.add(webhook_url, {"user_id": user_id, **notice})
+        except Exception as e:
+            logger.error(f"Reminder failed for {user_id}: {e}", exc_info=True)
+            return _failure(user_id, str(e))
+        finally:
+            pending -= 1
+            if pending == 0 and digest is not None:
+                # Every reminder is buffered; flush without waiting for the window
+                await digest.close()
+
+        if notice is None:
+            return UserReminderResult(
+                user_id=user_id, status_code=200, **result.model_dump()
+            )
+
+        # Slack delivery runs outside the semaphore
+        try:
+            if delivered is not None:
+                sent = await delivered
+            else:
+                sent = await deliver_slack_notification(
+                    webhook_url, format_reminder_message(**notice)
+                )
+        except Exception as e:
+            logger.error(f"Reminder failed for {user_id}: {e}", exc_info=True)
+            return _failure(user_id, str(e), result)
+        if not sent:
+            return _failure(user_id, "Failed to send Slack notification", result)
+        return UserReminderResult(
+            user_id=user_id, status_code=200, **result.model_dump()
+        )
+
+    return list(await asyncio.gather(*(run_one(user_id) for user_id in user_ids)))
@@ -1,15 +1,223 @@
 """Slack notification module for habit reminders."""
 
+import asyncio
+import http.client
 import json
 import logging
-import urllib.request
+import random
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+from urllib.parse import urlsplit
+
+from client import get_settings
 
 logger = logging.getLogger(__name__)
 
+# Network errors raised when a kept-alive connection was closed by the server
+_STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, ConnectionError)
+
+
+class SlackDeliveryPool:
+    """Async Slack webhook sender with keep-alive connections.
+
+    Requests run on a dedicated thread pool whose size bounds concurrency,
+    so awaiting a delivery never blocks the event loop. Idle connections are
+    kept per host and reused across messages and invocations of a warm
+    container. 429 responses honour Retry-After; 5xx responses and network
+    errors are retried with jittered exponential backoff. Posts to the same
+    webhook are spaced at least min_interval_seconds apart.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 8,
+        max_attempts: int = 4,
+        min_interval_seconds: float = 1.0,
+        timeout_seconds: float = 10.0,
+        backoff_base_seconds: float = 0.5,
+        backoff_max_seconds: float = 8.0,
+        max_retry_after_seconds: float = 30.0,
+    ) -> None:
+        """Initialize pool limits and retry policy."""
+        self._max_connections = max_connections
+        self._max_attempts = max_attempts
+        self._min_interval_seconds = min_interval_seconds
+        self._timeout_seconds = timeout_seconds
+        self._backoff_base_seconds = backoff_base_seconds
+        self._backoff_max_seconds = backoff_max_seconds
+        self._max_retry_after_seconds = max_retry_after_seconds
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_connections, thread_name_prefix="slack"
+        )
+        self._lock = threading.Lock()
+        self._idle: dict[tuple[str, str], deque[http.client.HTTPConnection]] = (
+            defaultdict(deque)
+        )
+        self._next_send_at: dict[str, float] = {}
+
+    async def send(self, webhook_url: str, payload: dict) -> bool:
+        """Post a JSON payload to a webhook, retrying transient failures.
+
+        Returns:
+            True if Slack accepted the payload, False otherwise
+        """
+        body = json.dumps(payload).encode("utf-8")
+        loop = asyncio.get_running_loop()
+        for attempt in range(1, self._max_attempts + 1):
+            await asyncio.sleep(self._reserve_send_slot(webhook_url))
+            try:
+                status, retry_after = await loop.run_in_executor(
+                    self._executor, self._post, webhook_url, body
+                )
+            except (OSError, http.client.HTTPException) as e:
+                logger.warning(f"Slack request failed (attempt {attempt}): {e}")
+                status, retry_after = None, None
+
+            if status == 200:
+                return True
+            if status == 429 and retry_after is not None:
+                if retry_after > self._max_retry_after_seconds:
+                    logger.error(f"Slack rate limited for {retry_after}s, giving up")
+                    return False
+                # Hold back every sender to this webhook, not just this one
+                self._defer_webhook(webhook_url, retry_after)
+                continue
+            if status is not None and status != 429 and status < 500:
+                logger.error(f"Slack notification failed: {status}")
+                return False
+            if attempt < self._max_attempts:
+                await asyncio.sleep(self._backoff(attempt))
+
+        logger.error(f"Slack notification failed after {self._max_attempts} attempts")
+        return False
+
+    def close(self) -> None:
+        """Close idle connections and stop the worker threads."""
+        with self._lock:
+            connections = [c for idle in self._idle.values() for c in idle]
+            self._idle.clear()
+        for connection in connections:
+            connection.close()
+        self._executor.shutdown(wait=False)
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff before the next attempt."""
+        ceiling = min(
+            self._backoff_base_seconds * 2 ** (attempt - 1), self._backoff_max_seconds
+        )
+        return random.uniform(0, ceiling)
+
+    def _reserve_send_slot(self, webhook_url: str) -> float:
+        """Reserve the next send time for a webhook and return the wait."""
+        with self._lock:
+            now = time.monotonic()
+            send_at = max(now, self._next_send_at.get(webhook_url, now))
+            self._next_send_at[webhook_url] = send_at + self._min_interval_seconds
+        return send_at - now
+
+    def _defer_webhook(self, webhook_url: str, seconds: float) -> None:
+        """Push the webhook's next send time at least seconds into the future."""
+        with self._lock:
+            resume_at = time.monotonic() + seconds
+            self._next_send_at[webhook_url] = max(
+                self._next_send_at.get(webhook_url, resume_at), resume_at
+            )
+
+    def _post(self, webhook_url: str, body: bytes) -> tuple[int, float | None]:
+        """POST on a pooled connection (runs on a worker thread).
+
+        Returns:
+            HTTP status and the Retry-After delay in seconds, if any
+        """
+        url = urlsplit(webhook_url)
+        key = (url.scheme, url.netloc)
+        path = url.path + (f"?{url.query}" if url.query else "")
+        headers = {"Content-Type": "application/json", "Connection": "keep-alive"}
 
-def send_slack_notification(webhook_url: str, message: str) -> bool:
-    """Send a notification to Slack via webhook.
+        connection, reused = self._checkout(key)
+        try:
+            try:
+                connection.request("POST", path, body=body, headers=headers)
+                response = connection.getresponse()
+            except _STALE_CONNECTION_ERRORS:
+                if not reused:
+                    raise
+                # The server dropped an idle connection; retry once on a new one
+                connection.close()
+                connection, reused = self._connect(key), False
+                connection.request("POST", path, body=body, headers=headers)
+                response = connection.getresponse()
+            response.read()
+        except BaseException:
+            connection.close()
+            raise
+
+        if response.will_close:
+            connection.close()
+        else:
+            self._checkin(key, connection)
+
+        retry_after = response.getheader("Retry-After")
+        try:
+            retry_after_seconds = float(retry_after) if retry_after else None
+        except ValueError:
+            retry_after_seconds = None
+        return response.status, retry_after_seconds
+
+    def _checkout(
+        self, key: tuple[str, str]
+    ) -> tuple[http.client.HTTPConnection, bool]:
+        """Take an idle connection for a host, or open a new one."""
+        with self._lock:
+            idle = self._idle[key]
+            if idle:
+                return idle.pop(), True
+        return self._connect(key), False
+
+    def _checkin(
+        self, key: tuple[str, str], connection: http.client.HTTPConnection
+    ) -> None:
+        """Return a connection to the idle pool, closing it if the pool is full."""
+        with self._lock:
+            idle = self._idle[key]
+            if len(idle) < self._max_connections:
+                idle.append(connection)
+                return
+        connection.close()
+
+    def _connect(self, key: tuple[str, str]) -> http.client.HTTPConnection:
+        """Open a new connection for a (scheme, netloc) pair."""
+        scheme, netloc = key
+        if scheme == "https":
+            return http.client.HTTPSConnection(netloc, timeout=self._timeout_seconds)
+        return http.client.HTTPConnection(netloc, timeout=self._timeout_seconds)
+
+
+@lru_cache
+def get_delivery_pool() -> SlackDeliveryPool:
+    """Get the container-wide Slack delivery pool."""
+    settings = get_settings()
+    return SlackDeliveryPool(
+        max_connections=settings.slack_max_connections,
+        max_attempts=settings.slack_max_attempts,
+        min_interval_seconds=settings.slack_min_interval_seconds,
+    )
+
+
+async def deliver_slack_payload(webhook_url: str, payload: dict) -> bool:
+    """Send a raw payload (e.g. Block Kit) to Slack without blocking the loop."""
+    if not webhook_url:
+        logger.warning("Slack webhook URL is not configured")
+        return False
+    return await get_delivery_pool().send(webhook_url, payload)
+
+
+async def deliver_slack_notification(webhook_url: str, message: str) -> bool:
+    """Send a notification to Slack via webhook without blocking the event loop.
 
     Args:
         webhook_url: Slack webhook URL
@@ -22,27 +230,10 @@ def send_slack_notification(webhook_url: str, message: str) -> bool:
         logger.warning("Slack webhook URL is not configured")
         return False
 
-    payload = {"text": message}
-    data = json.dumps(payload).encode("utf-8")
-
-    req = urllib.request.Request(
-        webhook_url,
-        data=data,
-        headers={"Content-Type": "application/json"},
-        method="POST",
-    )
-
-    try:
-        with urllib.request.urlopen(req, timeout=10) as response:
-            if response.status == 200:
-                logger.info("Slack notification sent successfully")
-                return True
-            else:
-                logger.error(f"Slack notification failed: {response.status}")
-                return False
-    except Exception as e:
-        logger.error(f"Failed to send Slack notification: {e}")
-        return False
+    success = await get_delivery_pool().send(webhook_url, {"text": message})
+    if success:
+        logger.info("Slack notification sent successfully")
+    return success
 
 
 def format_reminder_message(
@@ -87,3 +278,149 @@ def format_reminder_message(
     )
 
     return "\n".join(message_lines)
+
+
+# Slack rejects messages with more than 50 blocks or section text over 3000
+# characters; payloads are also kept well below the overall request limit.
+SLACK_MAX_BLOCKS = 50
+SLACK_MAX_SECTION_TEXT = 3000
+SLACK_MAX_PAYLOAD_BYTES = 30_000
+
+
+def _digest_section(entry: dict) -> dict:
+    """Format one user's reminder as a Block Kit section."""
+    lines = [
+        f"*{entry['user_id']}*  今日の進捗: "
+        f"{entry['completed_count']}/{entry['total_habits']} 完了",
+    ]
+    for habit in entry["incomplete_habits"]:
+        name = habit.get("name", "不明")
+        reminder_time = habit.get("reminder_time")
+        lines.append(
+            f"• {name} (予定: {reminder_time})" if reminder_time else f"• {name}"
+        )
+
+    text = "\n".join(lines)
+    if len(text) > SLACK_MAX_SECTION_TEXT:
+        text = text[: SLACK_MAX_SECTION_TEXT - 1] + "…"
+    return {"type": "section", "text": {"type": "mrkdwn", "text": text}}
+
+
+def _digest_payload(sections: list[dict], part: int, parts: int) -> dict:
+    """Wrap sections in a digest message with header and fallback text."""
+    date_str = datetime.now().strftime("%Y年%m月%d日")
+    title = f":bell: 習慣リマインダー ({date_str})"
+    if parts > 1:
+        title += f" {part}/{parts}"
+    return {
+        "text": f"習慣リマインダー: {len(sections)}人に未完了の習慣があります",
+        "blocks": [
+            {"type": "section", "text": {"type": "mrkdwn", "text": f"*{title}*"}},
+            {"type": "divider"},
+            *sections,
+        ],
+    }
+
+
+def format_reminder_digest(entries: list[dict]) -> list[tuple[dict, list[int]]]:
+    """Format buffered reminders as Block Kit payloads within Slack's limits.
+
+    Args:
+        entries: Reminders with 'user_id', 'incomplete_habits', 'total_habits'
+            and 'completed_count'
+
+    Returns:
+        Payloads paired with the indices of the entries each one carries
+    """
+    # Header and divider take two blocks; leave room for the part suffix
+    max_sections = SLACK_MAX_BLOCKS - 2
+    budget = SLACK_MAX_PAYLOAD_BYTES - len(
+        json.dumps(_digest_payload([], 99, 99)).encode()
+    )
+
+    chunks: list[list[tuple[int, dict]]] = [[]]
+    size = 0
+    for index, entry in enumerate(entries):
+        section = _digest_section(entry)
+        section_size = len(json.dumps(section).encode()) + 2
+        if chunks[-1] and (
+            len(chunks[-1]) >= max_sections or size + section_size > budget
+        ):
+            chunks.append([])
+            size = 0
+        chunks[-1].append((index, section))
+        size += section_size
+
+    chunks = [chunk for chunk in chunks if chunk]
+    return [
+        (
+            _digest_payload([section for _, section in chunk], part, len(chunks)),
+            [index for index, _ in chunk],
+        )
+        for part, chunk in enumerate(chunks, start=1)
+    ]
+
+
+class ReminderDigest:
+    """Buffer reminders per webhook and post them as combined digests.
+
+    The first reminder for a webhook opens a window of window_seconds; when
+    it closes, everything buffered for that webhook is sent as one Block Kit
+    message (split only to stay under Slack's limits). close() flushes all
+    open windows early, e.g. at the end of a batch run.
+    """
+
+    def __init__(self, window_seconds: float) -> None:
+        """Initialize digest with its buffering window."""
+        self._window_seconds = window_seconds
+        self._buffers: dict[str, list[tuple[dict, asyncio.Future[bool]]]] = {}
+        self._timers: dict[str, asyncio.Task[None]] = {}
+
+    def add(self, webhook_url: str, entry: dict) -> asyncio.Future[bool]:
+        """Buffer a reminder for a webhook.
+
+        Returns:
+            A future resolved with whether the digest carrying it was sent
+        """
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[bool] = loop.create_future()
+        self._buffers.setdefault(webhook_url, []).append((entry, future))
+        if webhook_url not in self._timers:
+            self._timers[webhook_url] = loop.create_task(
+                self._flush_after_window(webhook_url)
+            )
+        return future
+
+    async def flush(self, webhook_url: str) -> None:
+        """Send everything buffered for a webhook now."""
+        timer = self._timers.pop(webhook_url, None)
+        if timer is not None and timer is not asyncio.current_task():
+            timer.cancel()
+        buffered = self._buffers.pop(webhook_url, [])
+        if not buffered:
+            return
+
+        payloads = format_reminder_digest([entry for entry, _ in buffered])
+        try:
+            results = await asyncio.gather(
+                *(deliver_slack_payload(webhook_url, p) for p, _ in payloads)
+            )
+        except Exception as e:
+            logger.error(f"Failed to send reminder digest: {e}")
+            results = [False] * len(payloads)
+
+        for (_, indices), success in zip(payloads, results, strict=True):
+            for index in indices:
+                buffered[index][1].set_result(success)
+        logger.info(
+            f"Sent reminder digest of {len(buffered)} users in {len(payloads)} messages"
+        )
+
+    async def close(self) -> None:
+        """Flush every open window."""
+        for webhook_url in list(self._buffers):
+            await self.flush(webhook_url)
+
+    async def _flush_after_window(self, webhook_url: str) -> None:
+        await asyncio.sleep(self._window_seconds)
+        await self.flush(webhook_url)
@@ -15,6 +15,19 @@ resource "aws_dynamodb_table" "habits" {
     type = "S"
   }
 
+  attribute {
+    name = "reminder_slot"
+    type = "N"
+  }
+
+  # Sparse: only habits with an enabled reminder carry reminder_slot
+  global_secondary_index {
+    name            = "reminder_slot-index"
+    hash_key        = "reminder_slot"
+    range_key       = "user_id"
+    projection_type = "ALL"
+  }
+
   tags = {
     Name        = var.habits_table_name
     Environment = var.environment
@@ -56,3 +69,26 @@ resource "aws_dynamodb_table" "habit_logs" {
     Environment = var.environment
   }
 }
+
+# DynamoDB Table for precomputed daily contribution counters (one item per user-year)
+resource "aws_dynamodb_table" "habit_contributions" {
+  name         = var.habit_contributions_table_name
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "user_id"
+  range_key    = "year"
+
+  attribute {
+    name = "user_id"
+    type = "S"
+  }
+
+  attribute {
+    name = "year"
+    type = "N"
+  }
+
+  tags = {
+    Name        = var.habit_contributions_table_name
+    Environment = var.environment
+  }
+}
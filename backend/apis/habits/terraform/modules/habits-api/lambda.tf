@@ -10,10 +10,12 @@ resource "aws_lambda_function" "habits" {
 
   environment {
     variables = {
-      HABITS_TABLE_NAME     = var.habits_table_name
-      HABIT_LOGS_TABLE_NAME = var.habit_logs_table_name
-      AWS_REGION            = var.aws_region
-      DEBUG                 = var.environment == "dev" ? "true" : "false"
+      HABITS_TABLE_NAME              = var.habits_table_name
+      HABIT_LOGS_TABLE_NAME          = var.habit_logs_table_name
+      HABIT_CONTRIBUTIONS_TABLE_NAME = var.habit_contributions_table_name
+      VERSIONS_TABLE_NAME            = var.versions_table_name
+      AWS_REGION                     = var.aws_region
+      DEBUG                          = var.environment == "dev" ? "true" : "false"
     }
   }
 
@@ -63,13 +65,23 @@ resource "aws_iam_policy" "lambda" {
           "dynamodb:DeleteItem",
           "dynamodb:Query",
           "dynamodb:Scan",
+          "dynamodb:BatchGetItem",
           "dynamodb:BatchWriteItem"
         ]
         Resource = [
           "arn:aws:dynamodb:${var.aws_region}:${data.aws_caller_identity.current.account_id}:table/${var.habits_table_name}",
+          "arn:aws:dynamodb:${var.aws_region}:${data.aws_caller_identity.current.account_id}:table/${var.habits_table_name}/index/*",
           "arn:aws:dynamodb:${var.aws_region}:${data.aws_caller_identity.current.account_id}:table/${var.habit_logs_table_name}",
-          "arn:aws:dynamodb:${var.aws_region}:${data.aws_caller_identity.current.account_id}:table/${var.habit_logs_table_name}/index/*"
+          "arn:aws:dynamodb:${var.aws_region}:${data.aws_caller_identity.current.account_id}:table/${var.habit_logs_table_name}/index/*",
+          "arn:aws:dynamodb:${var.aws_region}:${data.aws_caller_identity.current.account_id}:table/${var.habit_contributions_table_name}",
+          "arn:aws:dynamodb:${var.aws_region}:${data.aws_caller_identity.current.account_id}:table/${var.versions_table_name}"
         ]
+      },
+      {
+        # Very large log deletions are handed to an async invocation of this function
+        Effect   = "Allow"
+        Action   = "lambda:InvokeFunction"
+        Resource = "arn:aws:lambda:${var.aws_region}:${data.aws_caller_identity.current.account_id}:function:${local.function_name}"
       }
     ]
   })
@@ -27,3 +27,8 @@ output "habit_logs_table_name" {
   description = "Name of the habit logs DynamoDB table"
   value       = aws_dynamodb_table.habit_logs.name
 }
+
+output "habit_contributions_table_name" {
+  description = "Name of the habit contributions DynamoDB table"
+  value       = aws_dynamodb_table.habit_contributions.name
+}
@@ -37,3 +37,13 @@ variable "habit_logs_table_name" {
   description = "DynamoDB habit logs table name"
   type        = string
 }
+
+variable "habit_contributions_table_name" {
+  description = "DynamoDB habit contributions aggregate table name"
+  type        = string
+}
+
+variable "versions_table_name" {
+  description = "DynamoDB per-user change counter table name, shared by every API"
+  type        = string
+}
@@ -45,3 +45,15 @@ variable "habit_logs_table_name" {
   type        = string
   default     = "personal-growth-tracker-habit-logs"
 }
+
+variable "habit_contributions_table_name" {
+  description = "DynamoDB habit contributions aggregate table name"
+  type        = string
+  default     = "personal-growth-tracker-habit-contributions"
+}
+
+variable "versions_table_name" {
+  description = "DynamoDB per-user change counter table name, shared by every API"
+  type        = string
+  default     = "personal-growth-tracker-versions"
+}
@@ -9,6 +9,9 @@ from fastapi.testclient import TestClient
 @pytest.fixture
 def mock_dynamodb():
     """Mock DynamoDB client."""
+    from api_handler import ownership_cache
+
+    ownership_cache.clear()
     with patch("api_handler.db") as mock:
         yield mock
 
@@ -55,6 +58,139 @@ class TestListHabits:
         assert response.status_code == 200
         assert response.json() == []
 
+    def test_list_habits_by_ids(self, client, mock_dynamodb):
+        """Test that ids are fetched in one batch and returned in order."""
+        mock_dynamodb.batch_get_habits.return_value = [
+            {"user_id": "user-1", "habit_id": habit_id, "name": "Exercise"}
+            for habit_id in ("habit-2", "habit-1")
+        ]
+
+        response = client.get(
+            "/api/v1/habits?user_id=user-1&ids=habit-1,habit-2,missing,habit-1"
+        )
+
+        assert response.status_code == 200
+        assert [h["habit_id"] for h in response.json()] == ["habit-1", "habit-2"]
+        mock_dynamodb.batch_get_habits.assert_called_once_with(
+            "user-1", ["habit-1", "habit-2", "missing"], projection=None
+        )
+        mock_dynamodb.query_habits.assert_not_called()
+
+    def test_list_habits_by_ids_invalid(self, client, mock_dynamodb):
+        """Test that an empty id list is rejected."""
+        response = client.get("/api/v1/habits?user_id=user-1&ids=,")
+
+        assert response.status_code == 422
+
+    def test_list_habits_page(self, client, mock_dynamodb):
+        """Test that limit returns one page and a cursor for the next."""
+        last_key = {"user_id": "user-1", "habit_id": "habit-1"}
+        mock_dynamodb.query_habits_page.return_value = (
+            [{"user_id": "user-1", "habit_id": "habit-1", "name": "Exercise"}],
+            last_key,
+        )
+
+        response = client.get("/api/v1/habits?user_id=user-1&limit=1")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [h["habit_id"] for h in data["items"]] == ["habit-1"]
+        mock_dynamodb.query_habits_page.assert_called_once_with("user-1", 1, None, None)
+
+        mock_dynamodb.query_habits_page.return_value = ([], None)
+        response = client.get(
+            f"/api/v1/habits?user_id=user-1&cursor={data['next_cursor']}"
+        )
+
+        assert response.json() == {"items": [], "next_cursor": None}
+        mock_dynamodb.query_habits_page.assert_called_with("user-1", 50, last_key, None)
+        mock_dynamodb.query_habits.assert_not_called()
+
+    def test_list_habits_page_invalid(self, client, mock_dynamodb):
+        """Test that another user's cursor and ids with paging are rejected."""
+        from client import encode_cursor
+
+        cursor = encode_cursor({"user_id": "user-2", "habit_id": "habit-1"})
+
+        for params in (f"cursor={cursor}", "ids=habit-1&limit=10"):
+            response = client.get(f"/api/v1/habits?user_id=user-1&{params}")
+            assert response.status_code == 422
+        mock_dynamodb.query_habits_page.assert_not_called()
+
+    def test_list_habits_fields(self, client, mock_dynamodb):
+        """Test that fields becomes a projection and trims the response."""
+        mock_dynamodb.query_habits.return_value = [
+            {"user_id": "user-1", "habit_id": "habit-1", "name": "Exercise"}
+        ]
+
+        response = client.get("/api/v1/habits?user_id=user-1&fields=name")
+
+        assert response.status_code == 200
+        assert response.json() == [
+            {"user_id": "user-1", "habit_id": "habit-1", "name": "Exercise"}
+        ]
+        [_, projection] = mock_dynamodb.query_habits.call_args.args
+        assert sorted(projection) == sorted(["user_id", "habit_id", "name"])
+
+    def test_list_habits_unknown_fields(self, client, mock_dynamodb):
+        """Test that fields outside the response model are rejected."""
+        response = client.get("/api/v1/habits?user_id=user-1&fields=name,secret")
+
+        assert response.status_code == 422
+        assert response.json()["detail"] == "Unknown fields: secret"
+        mock_dynamodb.query_habits.assert_not_called()
+
+    def test_list_habits_not_modified(self, client, mock_dynamodb):
+        """Test that a matching If-None-Match is answered from the counter."""
+        mock_dynamodb.get_version.return_value = 3
+        mock_dynamodb.query_habits.return_value = [
+            {
+                "user_id": "user-1",
+                "habit_id": "habit-1",
+                "name": "Exercise",
+                "updated_at": "2024-01-01",
+            }
+        ]
+
+        response = client.get("/api/v1/habits?user_id=user-1")
+        etag = response.headers["ETag"]
+
+        assert etag.startswith('W/"')
+        assert response.headers["Cache-Control"] == "private, no-cache"
+
+        mock_dynamodb.query_habits.reset_mock()
+        response = client.get(
+            "/api/v1/habits?user_id=user-1", headers={"If-None-Match": etag}
+        )
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["ETag"] == etag
+        mock_dynamodb.query_habits.assert_not_called()
+        mock_dynamodb.get_version.assert_called_with("user-1")
+
+    def test_list_habits_modified(self, client, mock_dynamodb):
+        """Test that a stale If-None-Match gets the full list and a new ETag."""
+        mock_dynamodb.get_version.return_value = 3
+        mock_dynamodb.query_habits.return_value = [
+            {
+                "user_id": "user-1",
+                "habit_id": "habit-1",
+                "name": "Exercise",
+                "updated_at": "2024-01-01",
+            }
+        ]
+        etag = client.get("/api/v1/habits?user_id=user-1").headers["ETag"]
+
+        mock_dynamodb.get_version.return_value = 4
+        response = client.get(
+            "/api/v1/habits?user_id=user-1", headers={"If-None-Match": etag}
+        )
+
+        assert response.status_code == 200
+        assert response.json()[0]["habit_id"] == "habit-1"
+        assert response.headers["ETag"] != etag
+
 
 class TestGetHabit:
     """Tests for get habit endpoint."""
@@ -85,6 +221,24 @@ class TestGetHabit:
 
         assert response.status_code == 404
 
+    def test_get_habit_not_modified(self, client, mock_dynamodb):
+        """Test that a matching If-None-Match gets an empty 304."""
+        mock_dynamodb.get_habit.return_value = {
+            "user_id": "user-1",
+            "habit_id": "habit-1",
+            "name": "Exercise",
+            "updated_at": "2024-01-01",
+        }
+        etag = client.get("/api/v1/habits/habit-1?user_id=user-1").headers["ETag"]
+
+        response = client.get(
+            "/api/v1/habits/habit-1?user_id=user-1",
+            headers={"If-None-Match": f'W/"x", {etag}'},
+        )
+
+        assert response.status_code == 304
+        assert response.content == b""
+
 
 class TestCreateHabit:
     """Tests for create habit endpoint."""
@@ -121,7 +275,7 @@ class TestUpdateHabit:
 
     def test_update_habit_success(self, client, mock_dynamodb):
         """Test successful habit update."""
-        mock_dynamodb.get_habit.return_value = {
+        existing = {
             "user_id": "user-1",
             "habit_id": "habit-1",
             "name": "Exercise",
@@ -131,6 +285,10 @@ class TestUpdateHabit:
             "created_at": "2024-01-01T00:00:00Z",
             "updated_at": "2024-01-01T00:00:00Z",
         }
+        mock_dynamodb.update_habit.side_effect = lambda user_id, habit_id, updates: {
+            **existing,
+            **updates,
+        }
 
         response = client.put(
             "/api/v1/habits/habit-1?user_id=user-1",
@@ -142,7 +300,7 @@ class TestUpdateHabit:
 
     def test_update_habit_not_found(self, client, mock_dynamodb):
         """Test update non-existent habit."""
-        mock_dynamodb.get_habit.return_value = None
+        mock_dynamodb.update_habit.return_value = None
 
         response = client.put(
             "/api/v1/habits/nonexistent?user_id=user-1",
@@ -156,18 +314,17 @@ class TestDeleteHabit:
     """Tests for delete habit endpoint."""
 
     def test_delete_habit_success(self, client, mock_dynamodb):
-        """Test successful habit deletion."""
-        mock_dynamodb.get_habit.return_value = {
-            "user_id": "user-1",
-            "habit_id": "habit-1",
-            "name": "Exercise",
-        }
+        """Test that the logs are deleted before the habit."""
+        mock_dynamodb.batch_delete_habit_logs.return_value = 3
 
         response = client.delete("/api/v1/habits/habit-1?user_id=user-1")
 
         assert response.status_code == 204
-        mock_dynamodb.batch_delete_habit_logs.assert_called_once()
-        mock_dynamodb.delete_habit.assert_called_once()
+        assert [name for name, _, _ in mock_dynamodb.method_calls] == [
+            "get_habit",
+            "batch_delete_habit_logs",
+            "delete_habit",
+        ]
 
     def test_delete_habit_not_found(self, client, mock_dynamodb):
         """Test delete non-existent habit."""
@@ -176,6 +333,85 @@ class TestDeleteHabit:
         response = client.delete("/api/v1/habits/nonexistent?user_id=user-1")
 
         assert response.status_code == 404
+        mock_dynamodb.batch_delete_habit_logs.assert_not_called()
+        mock_dynamodb.delete_habit.assert_not_called()
+
+    def test_delete_habit_keeps_habit_when_logs_fail(self, client, mock_dynamodb):
+        """Test that a failed log deletion leaves the habit to retry from."""
+        from main import app
+
+        mock_dynamodb.batch_delete_habit_logs.side_effect = RuntimeError("throttled")
+
+        response = TestClient(app, raise_server_exceptions=False).delete(
+            "/api/v1/habits/habit-1?user_id=user-1"
+        )
+
+        assert response.status_code == 500
+        mock_dynamodb.delete_habit.assert_not_called()
+
+    def test_delete_large_habit_accepted(self, client, mock_dynamodb, monkeypatch):
+        """Test that logs beyond the sync limit are deleted in the background."""
+        from api_handler import settings
+
+        monkeypatch.delenv("AWS_LAMBDA_FUNCTION_NAME", raising=False)
+        mock_dynamodb.batch_delete_habit_logs.return_value = (
+            settings.habit_logs_sync_delete_limit
+        )
+        mock_dynamodb.has_habit_logs.return_value = True
+
+        response = client.delete("/api/v1/habits/habit-1?user_id=user-1")
+
+        assert response.status_code == 202
+        assert response.json() == {"deleted": settings.habit_logs_sync_delete_limit}
+        mock_dynamodb.batch_delete_habit_logs.assert_called_once_with(
+            "habit-1", max_items=settings.habit_logs_sync_delete_limit
+        )
+        mock_dynamodb.delete_habit_and_logs.assert_called_once_with("user-1", "habit-1")
+        mock_dynamodb.delete_habit.assert_not_called()
+
+    def test_delete_habit_with_exactly_limit_logs(
+        self, client, mock_dynamodb, monkeypatch
+    ):
+        """Test that a habit with exactly the sync limit of logs is deleted."""
+        from api_handler import settings
+
+        monkeypatch.delenv("AWS_LAMBDA_FUNCTION_NAME", raising=False)
+        mock_dynamodb.batch_delete_habit_logs.return_value = (
+            settings.habit_logs_sync_delete_limit
+        )
+        mock_dynamodb.has_habit_logs.return_value = False
+
+        response = client.delete("/api/v1/habits/habit-1?user_id=user-1")
+
+        assert response.status_code == 204
+        mock_dynamodb.has_habit_logs.assert_called_once_with("habit-1")
+        mock_dynamodb.delete_habit.assert_called_once_with("user-1", "habit-1")
+        mock_dynamodb.delete_habit_and_logs.assert_not_called()
+
+    def test_delete_large_habit_invokes_lambda(
+        self, client, mock_dynamodb, monkeypatch
+    ):
+        """Test that on Lambda the remaining logs go to an async invocation."""
+        from api_handler import settings
+
+        monkeypatch.setenv("AWS_LAMBDA_FUNCTION_NAME", "habits-api")
+        mock_dynamodb.batch_delete_habit_logs.return_value = (
+            settings.habit_logs_sync_delete_limit
+        )
+        mock_dynamodb.has_habit_logs.return_value = True
+
+        with patch("api_handler.get_client") as mock_get_client:
+            response = client.delete("/api/v1/habits/habit-1?user_id=user-1")
+
+        assert response.status_code == 202
+        mock_dynamodb.batch_delete_habit_logs.assert_called_once()
+        mock_dynamodb.delete_habit.assert_not_called()
+        mock_get_client.assert_called_once_with("lambda", settings.aws_region)
+        mock_get_client.return_value.invoke.assert_called_once_with(
+            FunctionName="habits-api",
+            InvocationType="Event",
+            Payload='{"delete_habit_logs": "habit-1", "user_id": "user-1"}',
+        )
 
 
 class TestHabitLogs:
@@ -203,6 +439,21 @@ class TestHabitLogs:
         data = response.json()
         assert len(data) == 1
 
+    def test_list_logs_not_modified(self, client, mock_dynamodb):
+        """Test that logs carry an ETag of their body and honour it."""
+        mock_dynamodb.get_habit.return_value = {"user_id": "user-1", "habit_id": "h"}
+        mock_dynamodb.query_habit_logs.return_value = [
+            {"habit_id": "h", "date": "2024-01-15", "completed": True}
+        ]
+
+        etag = client.get("/api/v1/habits/h/logs?user_id=user-1").headers["ETag"]
+        response = client.get(
+            "/api/v1/habits/h/logs?user_id=user-1", headers={"If-None-Match": etag}
+        )
+
+        assert response.status_code == 304
+        assert response.headers["Cache-Control"] == "private, no-cache"
+
     def test_list_logs_habit_not_found(self, client, mock_dynamodb):
         """Test listing logs for non-existent habit."""
         mock_dynamodb.get_habit.return_value = None
@@ -231,34 +482,195 @@ class TestHabitLogs:
 
     def test_delete_log_success(self, client, mock_dynamodb):
         """Test successful habit log deletion."""
-        mock_dynamodb.get_habit.return_value = {
-            "user_id": "user-1",
-            "habit_id": "habit-1",
-            "name": "Exercise",
-        }
-        mock_dynamodb.get_habit_log.return_value = {
-            "habit_id": "habit-1",
-            "date": "2024-01-15",
-            "completed": True,
-        }
+        mock_dynamodb.delete_habit_log.return_value = True
 
         response = client.delete(
             "/api/v1/habits/habit-1/logs/2024-01-15?user_id=user-1"
         )
 
         assert response.status_code == 204
+        mock_dynamodb.delete_habit_log.assert_called_once_with(
+            "habit-1", "2024-01-15", "user-1"
+        )
+        mock_dynamodb.get_habit.assert_not_called()
 
     def test_delete_log_not_found(self, client, mock_dynamodb):
         """Test delete non-existent habit log."""
+        mock_dynamodb.delete_habit_log.return_value = False
+
+        response = client.delete(
+            "/api/v1/habits/habit-1/logs/2024-01-15?user_id=user-1"
+        )
+
+        assert response.status_code == 404
+
+    def test_ownership_check_cached(self, client, mock_dynamodb):
+        """Test that repeated log writes verify ownership with a single read."""
         mock_dynamodb.get_habit.return_value = {
             "user_id": "user-1",
             "habit_id": "habit-1",
             "name": "Exercise",
         }
-        mock_dynamodb.get_habit_log.return_value = None
 
-        response = client.delete(
-            "/api/v1/habits/habit-1/logs/2024-01-15?user_id=user-1"
-        )
+        for day in ("2024-01-15", "2024-01-16"):
+            response = client.post(
+                "/api/v1/habits/habit-1/logs?user_id=user-1",
+                json={"date": day, "completed": True},
+            )
+            assert response.status_code == 201
+        response = client.get("/api/v1/habits/habit-1/logs?user_id=user-1")
+
+        assert response.status_code == 200
+        mock_dynamodb.get_habit.assert_called_once_with("user-1", "habit-1")
+        stats = client.get("/health/cache").json()["ownership"]
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+
+    def test_ownership_not_cached_for_missing_habit(self, client, mock_dynamodb):
+        """Test that a 404 is re-checked rather than cached."""
+        mock_dynamodb.get_habit.return_value = None
+
+        client.get("/api/v1/habits/habit-1/logs?user_id=user-1")
+        client.get("/api/v1/habits/habit-1/logs?user_id=user-1")
+
+        assert mock_dynamodb.get_habit.call_count == 2
+
+    def test_ownership_invalidated_by_delete_habit(self, client, mock_dynamodb):
+        """Test that deleting a habit drops its cached ownership."""
+        mock_dynamodb.get_habit.return_value = {
+            "user_id": "user-1",
+            "habit_id": "habit-1",
+            "name": "Exercise",
+        }
+        client.get("/api/v1/habits/habit-1/logs?user_id=user-1")
+        mock_dynamodb.delete_habit.return_value = True
+        mock_dynamodb.batch_delete_habit_logs.return_value = 0
+        client.delete("/api/v1/habits/habit-1?user_id=user-1")
+        mock_dynamodb.get_habit.return_value = None
+
+        response = client.get("/api/v1/habits/habit-1/logs?user_id=user-1")
 
         assert response.status_code == 404
+
+    def test_create_habit_primes_ownership(self, client, mock_dynamodb):
+        """Test that a newly created habit can be logged without a read."""
+        habit_id = client.post(
+            "/api/v1/habits?user_id=user-1", json={"name": "Exercise"}
+        ).json()["habit_id"]
+
+        response = client.post(
+            f"/api/v1/habits/{habit_id}/logs?user_id=user-1",
+            json={"date": "2024-01-15", "completed": True},
+        )
+
+        assert response.status_code == 201
+        mock_dynamodb.get_habit.assert_not_called()
+
+
+class TestBatchHabitLogs:
+    """Tests for the batch habit log endpoint."""
+
+    def test_batch_create_logs(self, client, mock_dynamodb):
+        """Test per-entry results from one ownership query and one batch write."""
+        mock_dynamodb.query_habits.return_value = [
+            {"user_id": "user-1", "habit_id": "habit-1", "name": "Exercise"},
+            {"user_id": "user-1", "habit_id": "habit-2", "name": "Read"},
+        ]
+        mock_dynamodb.batch_put_habit_logs.side_effect = lambda items: [
+            item for item in items if item["habit_id"] == "habit-2"
+        ]
+
+        response = client.post(
+            "/api/v1/habits/logs:batch?user_id=user-1",
+            json={
+                "logs": [
+                    {"habit_id": "habit-1", "date": "2024-01-15"},
+                    {"habit_id": "other", "date": "2024-01-15"},
+                    {"habit_id": "habit-2", "date": "2024-01-15", "completed": False},
+                ]
+            },
+        )
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [r["status_code"] for r in results] == [201, 404, 503]
+        assert results[0]["log"]["completed"] is True
+        assert results[0]["log"]["completed_at"] is not None
+        mock_dynamodb.query_habits.assert_called_once_with("user-1")
+        [items] = mock_dynamodb.batch_put_habit_logs.call_args.args
+        assert [item["habit_id"] for item in items] == ["habit-1", "habit-2"]
+        assert all(item["user_id"] == "user-1" for item in items)
+        mock_dynamodb.get_habit.assert_not_called()
+
+    def test_batch_create_logs_no_owned_habits(self, client, mock_dynamodb):
+        """Test that nothing is written when no entry belongs to the user."""
+        mock_dynamodb.query_habits.return_value = []
+
+        response = client.post(
+            "/api/v1/habits/logs:batch?user_id=user-1",
+            json={"logs": [{"habit_id": "habit-1", "date": "2024-01-15"}]},
+        )
+
+        assert response.json()["results"][0]["status_code"] == 404
+        mock_dynamodb.batch_put_habit_logs.assert_not_called()
+
+    @pytest.mark.parametrize(
+        "logs",
+        [
+            [],
+            [{"habit_id": "habit-1", "date": "2024-01-15"}] * 2,
+            [
+                {
+                    "habit_id": "habit-1",
+                    "date": f"2024-{1 + i // 28:02d}-{1 + i % 28:02d}",
+                }
+                for i in range(101)
+            ],
+        ],
+    )
+    def test_batch_create_logs_invalid(self, client, mock_dynamodb, logs):
+        """Test that empty, duplicate and oversized batches are rejected."""
+        response = client.post(
+            "/api/v1/habits/logs:batch?user_id=user-1", json={"logs": logs}
+        )
+
+        assert response.status_code == 422
+        mock_dynamodb.query_habits.assert_not_called()
+
+
+class TestTodayStatus:
+    """Tests for today status endpoint."""
+
+    def test_today_status_success(self, client, mock_dynamodb):
+        """Test every habit is answered with a single logs query."""
+        mock_dynamodb.query_habits.return_value = [
+            {"user_id": "user-1", "habit_id": "habit-1", "name": "Exercise"},
+            {"user_id": "user-1", "habit_id": "habit-2", "name": "Read"},
+        ]
+        mock_dynamodb.query_habit_logs_by_user.return_value = [
+            {
+                "habit_id": "habit-1",
+                "user_id": "user-1",
+                "date": "2024-01-15",
+                "completed": True,
+                "completed_at": "2024-01-15T10:00:00Z",
+            }
+        ]
+
+        response = client.get("/api/v1/habits/today?user_id=user-1&date=2024-01-15")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["date"] == "2024-01-15"
+        assert data["logs"]["habit-1"]["completed"] is True
+        assert data["logs"]["habit-2"] is None
+        mock_dynamodb.query_habit_logs_by_user.assert_called_once_with(
+            "user-1", "2024-01-15", "2024-01-15"
+        )
+        mock_dynamodb.get_habit.assert_not_called()
+
+    def test_today_status_invalid_date(self, client, mock_dynamodb):
+        """Test invalid date format is rejected."""
+        response = client.get("/api/v1/habits/today?user_id=user-1&date=2024-1-5")
+
+        assert response.status_code == 422
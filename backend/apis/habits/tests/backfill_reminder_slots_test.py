@@ -0,0 +1,28 @@
+"""Tests for the reminder slot backfill command."""
+
+from backfill_reminder_slots import backfill
+
+
+class TestBackfill:
+    """Tests for backfill."""
+
+    def test_backfills_missing_slots(self, habits_client, dynamodb_tables):
+        """Test that habits written before the index get a slot."""
+        habits, _, _ = dynamodb_tables
+        # Written directly so that no slot exists yet
+        habits.put_item(
+            Item={
+                "user_id": "user-1",
+                "habit_id": "habit-1",
+                "reminder_enabled": True,
+                "reminder_time": "07:40",
+            }
+        )
+        habits.put_item(
+            Item={"user_id": "user-1", "habit_id": "habit-2", "reminder_slot": 0}
+        )
+
+        assert backfill(habits_client) == 2
+        assert backfill(habits_client) == 0
+        assert habits_client.get_habit("user-1", "habit-1")["reminder_slot"] == 450
+        assert "reminder_slot" not in habits_client.get_habit("user-1", "habit-2")
@@ -0,0 +1,74 @@
+"""Tests for Habits API in-process cache."""
+
+from cache import TTLCache
+
+
+class FakeTimer:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTTLCache:
+    """Tests for TTLCache."""
+
+    def test_hit_and_miss_counters(self):
+        """Test that lookups are counted."""
+        cache = TTLCache(max_size=2, ttl_seconds=10)
+        cache.set("a", True)
+
+        assert cache.get("a") is True
+        assert cache.get("b") is None
+        assert cache.stats() == {"hits": 1, "misses": 1, "evictions": 0, "size": 1}
+
+    def test_falsy_values_are_hits(self):
+        """Test that a cached False is distinguishable from a miss."""
+        cache = TTLCache(max_size=2, ttl_seconds=10)
+        cache.set("a", False)
+
+        assert cache.get("a") is False
+
+    def test_entries_expire(self):
+        """Test that entries are dropped after the TTL."""
+        timer = FakeTimer()
+        cache = TTLCache(max_size=2, ttl_seconds=10, timer=timer)
+        cache.set("a", True)
+
+        timer.now = 9.9
+        assert cache.get("a") is True
+        timer.now = 10.0
+        assert cache.get("a") is None
+        assert cache.stats()["size"] == 0
+
+    def test_evicts_least_recently_used(self):
+        """Test that the bound evicts the least recently read entry."""
+        cache = TTLCache(max_size=2, ttl_seconds=10)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats()["evictions"] == 1
+
+    def test_invalidate(self):
+        """Test dropping a single entry."""
+        cache = TTLCache(max_size=2, ttl_seconds=10)
+        cache.set("a", True)
+        cache.invalidate("a")
+        cache.invalidate("missing")
+
+        assert cache.get("a") is None
+
+    def test_disabled_with_zero_ttl(self):
+        """Test that a zero TTL disables caching."""
+        cache = TTLCache(max_size=2, ttl_seconds=0)
+        cache.set("a", True)
+
+        assert cache.get("a") is None
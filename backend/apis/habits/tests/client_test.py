@@ -0,0 +1,639 @@
+"""Tests for Habits API DynamoDB client."""
+
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from client import (
+    BATCH_GET_MAX_ATTEMPTS,
+    BATCH_WRITE_MAX_ATTEMPTS,
+    batch_get_with_retry,
+    batch_write_with_retry,
+    decode_cursor,
+    encode_cursor,
+    reminder_slot,
+    run_sync,
+)
+
+
+def _put_logs(client, habit_id: str, days: int, user_id: str = "user-1") -> None:
+    for day in range(1, days + 1):
+        client.put_habit_log(
+            {
+                "habit_id": habit_id,
+                "user_id": user_id,
+                "date": f"2024-01-{day:02d}",
+                "completed": True,
+            }
+        )
+
+
+class TestHabitsClient:
+    """Tests for HabitsClient."""
+
+    def test_put_and_get_habit(self, habits_client):
+        """Test putting and getting a habit."""
+        habits_client.put_habit(
+            {"user_id": "user-1", "habit_id": "habit-1", "name": "Exercise"}
+        )
+
+        result = habits_client.get_habit("user-1", "habit-1")
+        assert result["name"] == "Exercise"
+
+    def test_update_habit(self, habits_client):
+        """Test updating an existing habit in place."""
+        habits_client.put_habit(
+            {"user_id": "user-1", "habit_id": "habit-1", "name": "Exercise"}
+        )
+
+        result = habits_client.update_habit("user-1", "habit-1", {"name": "Run"})
+
+        assert result["name"] == "Run"
+        assert habits_client.get_habit("user-1", "habit-1")["name"] == "Run"
+
+    def test_update_habit_not_found(self, habits_client):
+        """Test updating a missing habit does not create it."""
+        assert habits_client.update_habit("user-1", "missing", {"name": "Run"}) is None
+        assert habits_client.get_habit("user-1", "missing") is None
+
+    def test_delete_habit(self, habits_client):
+        """Test conditional habit deletion."""
+        habits_client.put_habit(
+            {"user_id": "user-1", "habit_id": "habit-1", "name": "Exercise"}
+        )
+
+        assert habits_client.delete_habit("user-1", "habit-1") is True
+        assert habits_client.delete_habit("user-1", "habit-1") is False
+
+    def test_delete_habit_and_logs(self, habits_client):
+        """Test that a habit is deleted together with all its logs."""
+        habits_client.put_habit({"user_id": "user-1", "habit_id": "habit-1"})
+        _put_logs(habits_client, "habit-1", 3)
+
+        assert habits_client.delete_habit_and_logs("user-1", "habit-1") == 3
+        assert habits_client.query_habit_logs("habit-1") == []
+        assert habits_client.get_habit("user-1", "habit-1") is None
+
+    def test_delete_habit_log_checks_owner(self, habits_client):
+        """Test that a log cannot be deleted on behalf of another user."""
+        _put_logs(habits_client, "habit-1", 1)
+
+        assert (
+            habits_client.delete_habit_log("habit-1", "2024-01-01", "user-2") is False
+        )
+        assert len(habits_client.query_habit_logs("habit-1")) == 1
+        assert habits_client.delete_habit_log("habit-1", "2024-01-01", "user-1") is True
+        assert (
+            habits_client.delete_habit_log("habit-1", "2024-01-01", "user-1") is False
+        )
+
+    def test_iter_reminder_user_ids(self, habits_client):
+        """Test enumerating users with active reminder-enabled habits."""
+        habits_client.put_habit(
+            {"user_id": "user-1", "habit_id": "h1", "reminder_enabled": True}
+        )
+        habits_client.put_habit(
+            {"user_id": "user-1", "habit_id": "h2", "reminder_enabled": True}
+        )
+        habits_client.put_habit(
+            {"user_id": "user-2", "habit_id": "h3", "reminder_enabled": False}
+        )
+        habits_client.put_habit(
+            {
+                "user_id": "user-3",
+                "habit_id": "h4",
+                "reminder_enabled": True,
+                "is_active": False,
+            }
+        )
+
+        assert list(habits_client.iter_user_ids(reminder_enabled=True)) == ["user-1"]
+        assert sorted(habits_client.iter_user_ids()) == ["user-1", "user-2", "user-3"]
+
+    def test_query_habits_follows_pages(self, habits_client):
+        """Test that habit queries are not truncated at the first page."""
+        for i in range(5):
+            habits_client.put_habit(
+                {"user_id": "user-1", "habit_id": f"habit-{i}", "name": f"H{i}"}
+            )
+
+        results = list(habits_client.iter_habits("user-1", page_size=2))
+        assert len(results) == 5
+        assert len(habits_client.query_habits("user-1")) == 5
+
+    def test_query_habits_page_cursor_round_trip(self, habits_client):
+        """Test walking every habit page through encoded cursors."""
+        for i in range(5):
+            habits_client.put_habit(
+                {"user_id": "user-1", "habit_id": f"habit-{i}", "name": f"H{i}"}
+            )
+
+        seen, start_key = [], None
+        while True:
+            items, last_key = habits_client.query_habits_page("user-1", 2, start_key)
+            seen.extend(item["habit_id"] for item in items)
+            cursor = encode_cursor(last_key)
+            if cursor is None:
+                break
+            start_key = decode_cursor(cursor, ("user_id", "habit_id"), user_id="user-1")
+
+        assert seen == [f"habit-{i}" for i in range(5)]
+
+    def test_iter_habit_logs_max_items(self, habits_client):
+        """Test that max_items caps the number of yielded logs."""
+        _put_logs(habits_client, "habit-1", 10)
+
+        results = list(
+            habits_client.iter_habit_logs("habit-1", page_size=3, max_items=7)
+        )
+        assert [r["date"] for r in results] == [
+            f"2024-01-{day:02d}" for day in range(1, 8)
+        ]
+
+    def test_iter_habit_logs_by_user_follows_pages(self, habits_client):
+        """Test that GSI queries follow LastEvaluatedKey with a date range."""
+        _put_logs(habits_client, "habit-1", 20)
+        _put_logs(habits_client, "habit-2", 20)
+        _put_logs(habits_client, "habit-3", 20, user_id="user-2")
+
+        results = list(
+            habits_client.iter_habit_logs_by_user(
+                "user-1", "2024-01-05", "2024-01-14", page_size=4
+            )
+        )
+        assert len(results) == 20
+        assert all(r["user_id"] == "user-1" for r in results)
+
+    def test_batch_get_habits(self, habits_client):
+        """Test that only the user's habits are returned, across chunks."""
+        for i in range(120):
+            habits_client.put_habit(
+                {"user_id": "user-1", "habit_id": f"habit-{i}", "name": f"H{i}"}
+            )
+        habits_client.put_habit(
+            {"user_id": "user-2", "habit_id": "other", "name": "Other"}
+        )
+
+        habits = habits_client.batch_get_habits(
+            "user-1",
+            [f"habit-{i}" for i in range(120)] + ["other", "habit-0"],
+            projection=["habit_id", "name"],
+        )
+
+        assert len(habits) == 120
+        assert {h["name"] for h in habits} == {f"H{i}" for i in range(120)}
+        assert all(h.keys() == {"habit_id", "name"} for h in habits)
+
+    def test_batch_delete_habit_logs_all_pages(self, habits_client):
+        """Test that batch delete removes logs beyond the first page."""
+        _put_logs(habits_client, "habit-1", 30)
+
+        deleted = habits_client.batch_delete_habit_logs("habit-1")
+
+        assert deleted == 30
+        assert habits_client.query_habit_logs("habit-1") == []
+
+    def test_batch_delete_habit_logs_max_items(self, habits_client):
+        """Test that max_items bounds a single delete call."""
+        _put_logs(habits_client, "habit-1", 30)
+
+        assert habits_client.batch_delete_habit_logs("habit-1", max_items=26) == 26
+        assert len(habits_client.query_habit_logs("habit-1")) == 4
+        assert habits_client.has_habit_logs("habit-1")
+
+        assert habits_client.batch_delete_habit_logs("habit-1", max_items=4) == 4
+        assert not habits_client.has_habit_logs("habit-1")
+
+    def test_batch_delete_retries_unprocessed_items(self, habits_client):
+        """Test that UnprocessedItems are resubmitted."""
+        _put_logs(habits_client, "habit-1", 3)
+        client = habits_client._dynamodb.meta.client
+        batch_write_item = client.batch_write_item
+        calls = []
+
+        def throttled_once(RequestItems):
+            calls.append(RequestItems)
+            if len(calls) == 1:
+                return {"UnprocessedItems": RequestItems}
+            return batch_write_item(RequestItems=RequestItems)
+
+        with (
+            patch.object(client, "batch_write_item", side_effect=throttled_once),
+            patch("client.time.sleep") as sleep,
+        ):
+            assert habits_client.batch_delete_habit_logs("habit-1") == 3
+
+        assert len(calls) == 2
+        sleep.assert_called_once()
+        assert habits_client.query_habit_logs("habit-1") == []
+
+    def test_batch_get_retries_unprocessed_keys(self):
+        """Test that UnprocessedKeys are resubmitted and results merged."""
+        client = MagicMock()
+        keys = [{"id": "a"}, {"id": "b"}]
+        client.batch_get_item.side_effect = [
+            {
+                "Responses": {"table": [{"id": "a"}]},
+                "UnprocessedKeys": {"table": {"Keys": keys[1:]}},
+            },
+            {"Responses": {"table": [{"id": "b"}]}, "UnprocessedKeys": {}},
+        ]
+
+        with patch("client.time.sleep"):
+            items = batch_get_with_retry(client, "table", keys)
+
+        assert items == [{"id": "a"}, {"id": "b"}]
+        assert client.batch_get_item.call_args.kwargs["RequestItems"] == {
+            "table": {"Keys": [{"id": "b"}]}
+        }
+
+    def test_batch_get_gives_up(self):
+        """Test that persistent UnprocessedKeys raise."""
+        client = MagicMock()
+        client.batch_get_item.side_effect = lambda RequestItems: {
+            "Responses": {},
+            "UnprocessedKeys": RequestItems,
+        }
+
+        with patch("client.time.sleep"), pytest.raises(RuntimeError):
+            batch_get_with_retry(client, "table", [{"id": "a"}])
+
+        assert client.batch_get_item.call_count == BATCH_GET_MAX_ATTEMPTS
+
+    def test_batch_write_gives_up(self):
+        """Test that persistent UnprocessedItems raise."""
+        client = MagicMock()
+        client.batch_write_item.side_effect = lambda RequestItems: {
+            "UnprocessedItems": RequestItems
+        }
+
+        with patch("client.time.sleep"), pytest.raises(RuntimeError):
+            batch_write_with_retry(client, "logs", [{"DeleteRequest": {"Key": {}}}])
+
+        assert client.batch_write_item.call_count == BATCH_WRITE_MAX_ATTEMPTS
+
+
+class TestReminderSlots:
+    """Tests for the sparse reminder slot index."""
+
+    def test_reminder_slot(self):
+        """Test slots are the start of the bucket holding the reminder time."""
+        habit = {"reminder_enabled": True, "reminder_time": "07:44"}
+
+        assert reminder_slot(habit, 15, "21:00") == 7 * 60 + 30
+        assert reminder_slot({**habit, "reminder_time": None}, 15, "21:00") == 1260
+        assert reminder_slot({**habit, "is_active": False}, 15, "21:00") is None
+        assert reminder_slot({"reminder_time": "07:44"}, 15, "21:00") is None
+
+    def test_put_and_update_maintain_slot(self, habits_client):
+        """Test that writes keep the slot in line with the reminder fields."""
+        habits_client.put_habit(
+            {
+                "user_id": "user-1",
+                "habit_id": "habit-1",
+                "reminder_enabled": True,
+                "reminder_time": "07:00",
+            }
+        )
+        assert habits_client.get_habit("user-1", "habit-1")["reminder_slot"] == 420
+
+        result = habits_client.update_habit(
+            "user-1", "habit-1", {"reminder_time": "08:20"}
+        )
+        assert result["reminder_slot"] == 495
+        assert habits_client.get_habit("user-1", "habit-1")["reminder_slot"] == 495
+
+        result = habits_client.update_habit(
+            "user-1", "habit-1", {"reminder_enabled": False}
+        )
+        assert "reminder_slot" not in result
+        assert "reminder_slot" not in habits_client.get_habit("user-1", "habit-1")
+
+    def test_iter_habits_in_reminder_slot(self, habits_client):
+        """Test that one slot query returns due habits across users."""
+        for user_id, habit_id, reminder_time in [
+            ("user-1", "habit-1", "07:00"),
+            ("user-2", "habit-2", "07:10"),
+            ("user-2", "habit-3", "07:15"),
+        ]:
+            habits_client.put_habit(
+                {
+                    "user_id": user_id,
+                    "habit_id": habit_id,
+                    "reminder_enabled": True,
+                    "reminder_time": reminder_time,
+                }
+            )
+        habits_client.put_habit({"user_id": "user-3", "habit_id": "habit-4"})
+
+        results = habits_client.iter_habits_in_reminder_slot(420)
+
+        assert sorted(h["habit_id"] for h in results) == ["habit-1", "habit-2"]
+
+
+class TestContributionCounters:
+    """Tests for contribution counters maintained on log writes."""
+
+    def test_missing_aggregate_returns_none(self, habits_client):
+        """Test that a year without an aggregate item is reported as missing."""
+        assert habits_client.get_contribution_counts("user-1", 2024) is None
+
+    def test_put_toggle_and_delete_log(self, habits_client):
+        """Test counters follow completion toggles and deletes."""
+        log = {"habit_id": "habit-1", "user_id": "user-1", "date": "2024-01-01"}
+        habits_client.put_habit_log({**log, "habit_id": "habit-2", "completed": True})
+        habits_client.put_habit_log({**log, "completed": True})
+        habits_client.put_habit_log({**log, "completed": True})
+        assert habits_client.get_contribution_counts("user-1", 2024) == {
+            "2024-01-01": 2
+        }
+
+        habits_client.put_habit_log({**log, "completed": False})
+        assert habits_client.get_contribution_counts("user-1", 2024) == {
+            "2024-01-01": 1
+        }
+
+        assert habits_client.delete_habit_log("habit-1", "2024-01-01", "user-1")
+        assert habits_client.delete_habit_log("habit-2", "2024-01-01", "user-1")
+        assert habits_client.get_contribution_counts("user-1", 2024) == {}
+
+    def test_batch_delete_decrements_counters(self, habits_client):
+        """Test that deleting a habit's logs removes their contributions."""
+        _put_logs(habits_client, "habit-1", 3)
+        _put_logs(habits_client, "habit-2", 2)
+
+        habits_client.batch_delete_habit_logs("habit-1")
+
+        assert habits_client.get_contribution_counts("user-1", 2024) == {
+            "2024-01-01": 1,
+            "2024-01-02": 1,
+        }
+
+    def test_batch_put_logs_updates_counters(self, habits_client):
+        """Test that batch writes only count completions that changed."""
+        _put_logs(habits_client, "habit-1", 2)
+        logs = [
+            {
+                "habit_id": habit_id,
+                "user_id": "user-1",
+                "date": f"2024-01-{day:02d}",
+                "completed": habit_id == "habit-2" or day == 1,
+            }
+            for habit_id in ("habit-1", "habit-2")
+            for day in range(1, 31)
+        ]
+
+        assert habits_client.batch_put_habit_logs(logs) == []
+
+        counts = habits_client.get_contribution_counts("user-1", 2024)
+        assert counts["2024-01-01"] == 2
+        assert counts["2024-01-02"] == 1  # habit-1 unchecked, habit-2 checked
+        assert counts["2024-01-30"] == 1
+        assert len(habits_client.query_habit_logs("habit-2")) == 30
+
+    def test_batch_put_logs_reports_unprocessed(self, habits_client):
+        """Test that logs DynamoDB keeps rejecting are returned, not counted."""
+        log = {
+            "habit_id": "habit-1",
+            "user_id": "user-1",
+            "date": "2024-01-01",
+            "completed": True,
+        }
+        client = habits_client._dynamodb.meta.client
+
+        with (
+            patch.object(
+                client,
+                "batch_write_item",
+                side_effect=lambda RequestItems: {"UnprocessedItems": RequestItems},
+            ),
+            patch("client.time.sleep"),
+        ):
+            assert habits_client.batch_put_habit_logs([log]) == [log]
+
+        assert habits_client.get_contribution_counts("user-1", 2024) is None
+
+    def test_rebuild_from_logs(self, habits_client, dynamodb_tables):
+        """Test that a missing aggregate is rebuilt from the logs."""
+        _, habit_logs, _ = dynamodb_tables
+        # Written directly so that no counters exist yet
+        habit_logs.put_item(
+            Item={
+                "habit_id": "habit-1",
+                "user_id": "user-1",
+                "date": "2024-03-01",
+                "completed": True,
+            }
+        )
+
+        counts = habits_client.rebuild_contribution_counts("user-1", 2024)
+
+        assert counts == {"2024-03-01": 1}
+        assert habits_client.get_contribution_counts("user-1", 2024) == counts
+
+    def test_write_builds_aggregate_from_earlier_logs(
+        self, habits_client, dynamodb_tables
+    ):
+        """Test that the first write after the migration counts earlier logs."""
+        _, habit_logs, contributions = dynamodb_tables
+        # Logs and a delta-only aggregate from before the built marker existed
+        for day in range(1, 4):
+            habit_logs.put_item(
+                Item={
+                    "habit_id": "habit-1",
+                    "user_id": "user-1",
+                    "date": f"2024-01-{day:02d}",
+                    "completed": True,
+                }
+            )
+        contributions.put_item(
+            Item={"user_id": "user-1", "year": 2024, "2024-01-03": 1}
+        )
+        assert habits_client.get_contribution_counts("user-1", 2024) is None
+
+        habits_client.put_habit_log(
+            {
+                "habit_id": "habit-1",
+                "user_id": "user-1",
+                "date": "2024-01-04",
+                "completed": True,
+            }
+        )
+        _put_logs(habits_client, "habit-2", 1)
+
+        assert habits_client.get_contribution_counts("user-1", 2024) == {
+            "2024-01-01": 2,
+            "2024-01-02": 1,
+            "2024-01-03": 1,
+            "2024-01-04": 1,
+        }
+
+    def test_rebuild_recounts_written_dates_of_concurrent_aggregate(
+        self, habits_client, dynamodb_tables
+    ):
+        """Test that a writer losing the rebuild race still gets its day counted."""
+        _, habit_logs, _ = dynamodb_tables
+        habit_logs.put_item(
+            Item={
+                "habit_id": "habit-1",
+                "user_id": "user-1",
+                "date": "2024-03-01",
+                "completed": True,
+            }
+        )
+        # Built by another rebuild that read the logs before this write
+        habits_client.put_contribution_counts("user-1", 2024, {"2024-02-01": 2})
+
+        counts = habits_client.rebuild_contribution_counts(
+            "user-1", 2024, {("habit-1", "2024-03-01"): True}
+        )
+
+        assert counts == {"2024-02-01": 2, "2024-03-01": 1}
+        assert habits_client.get_contribution_counts("user-1", 2024) == counts
+
+    def test_first_write_counted_despite_gsi_lag(self, habits_client):
+        """Test that a write missing from the lagging GSI is still counted."""
+        log = {
+            "habit_id": "habit-1",
+            "user_id": "user-1",
+            "date": "2025-01-01",
+            "completed": True,
+        }
+
+        # The index has not caught up with the write yet
+        with patch.object(habits_client, "iter_habit_logs_by_user", return_value=[]):
+            habits_client.put_habit_log(log)
+
+        assert habits_client.get_contribution_counts("user-1", 2025) == {
+            "2025-01-01": 1
+        }
+
+    def test_delete_not_counted_despite_gsi_lag(self, habits_client, dynamodb_tables):
+        """Test that a delete still shown by the lagging GSI is not counted."""
+        _, habit_logs, _ = dynamodb_tables
+        logs = [
+            {
+                "habit_id": habit_id,
+                "user_id": "user-1",
+                "date": "2024-01-01",
+                "completed": True,
+            }
+            for habit_id in ("habit-1", "habit-2")
+        ]
+        # Written before the aggregate existed, so the delete rebuilds it
+        for log in logs:
+            habit_logs.put_item(Item=log)
+
+        with patch.object(habits_client, "iter_habit_logs_by_user", return_value=logs):
+            assert habits_client.delete_habit_log("habit-2", "2024-01-01", "user-1")
+
+        assert habits_client.get_contribution_counts("user-1", 2024) == {
+            "2024-01-01": 1
+        }
+
+    def test_rebuild_keeps_existing_aggregate(self, habits_client):
+        """Test that the read-path rebuild never clobbers live counters."""
+        habits_client.put_contribution_counts("user-1", 2024, {"2024-01-05": 3})
+
+        counts = habits_client.rebuild_contribution_counts("user-1", 2024)
+
+        assert counts == {"2024-01-05": 3}
+
+    def test_query_contribution_counts_range(self, habits_client):
+        """Test that several years are read with one range query."""
+        habits_client.put_contribution_counts("user-1", 2022, {"2022-01-01": 1})
+        habits_client.put_contribution_counts("user-1", 2023, {"2023-01-01": 2})
+        habits_client.put_contribution_counts("user-1", 2024, {"2024-01-01": 3})
+
+        result = habits_client.query_contribution_counts("user-1", 2023, 2024)
+
+        assert result == {2023: {"2023-01-01": 2}, 2024: {"2024-01-01": 3}}
+
+
+class TestVersionCounters:
+    """Tests for the per-user change counter bumped by every write."""
+
+    def test_unwritten_user_is_zero(self, habits_client):
+        """Test that a user without writes reads as version 0."""
+        assert habits_client.get_version("user-1") == 0
+
+    def test_habit_writes_bump(self, habits_client):
+        """Test that habit puts, updates and deletes each bump the counter."""
+        habits_client.put_habit({"user_id": "user-1", "habit_id": "habit-1"})
+        habits_client.update_habit("user-1", "habit-1", {"name": "Run"})
+        assert habits_client.update_habit("user-1", "missing", {"name": "x"}) is None
+        assert habits_client.delete_habit("user-1", "habit-1")
+        assert not habits_client.delete_habit("user-1", "habit-1")
+
+        assert habits_client.get_version("user-1") == 3
+        assert habits_client.get_version("user-2") == 0
+
+    def test_log_writes_bump(self, habits_client):
+        """Test that single and batch log writes bump their users' counters."""
+        log = {"habit_id": "habit-1", "user_id": "user-1", "date": "2024-01-01"}
+        habits_client.put_habit_log({**log, "completed": True})
+        assert habits_client.delete_habit_log("habit-1", "2024-01-01", "user-1")
+        assert not habits_client.delete_habit_log("habit-1", "2024-01-01", "user-1")
+        assert habits_client.get_version("user-1") == 2
+
+        habits_client.batch_put_habit_logs(
+            [
+                {**log, "date": "2024-01-02"},
+                {**log, "date": "2024-01-03", "user_id": "user-2"},
+            ]
+        )
+        assert habits_client.get_version("user-1") == 3
+        assert habits_client.get_version("user-2") == 1
+
+        assert habits_client.batch_delete_habit_logs("habit-1") == 2
+        assert habits_client.get_version("user-1") == 4
+        assert habits_client.get_version("user-2") == 2
+
+
+class TestRunSync:
+    """Tests for run_sync."""
+
+    async def test_runs_off_event_loop(self):
+        """Test that the call runs on an executor thread and returns its value."""
+        loop_thread = threading.get_ident()
+
+        result = await run_sync(lambda x, y=0: (threading.get_ident(), x + y), 1, y=2)
+
+        assert result[0] != loop_thread
+        assert result[1] == 3
+
+    async def test_propagates_exceptions(self):
+        """Test that exceptions raised by the call reach the awaiting handler."""
+
+        def fail() -> None:
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            await run_sync(fail)
+
+
+class TestClientRegistry:
+    """Tests for the process-wide table registry."""
+
+    def test_clients_share_tables(self):
+        """Test that clients reuse one resource and table handles."""
+        from client import HabitsClient
+
+        first = HabitsClient("registry-habits", "registry-logs")
+        second = HabitsClient("registry-habits", "registry-logs")
+
+        assert first._habits_table is second._habits_table
+        assert first._dynamodb is second._dynamodb
+        assert first._habit_logs_table.meta.client is first._dynamodb.meta.client
+        assert first._dynamodb.meta.client.meta.config.max_pool_connections == 32
+
+    def test_endpoint_is_part_of_key(self):
+        """Test that another endpoint gets its own resource."""
+        from client import get_table
+
+        default = get_table("registry-habits", "ap-northeast-1")
+        local = get_table("registry-habits", "ap-northeast-1", "http://localhost:8000")
+
+        assert local is not default
+        assert local.meta.client.meta.endpoint_url == "http://localhost:8000"
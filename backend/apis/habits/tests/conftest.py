@@ -2,6 +2,114 @@
 
 import sys
 from pathlib import Path
+from unittest.mock import patch
+
+import boto3
+import pytest
+from moto import mock_aws
 
 # Add the habits module directory to the path
 sys.path.insert(0, str(Path(__file__).parent.parent))
+
+HABITS_TABLE = "personal-growth-tracker-habits"
+HABIT_LOGS_TABLE = "personal-growth-tracker-habit-logs"
+HABIT_CONTRIBUTIONS_TABLE = "personal-growth-tracker-habit-contributions"
+VERSIONS_TABLE = "personal-growth-tracker-versions"
+
+
+@pytest.fixture
+def dynamodb_tables():
+    """Create mock DynamoDB tables."""
+    with mock_aws():
+        dynamodb = boto3.resource("dynamodb", region_name="ap-northeast-1")
+        habits = dynamodb.create_table(
+            TableName=HABITS_TABLE,
+            KeySchema=[
+                {"AttributeName": "user_id", "KeyType": "HASH"},
+                {"AttributeName": "habit_id", "KeyType": "RANGE"},
+            ],
+            AttributeDefinitions=[
+                {"AttributeName": "user_id", "AttributeType": "S"},
+                {"AttributeName": "habit_id", "AttributeType": "S"},
+                {"AttributeName": "reminder_slot", "AttributeType": "N"},
+            ],
+            GlobalSecondaryIndexes=[
+                {
+                    "IndexName": "reminder_slot-index",
+                    "KeySchema": [
+                        {"AttributeName": "reminder_slot", "KeyType": "HASH"},
+                        {"AttributeName": "user_id", "KeyType": "RANGE"},
+                    ],
+                    "Projection": {"ProjectionType": "ALL"},
+                }
+            ],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        habit_logs = dynamodb.create_table(
+            TableName=HABIT_LOGS_TABLE,
+            KeySchema=[
+                {"AttributeName": "habit_id", "KeyType": "HASH"},
+                {"AttributeName": "date", "KeyType": "RANGE"},
+            ],
+            AttributeDefinitions=[
+                {"AttributeName": "habit_id", "AttributeType": "S"},
+                {"AttributeName": "date", "AttributeType": "S"},
+                {"AttributeName": "user_id", "AttributeType": "S"},
+            ],
+            GlobalSecondaryIndexes=[
+                {
+                    "IndexName": "user_id-date-index",
+                    "KeySchema": [
+                        {"AttributeName": "user_id", "KeyType": "HASH"},
+                        {"AttributeName": "date", "KeyType": "RANGE"},
+                    ],
+                    "Projection": {"ProjectionType": "ALL"},
+                }
+            ],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        contributions = dynamodb.create_table(
+            TableName=HABIT_CONTRIBUTIONS_TABLE,
+            KeySchema=[
+                {"AttributeName": "user_id", "KeyType": "HASH"},
+                {"AttributeName": "year", "KeyType": "RANGE"},
+            ],
+            AttributeDefinitions=[
+                {"AttributeName": "user_id", "AttributeType": "S"},
+                {"AttributeName": "year", "AttributeType": "N"},
+            ],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        versions = dynamodb.create_table(
+            TableName=VERSIONS_TABLE,
+            KeySchema=[
+                {"AttributeName": "owner_id", "KeyType": "HASH"},
+                {"AttributeName": "scope", "KeyType": "RANGE"},
+            ],
+            AttributeDefinitions=[
+                {"AttributeName": "owner_id", "AttributeType": "S"},
+                {"AttributeName": "scope", "AttributeType": "S"},
+            ],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        habits.wait_until_exists()
+        habit_logs.wait_until_exists()
+        contributions.wait_until_exists()
+        versions.wait_until_exists()
+        yield habits, habit_logs, contributions
+
+
+@pytest.fixture
+def habits_client(dynamodb_tables):
+    """Create a HabitsClient bound to the mock tables."""
+    from client import HabitsClient
+
+    with patch("client.get_settings") as mock_settings:
+        mock_settings.return_value.aws_region = "ap-northeast-1"
+        mock_settings.return_value.batch_write_max_workers = 4
+        mock_settings.return_value.db_max_workers = 4
+        mock_settings.return_value.reminder_slot_minutes = 15
+        mock_settings.return_value.default_reminder_time = "21:00"
+        yield HabitsClient(
+            HABITS_TABLE, HABIT_LOGS_TABLE, HABIT_CONTRIBUTIONS_TABLE, VERSIONS_TABLE
+        )
@@ -1,10 +1,19 @@
 """Tests for contribution calculation."""
 
+import json
+from datetime import date
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
 from contribution import (
     calculate_contribution_level,
-    calculate_contributions,
+    encode_contribution_range,
+    encode_contributions,
     generate_year_dates,
 )
+from models import ContributionData, ContributionResponse
 
 
 class TestCalculateContributionLevel:
@@ -51,38 +60,89 @@ class TestGenerateYearDates:
         assert len(dates) == 365
 
 
-class TestCalculateContributions:
-    """Tests for contribution calculation."""
-
-    def test_empty_logs(self):
-        """Test with no habit logs."""
-        result = calculate_contributions([], 2024, 3)
-        assert result.year == 2024
-        assert result.total_contributions == 0
-        assert len(result.data) == 366  # Leap year
+class TestEncodeContributions:
+    """Tests for the array-based contribution encoder."""
 
-    def test_with_logs(self):
-        """Test with some habit logs."""
-        logs = [
-            {"date": "2024-01-01", "completed": True},
-            {"date": "2024-01-01", "completed": True},
-            {"date": "2024-01-02", "completed": True},
+    @staticmethod
+    def _reference_body(date_counts, year, habit_count):
+        max_count = habit_count if habit_count > 0 else 1
+        data = [
+            ContributionData(
+                date=d,
+                count=date_counts.get(d, 0),
+                level=calculate_contribution_level(date_counts.get(d, 0), max_count),
+            )
+            for d in generate_year_dates(year)
         ]
-        result = calculate_contributions(logs, 2024, 3)
-        assert result.total_contributions == 3
-
-        # Check specific dates
-        jan1 = next(d for d in result.data if d.date == "2024-01-01")
-        assert jan1.count == 2
-
-        jan2 = next(d for d in result.data if d.date == "2024-01-02")
-        assert jan2.count == 1
-
-    def test_incomplete_logs_ignored(self):
-        """Test that incomplete logs are ignored."""
-        logs = [
-            {"date": "2024-01-01", "completed": True},
-            {"date": "2024-01-01", "completed": False},
+        response = ContributionResponse(
+            year=year,
+            total_contributions=sum(entry.count for entry in data),
+            data=data,
+        )
+        return JSONResponse(jsonable_encoder(response)).body
+
+    @pytest.mark.parametrize(
+        ("date_counts", "year", "habit_count"),
+        [
+            ({}, 2024, 3),
+            ({}, 2023, 0),
+            ({"2024-01-01": 2, "2024-02-29": 1, "2024-12-31": 4}, 2024, 4),
+            ({"2023-06-15": 7, "2023-06-16": 1}, 2023, 3),
+            ({"2023-12-31": 5, "2024-13-45": 1, "2024-03-01": 1}, 2024, 0),
+        ],
+    )
+    def test_byte_identical_to_model_response(self, date_counts, year, habit_count):
+        """Test output matches FastAPI's rendering of the model response."""
+        assert encode_contributions(
+            date_counts, year, habit_count
+        ) == self._reference_body(date_counts, year, habit_count)
+
+    def test_levels_bucketed(self):
+        """Test that levels follow calculate_contribution_level."""
+        body = json.loads(
+            encode_contributions(
+                {"2024-01-01": 1, "2024-01-02": 2, "2024-01-03": 3, "2024-01-04": 4},
+                2024,
+                4,
+            )
+        )
+        assert [d["level"] for d in body["data"][:5]] == [1, 2, 3, 4, 0]
+        assert body["total_contributions"] == 10
+
+
+class TestEncodeContributionRange:
+    """Tests for the date-range contribution encoder."""
+
+    def test_full_year_matches_year_encoding(self):
+        """Test a calendar-year range carries the same per-day data."""
+        date_counts = {"2024-01-01": 2, "2024-02-29": 1, "2024-12-31": 3}
+
+        ranged = json.loads(
+            encode_contribution_range(
+                date_counts, date(2024, 1, 1), date(2024, 12, 31), 3
+            )
+        )
+        yearly = json.loads(encode_contributions(date_counts, 2024, 3))
+
+        assert ranged["data"] == yearly["data"]
+        assert ranged["total_contributions"] == yearly["total_contributions"] == 6
+
+    def test_range_across_years(self):
+        """Test a range spanning a year boundary in both encodings."""
+        date_counts = {"2023-12-31": 1, "2024-01-01": 2, "2024-01-03": 9}
+        start, end = date(2023, 12, 30), date(2024, 1, 2)
+
+        rows = json.loads(encode_contribution_range(date_counts, start, end, 2))
+        columns = json.loads(
+            encode_contribution_range(date_counts, start, end, 2, columnar=True)
+        )
+
+        assert [d["date"] for d in rows["data"]] == [
+            "2023-12-30",
+            "2023-12-31",
+            "2024-01-01",
+            "2024-01-02",
         ]
-        result = calculate_contributions(logs, 2024, 2)
-        assert result.total_contributions == 1
+        assert columns["counts"] == [d["count"] for d in rows["data"]] == [0, 1, 2, 0]
+        assert columns["levels"] == [d["level"] for d in rows["data"]] == [0, 2, 4, 0]
+        assert rows["total_contributions"] == columns["total_contributions"] == 3
@@ -0,0 +1,393 @@
+"""Tests for Habits API main module endpoints."""
+
+import threading
+import time
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture
+def mock_habits_client():
+    """Mock the shared HabitsClient used by main endpoints."""
+    with patch("main.habits_db") as mock:
+        yield mock
+
+
+@pytest.fixture
+def slow_reads(mock_habits_client):
+    """Make every read of the mocked client block like a DynamoDB round trip."""
+    delay = 0.2
+
+    def delayed(value):
+        def read(*args, **kwargs):
+            time.sleep(delay)
+            if isinstance(value, Exception):
+                raise value
+            return value
+
+        return read
+
+    def configure(**results):
+        for name, value in results.items():
+            getattr(mock_habits_client, name).side_effect = delayed(value)
+        return delay
+
+    return configure
+
+
+@pytest.fixture
+def client(mock_habits_client):
+    """Create test client."""
+    from main import app
+
+    return TestClient(app)
+
+
+class TestContributions:
+    """Tests for contributions endpoint."""
+
+    def test_contributions_route_not_shadowed(self, client, mock_habits_client):
+        """Test /habits/contributions is not handled as a habit ID."""
+        mock_habits_client.query_habits.return_value = [
+            {"habit_id": "habit-1", "is_active": True}
+        ]
+        mock_habits_client.query_contribution_counts.return_value = {
+            2024: {"2024-01-01": 1}
+        }
+
+        response = client.get("/api/v1/habits/contributions?user_id=user-1&year=2024")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["year"] == 2024
+        assert data["total_contributions"] == 1
+        mock_habits_client.query_contribution_counts.assert_called_once_with(
+            "user-1", 2024, 2024
+        )
+        mock_habits_client.rebuild_contribution_counts.assert_not_called()
+
+    def test_contributions_past_year_cached(self, client, mock_habits_client):
+        """Test that past years are cached long and revalidated by ETag."""
+        year = date.today().year - 1
+        mock_habits_client.query_habits.return_value = [{"habit_id": "habit-1"}]
+        mock_habits_client.query_contribution_counts.return_value = {year: {}}
+        url = f"/api/v1/habits/contributions?user_id=user-1&year={year}"
+
+        response = client.get(url)
+
+        assert response.headers["Cache-Control"] == "private, max-age=31536000"
+        response = client.get(url, headers={"If-None-Match": response.headers["ETag"]})
+        assert response.status_code == 304
+        assert response.content == b""
+
+    def test_contributions_not_modified_reads_counter_only(
+        self, client, mock_habits_client
+    ):
+        """Test that a matching If-None-Match skips the habit and counter reads."""
+        mock_habits_client.get_version.return_value = 7
+        mock_habits_client.query_habits.return_value = [{"habit_id": "habit-1"}]
+        mock_habits_client.query_contribution_counts.return_value = {2024: {}}
+        url = "/api/v1/habits/contributions?user_id=user-1&year=2024"
+        etag = client.get(url).headers["ETag"]
+        assert client.get(f"{url}&columnar=true").headers["ETag"] != etag
+
+        mock_habits_client.query_habits.reset_mock()
+        mock_habits_client.query_contribution_counts.reset_mock()
+        response = client.get(url, headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        mock_habits_client.get_version.assert_called_with("user-1")
+        mock_habits_client.query_habits.assert_not_called()
+        mock_habits_client.query_contribution_counts.assert_not_called()
+
+        mock_habits_client.get_version.return_value = 8
+        response = client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+    def test_contributions_current_year_revalidated(self, client, mock_habits_client):
+        """Test that the current year must be revalidated on every use."""
+        year = date.today().year
+        mock_habits_client.query_habits.return_value = [{"habit_id": "habit-1"}]
+        mock_habits_client.query_contribution_counts.return_value = {year: {}}
+
+        response = client.get(
+            f"/api/v1/habits/contributions?user_id=user-1&year={year}",
+            headers={"If-None-Match": 'W/"stale"'},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["Cache-Control"] == "private, no-cache"
+
+    def test_contributions_backfills_missing_aggregate(
+        self, client, mock_habits_client
+    ):
+        """Test that a missing aggregate is rebuilt from the logs."""
+        mock_habits_client.query_habits.return_value = [
+            {"habit_id": "habit-1", "is_active": True}
+        ]
+        mock_habits_client.query_contribution_counts.return_value = {}
+        mock_habits_client.rebuild_contribution_counts.return_value = {
+            "2024-02-01": 1,
+            "2024-02-02": 1,
+        }
+
+        response = client.get("/api/v1/habits/contributions?user_id=user-1&year=2024")
+
+        assert response.status_code == 200
+        assert response.json()["total_contributions"] == 2
+        mock_habits_client.rebuild_contribution_counts.assert_called_once_with(
+            "user-1", 2024
+        )
+
+    def test_contributions_no_habits(self, client, mock_habits_client):
+        """Test 404 when the user has no active habits."""
+        mock_habits_client.query_habits.return_value = []
+
+        response = client.get("/api/v1/habits/contributions?user_id=user-1")
+
+        assert response.status_code == 404
+
+    def test_contributions_range_single_query(self, client, mock_habits_client):
+        """Test a multi-year range is served from one aggregate query."""
+        mock_habits_client.query_habits.return_value = [
+            {"habit_id": "habit-1", "is_active": True}
+        ]
+        mock_habits_client.query_contribution_counts.return_value = {
+            2023: {"2023-12-31": 1},
+            2024: {"2024-01-01": 1, "2024-03-01": 1},
+        }
+
+        response = client.get(
+            "/api/v1/habits/contributions?user_id=user-1"
+            "&start_date=2023-12-01&end_date=2024-01-31"
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["start_date"] == "2023-12-01"
+        assert data["end_date"] == "2024-01-31"
+        assert data["total_contributions"] == 2
+        assert len(data["data"]) == 62
+        mock_habits_client.query_contribution_counts.assert_called_once_with(
+            "user-1", 2023, 2024
+        )
+        mock_habits_client.rebuild_contribution_counts.assert_not_called()
+
+    def test_contributions_columnar(self, client, mock_habits_client):
+        """Test the opt-in columnar body."""
+        mock_habits_client.query_habits.return_value = [
+            {"habit_id": "habit-1", "is_active": True},
+            {"habit_id": "habit-2", "is_active": True},
+        ]
+        mock_habits_client.query_contribution_counts.return_value = {
+            2024: {"2024-01-02": 2}
+        }
+
+        response = client.get(
+            "/api/v1/habits/contributions?user_id=user-1"
+            "&start_date=2024-01-01&end_date=2024-01-03&columnar=true"
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "start_date": "2024-01-01",
+            "end_date": "2024-01-03",
+            "total_contributions": 2,
+            "counts": [0, 2, 0],
+            "levels": [0, 4, 0],
+        }
+
+    @pytest.mark.parametrize(
+        "query",
+        [
+            "start_date=2024-01-01",
+            "year=2024&start_date=2024-01-01&end_date=2024-01-31",
+            "start_date=2024-02-01&end_date=2024-01-01",
+            "start_date=2020-01-01&end_date=2024-12-31",
+        ],
+    )
+    def test_contributions_invalid_range(self, client, mock_habits_client, query):
+        """Test invalid or oversized ranges are rejected before any query."""
+        response = client.get(f"/api/v1/habits/contributions?user_id=user-1&{query}")
+
+        assert response.status_code == 422
+        mock_habits_client.query_habits.assert_not_called()
+
+    def test_contributions_reads_concurrently(self, client, slow_reads):
+        """Test that habits and counters are read at the same time."""
+        delay = slow_reads(
+            query_habits=[{"habit_id": "habit-1", "is_active": True}],
+            query_contribution_counts={2024: {"2024-01-01": 1}},
+        )
+
+        started = time.monotonic()
+        response = client.get("/api/v1/habits/contributions?user_id=user-1&year=2024")
+        elapsed = time.monotonic() - started
+
+        assert response.status_code == 200
+        assert elapsed < 2 * delay
+
+    def test_contributions_no_habits_before_counter_errors(self, client, slow_reads):
+        """Test that a user without habits gets 404 even if counters fail."""
+        slow_reads(
+            query_habits=[],
+            query_contribution_counts=RuntimeError("throttled"),
+        )
+
+        response = client.get("/api/v1/habits/contributions?user_id=user-1&year=2024")
+
+        assert response.status_code == 404
+
+    def test_contributions_counter_error(self, client, slow_reads):
+        """Test that a failing counter read is still a server error."""
+        slow_reads(
+            query_habits=[{"habit_id": "habit-1", "is_active": True}],
+            query_contribution_counts=RuntimeError("throttled"),
+        )
+
+        response = TestClient(client.app, raise_server_exceptions=False).get(
+            "/api/v1/habits/contributions?user_id=user-1&year=2024"
+        )
+
+        assert response.status_code == 500
+
+
+class TestSendReminder:
+    """Tests for the reminder endpoint."""
+
+    @pytest.fixture(autouse=True)
+    def webhook(self):
+        """Configure a Slack webhook for every reminder test."""
+        import main
+
+        with patch.object(main.settings, "slack_webhook_url", "https://hooks.test"):
+            yield
+
+    def test_reminder_reads_concurrently(self, client, slow_reads):
+        """Test that habits and the day's logs are read at the same time."""
+        delay = slow_reads(
+            query_habits=[
+                {"habit_id": "habit-1", "name": "Run", "reminder_enabled": True}
+            ],
+            query_habit_logs_by_user=[],
+        )
+
+        with patch(
+            "slack_notifier.deliver_slack_notification", return_value=True
+        ) as send:
+            started = time.monotonic()
+            response = client.post("/api/v1/habits/reminder?user_id=user-1")
+            elapsed = time.monotonic() - started
+
+        assert response.status_code == 200
+        assert response.json()["incomplete_count"] == 1
+        assert elapsed < 2 * delay
+        send.assert_called_once()
+
+    def test_reminder_no_habits_before_log_errors(self, client, slow_reads):
+        """Test that a user without habits is answered even if logs fail."""
+        slow_reads(query_habits=[], query_habit_logs_by_user=RuntimeError("down"))
+
+        response = client.post("/api/v1/habits/reminder?user_id=user-1")
+
+        assert response.status_code == 200
+        assert response.json()["message"] == "No active habits found"
+
+
+class TestLambdaHandler:
+    """Tests for the Lambda entry point."""
+
+    def test_async_habit_deletion_event(self):
+        """Test that self-invocations delete the remaining logs, then the habit."""
+        import main
+
+        with patch.object(main, "habits_db") as mock_db:
+            mock_db.delete_habit_and_logs.return_value = 5000
+
+            result = main.handler(
+                {"delete_habit_logs": "habit-1", "user_id": "user-1"}, None
+            )
+
+        assert result == {"deleted": 5000}
+        mock_db.delete_habit_and_logs.assert_called_once_with("user-1", "habit-1")
+
+    def test_async_log_deletion_event_without_user(self):
+        """Test that events queued before user_id was sent only delete logs."""
+        import main
+
+        with patch.object(main, "habits_db") as mock_db:
+            mock_db.batch_delete_habit_logs.return_value = 5000
+
+            result = main.handler({"delete_habit_logs": "habit-1"}, None)
+
+        assert result == {"deleted": 5000}
+        mock_db.batch_delete_habit_logs.assert_called_once_with("habit-1")
+        mock_db.delete_habit.assert_not_called()
+
+    def test_batch_reminders(self, mock_habits_client):
+        """Test that batch mode reports per-user outcomes."""
+        import main
+
+        mock_habits_client.iter_user_ids.return_value = iter(["user-1", "user-2"])
+        mock_habits_client.query_habits.return_value = []
+
+        with patch.object(main.settings, "slack_webhook_url", "https://hooks.test"):
+            result = main.lambda_reminder_handler({"all_users": True}, None)
+
+        assert result["statusCode"] == 200
+        assert [r["user_id"] for r in result["body"]["results"]] == [
+            "user-1",
+            "user-2",
+        ]
+        mock_habits_client.iter_user_ids.assert_called_once_with(reminder_enabled=True)
+
+    def test_batch_reminders_read_users_off_the_event_loop(self, mock_habits_client):
+        """Test that the paginated user scan runs on the executor."""
+        import main
+
+        threads = []
+
+        def iter_user_ids(reminder_enabled):
+            threads.append(threading.get_ident())
+            yield from ["user-1"]
+            threads.append(threading.get_ident())
+
+        mock_habits_client.iter_user_ids.side_effect = iter_user_ids
+        mock_habits_client.query_habits.return_value = []
+
+        with patch.object(main.settings, "slack_webhook_url", "https://hooks.test"):
+            main.lambda_reminder_handler({"all_users": True}, None)
+
+        assert len(threads) == 2
+        assert threading.get_ident() not in threads
+
+    def test_due_now_reminders(self, mock_habits_client):
+        """Test that slot runs only read the habits due in the current slot."""
+        import main
+
+        mock_habits_client.iter_habits_in_reminder_slot.return_value = iter(
+            [
+                {"user_id": "user-1", "habit_id": "habit-1", "reminder_enabled": True},
+                {"user_id": "user-1", "habit_id": "habit-2", "reminder_enabled": True},
+            ]
+        )
+        mock_habits_client.iter_habit_logs_by_user.return_value = iter([])
+
+        with (
+            patch.object(main.settings, "slack_webhook_url", "https://hooks.test"),
+            patch("slack_notifier.deliver_slack_payload", return_value=True) as post,
+        ):
+            result = main.lambda_reminder_handler({"due_now": True}, None)
+
+        [user_result] = result["body"]["results"]
+        assert user_result["user_id"] == "user-1"
+        assert user_result["incomplete_count"] == 2
+        assert user_result["success"] is True
+        # Batch runs post a digest by default
+        post.assert_called_once()
+        mock_habits_client.query_habits.assert_not_called()
+        mock_habits_client.iter_user_ids.assert_not_called()
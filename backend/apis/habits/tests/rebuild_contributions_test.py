@@ -0,0 +1,41 @@
+"""Tests for the contribution counters rebuild command."""
+
+from rebuild_contributions import rebuild_user
+
+
+class TestRebuildUser:
+    """Tests for rebuild_user."""
+
+    def test_rebuilds_every_year(self, habits_client, dynamodb_tables):
+        """Test that counters are recomputed for each year with logs."""
+        _, habit_logs, _ = dynamodb_tables
+        for log_date, completed in [
+            ("2023-12-31", True),
+            ("2024-01-01", True),
+            ("2024-01-02", False),
+        ]:
+            habit_logs.put_item(
+                Item={
+                    "habit_id": "habit-1",
+                    "user_id": "user-1",
+                    "date": log_date,
+                    "completed": completed,
+                }
+            )
+        habits_client.put_contribution_counts("user-1", 2024, {"2024-01-02": 9})
+
+        totals = rebuild_user(habits_client, "user-1")
+
+        assert totals == {2023: 1, 2024: 1}
+        assert habits_client.get_contribution_counts("user-1", 2024) == {
+            "2024-01-01": 1
+        }
+
+    def test_rebuild_single_year_without_logs(self, habits_client):
+        """Test that an explicitly requested empty year is reset."""
+        habits_client.put_contribution_counts("user-1", 2022, {"2022-05-05": 4})
+
+        totals = rebuild_user(habits_client, "user-1", 2022)
+
+        assert totals == {2022: 0}
+        assert habits_client.get_contribution_counts("user-1", 2022) == {}
@@ -0,0 +1,193 @@
+"""Tests for Habits API reminder evaluation."""
+
+import asyncio
+import threading
+import time
+from datetime import UTC, date, datetime
+from unittest.mock import patch
+
+from models import ReminderResponse
+from reminder import (
+    current_reminder_slot,
+    evaluate_reminder,
+    run_reminders,
+    select_due_habits,
+)
+from slack_notifier import ReminderDigest
+
+MONDAY = date(2024, 1, 15)
+SATURDAY = date(2024, 1, 20)
+
+
+def _habit(user_id: str, habit_id: str, **fields) -> dict:
+    return {
+        "user_id": user_id,
+        "habit_id": habit_id,
+        "name": habit_id,
+        "reminder_enabled": True,
+        **fields,
+    }
+
+
+class TestSelectDueHabits:
+    """Tests for select_due_habits."""
+
+    def test_frequency(self):
+        """Test weekday and weekly habits are only due on their days."""
+        habits = [
+            _habit("user-1", "daily", frequency="daily"),
+            _habit("user-1", "weekdays", frequency="weekdays"),
+            _habit("user-1", "weekly", frequency="weekly"),
+            _habit("user-1", "inactive", is_active=False),
+        ]
+
+        assert [h["habit_id"] for h in select_due_habits(habits, MONDAY)] == [
+            "daily",
+            "weekdays",
+            "weekly",
+        ]
+        assert [h["habit_id"] for h in select_due_habits(habits, SATURDAY)] == ["daily"]
+
+
+class TestCurrentReminderSlot:
+    """Tests for current_reminder_slot."""
+
+    def test_local_day_and_slot(self):
+        """Test that the slot is computed in local time."""
+        now = datetime(2024, 1, 15, 15, 7, tzinfo=UTC)
+
+        assert current_reminder_slot(now, 15, 9 * 60) == (date(2024, 1, 16), 0)
+        assert current_reminder_slot(now, 15, 0) == (MONDAY, 15 * 60)
+
+
+class TestEvaluateReminder:
+    """Tests for evaluate_reminder."""
+
+    def test_incomplete_habits(self, habits_client):
+        """Test a reminder is produced for incomplete reminder habits."""
+        habits_client.put_habit(_habit("user-1", "habit-1"))
+        habits_client.put_habit(_habit("user-1", "habit-2"))
+        habits_client.put_habit_log(
+            {
+                "habit_id": "habit-2",
+                "user_id": "user-1",
+                "date": MONDAY.isoformat(),
+                "completed": True,
+            }
+        )
+
+        result, notice = evaluate_reminder(habits_client, "user-1", MONDAY)
+
+        assert result.incomplete_count == 1
+        assert result.total_count == 2
+        assert [h["habit_id"] for h in notice["incomplete_habits"]] == ["habit-1"]
+        assert notice["completed_count"] == 1
+
+    def test_only_given_habits(self, habits_client):
+        """Test that a slot run only reminds about the habits passed in."""
+        habits_client.put_habit(_habit("user-1", "habit-1"))
+        habits_client.put_habit(_habit("user-1", "habit-2"))
+
+        result, notice = evaluate_reminder(
+            habits_client, "user-1", MONDAY, [_habit("user-1", "habit-2")]
+        )
+
+        assert result.total_count == 1
+        assert [h["habit_id"] for h in notice["incomplete_habits"]] == ["habit-2"]
+
+    def test_no_active_habits(self, habits_client):
+        """Test that nothing is sent without active habits."""
+        result, notice = evaluate_reminder(habits_client, "user-1", MONDAY)
+
+        assert result.message == "No active habits found"
+        assert notice is None
+
+
+class TestRunReminders:
+    """Tests for batch reminder runs."""
+
+    def test_per_user_outcomes(self, habits_client):
+        """Test that every user gets an outcome and failures stay isolated."""
+        habits_client.put_habit(_habit("user-1", "habit-1"))
+        habits_client.put_habit(_habit("user-2", "habit-2"))
+
+        with patch(
+            "reminder.deliver_slack_notification", side_effect=[True, False]
+        ) as send:
+            results = asyncio.run(
+                run_reminders(
+                    habits_client,
+                    ["user-1", "user-2", "user-3"],
+                    "https://hooks.example.com/x",
+                    MONDAY,
+                    max_concurrency=1,
+                )
+            )
+
+        assert [(r.user_id, r.status_code, r.success) for r in results] == [
+            ("user-1", 200, True),
+            ("user-2", 500, False),
+            ("user-3", 200, True),
+        ]
+        assert results[2].message == "No active habits found"
+        assert send.call_count == 2
+
+    def test_bounded_concurrency(self, habits_client):
+        """Test that users are evaluated concurrently up to the bound."""
+        lock = threading.Lock()
+        active = peak = 0
+
+        def slow_evaluate(db, user_id, day, habits):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.05)
+            with lock:
+                active -= 1
+            return ReminderResponse(
+                success=True, message="", incomplete_count=0, total_count=0
+            ), None
+
+        with patch("reminder.evaluate_reminder", side_effect=slow_evaluate):
+            results = asyncio.run(
+                run_reminders(
+                    habits_client,
+                    [f"user-{i}" for i in range(8)],
+                    "https://hooks.example.com/x",
+                    MONDAY,
+                    max_concurrency=3,
+                )
+            )
+
+        assert all(r.success for r in results)
+        assert 1 < peak <= 3
+
+    def test_digest(self, habits_client):
+        """Test that a digest run posts one payload for every user."""
+        for i in range(3):
+            habits_client.put_habit(_habit(f"user-{i}", "habit-1"))
+
+        async def run():
+            digest = ReminderDigest(window_seconds=60)
+            return await run_reminders(
+                habits_client,
+                [f"user-{i}" for i in range(4)],
+                "https://hooks.example.com/x",
+                MONDAY,
+                max_concurrency=2,
+                digest=digest,
+            )
+
+        with (
+            patch("slack_notifier.deliver_slack_payload", return_value=True) as send,
+            patch("reminder.deliver_slack_notification") as send_single,
+        ):
+            results = asyncio.run(run())
+
+        assert all(r.success for r in results)
+        assert [r.incomplete_count for r in results] == [1, 1, 1, 0]
+        send.assert_called_once()
+        send_single.assert_not_called()
+        blocks = send.call_args.args[1]["blocks"]
+        assert len(blocks) == 2 + 3
@@ -0,0 +1,240 @@
+"""Tests for Slack delivery against a local HTTP stand-in."""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+from slack_notifier import (
+    SLACK_MAX_BLOCKS,
+    SLACK_MAX_PAYLOAD_BYTES,
+    SLACK_MAX_SECTION_TEXT,
+    ReminderDigest,
+    SlackDeliveryPool,
+    format_reminder_digest,
+)
+
+
+class StubSlackHandler(BaseHTTPRequestHandler):
+    """Webhook stand-in that replays scripted responses."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self) -> None:
+        server = self.server
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        with server.lock:
+            server.payloads.append(json.loads(body))
+            server.connections.add(self.client_address)
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+            status, headers = server.script.pop(0) if server.script else (200, {})
+        time.sleep(server.latency)
+        with server.lock:
+            server.active -= 1
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+@pytest.fixture
+def slack_server():
+    """Run a local webhook stand-in for the duration of a test."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubSlackHandler)
+    server.lock = threading.Lock()
+    server.payloads = []
+    server.connections = set()
+    server.script = []
+    server.latency = 0.0
+    server.active = server.peak = 0
+    server.url = f"http://127.0.0.1:{server.server_port}/services/T/B/x"
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+    )
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _pool(**kwargs) -> SlackDeliveryPool:
+    return SlackDeliveryPool(
+        **{
+            "min_interval_seconds": 0,
+            "backoff_base_seconds": 0.01,
+            **kwargs,
+        }
+    )
+
+
+class TestSlackDeliveryPool:
+    """Tests for SlackDeliveryPool."""
+
+    async def test_reuses_connection(self, slack_server):
+        """Test that sequential messages share one keep-alive connection."""
+        pool = _pool()
+
+        for i in range(3):
+            assert await pool.send(slack_server.url, {"text": f"m{i}"})
+        pool.close()
+
+        assert [p["text"] for p in slack_server.payloads] == ["m0", "m1", "m2"]
+        assert len(slack_server.connections) == 1
+
+    async def test_honours_retry_after(self, slack_server):
+        """Test that 429 waits for Retry-After before retrying."""
+        slack_server.script = [(429, {"Retry-After": "0.2"})]
+        pool = _pool()
+
+        started = time.monotonic()
+        assert await pool.send(slack_server.url, {"text": "m"})
+        pool.close()
+
+        assert time.monotonic() - started >= 0.2
+        assert len(slack_server.payloads) == 2
+
+    async def test_gives_up_on_long_retry_after(self, slack_server):
+        """Test that a Retry-After beyond the budget is not waited for."""
+        slack_server.script = [(429, {"Retry-After": "60"})]
+        pool = _pool(max_retry_after_seconds=1)
+
+        assert await pool.send(slack_server.url, {"text": "m"}) is False
+        pool.close()
+
+    async def test_retries_server_errors(self, slack_server):
+        """Test that 5xx responses are retried up to max_attempts."""
+        slack_server.script = [(500, {}), (503, {})]
+        pool = _pool(max_attempts=3)
+
+        assert await pool.send(slack_server.url, {"text": "m"})
+        pool.close()
+
+        assert len(slack_server.payloads) == 3
+
+    async def test_client_errors_not_retried(self, slack_server):
+        """Test that 4xx responses fail without retrying."""
+        slack_server.script = [(404, {})]
+        pool = _pool()
+
+        assert await pool.send(slack_server.url, {"text": "m"}) is False
+        pool.close()
+
+        assert len(slack_server.payloads) == 1
+
+    async def test_connection_errors_retried(self):
+        """Test that an unreachable webhook fails after max_attempts."""
+        pool = _pool(max_attempts=2, timeout_seconds=1)
+
+        assert await pool.send("http://127.0.0.1:9/hook", {"text": "m"}) is False
+        pool.close()
+
+    async def test_rate_limits_per_webhook(self, slack_server):
+        """Test that posts to one webhook are spaced by min_interval_seconds."""
+        pool = _pool(min_interval_seconds=0.1)
+
+        started = time.monotonic()
+        results = await asyncio.gather(
+            *(pool.send(slack_server.url, {"text": f"m{i}"}) for i in range(3))
+        )
+        pool.close()
+
+        assert all(results)
+        assert time.monotonic() - started >= 0.2
+
+    async def test_bounded_concurrency(self, slack_server):
+        """Test that in-flight requests never exceed max_connections."""
+        slack_server.latency = 0.05
+        pool = _pool(max_connections=2)
+
+        results = await asyncio.gather(
+            *(pool.send(slack_server.url, {"text": f"m{i}"}) for i in range(6))
+        )
+        pool.close()
+
+        assert all(results)
+        assert slack_server.peak == 2
+        assert len(slack_server.connections) == 2
+
+
+def _entry(user_id: str, habits: int = 2) -> dict:
+    return {
+        "user_id": user_id,
+        "incomplete_habits": [
+            {"name": f"Habit {i}", "reminder_time": "07:00"} for i in range(habits)
+        ],
+        "total_habits": habits + 1,
+        "completed_count": 1,
+    }
+
+
+class TestFormatReminderDigest:
+    """Tests for format_reminder_digest."""
+
+    def test_single_payload(self):
+        """Test that a small digest is one message with a section per user."""
+        [(payload, indices)] = format_reminder_digest([_entry("u1"), _entry("u2")])
+
+        assert indices == [0, 1]
+        assert len(payload["blocks"]) == 4
+        assert "u2" in payload["blocks"][3]["text"]["text"]
+        assert payload["text"]
+
+    def test_splits_under_limits(self):
+        """Test that large digests are split by block count and size."""
+        entries = [_entry(f"user-{i}", habits=i % 40) for i in range(150)]
+
+        payloads = format_reminder_digest(entries)
+
+        assert len(payloads) > 1
+        assert [i for _, indices in payloads for i in indices] == list(range(150))
+        for payload, _ in payloads:
+            assert len(payload["blocks"]) <= SLACK_MAX_BLOCKS
+            assert len(json.dumps(payload).encode()) <= SLACK_MAX_PAYLOAD_BYTES
+        assert payloads[-1][0]["blocks"][0]["text"]["text"].endswith(
+            f"{len(payloads)}/{len(payloads)}*"
+        )
+
+    def test_truncates_long_sections(self):
+        """Test that one user's section never exceeds Slack's text limit."""
+        [(payload, _)] = format_reminder_digest([_entry("u1", habits=500)])
+
+        assert len(payload["blocks"][2]["text"]["text"]) == SLACK_MAX_SECTION_TEXT
+
+
+class TestReminderDigest:
+    """Tests for ReminderDigest."""
+
+    async def test_window_flushes_once(self):
+        """Test that reminders within a window share one post."""
+        digest = ReminderDigest(window_seconds=0.05)
+
+        with patch("slack_notifier.deliver_slack_payload", return_value=True) as send:
+            first = digest.add("https://hooks.test/a", _entry("u1"))
+            second = digest.add("https://hooks.test/a", _entry("u2"))
+            other = digest.add("https://hooks.test/b", _entry("u3"))
+
+            assert await asyncio.gather(first, second, other) == [True, True, True]
+
+        assert send.call_count == 2
+
+    async def test_close_flushes_early(self):
+        """Test that close sends without waiting for the window."""
+        digest = ReminderDigest(window_seconds=60)
+
+        with patch("slack_notifier.deliver_slack_payload", return_value=False) as send:
+            delivered = digest.add("https://hooks.test/a", _entry("u1"))
+            await digest.close()
+
+        assert delivered.result() is False
+        send.assert_called_once()
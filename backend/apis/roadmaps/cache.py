@@ -0,0 +1,240 @@
+"""In-process TTL cache for Roadmaps API."""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any, Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """Bounded LRU cache whose entries expire after a time-to-live.
+
+    The cache lives for the lifetime of the process, i.e. one warm Lambda
+    container, and is safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl_seconds: float,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize cache with a size bound and entry lifetime."""
+        self._max_size = max_size
+        self._ttl_seconds = ttl_seconds
+        self._timer = timer
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: K, fresh: Callable[[V], bool] | None = None) -> V | None:
+        """Get a live entry, or None on a miss or expired entry.
+
+        Args:
+            key: Entry key
+            fresh: Optional check of the cached value; a value failing it is
+                dropped and counted as a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if (
+                entry is None
+                or entry[0] <= self._timer()
+                or (fresh is not None and not fresh(entry[1]))
+            ):
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: K, value: V) -> None:
+        """Store an entry, evicting the least recently used one when full."""
+        if self._max_size <= 0 or self._ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (self._timer() + self._ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: K) -> None:
+        """Drop an entry if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict[str, int]:
+        """Get hit/miss/eviction counters and the current size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+            }
+
+
+# A cached partition: the change counter it was read under (None if the
+# reader did not know it) and every item in it
+Partition = tuple[int | None, list[dict[str, Any]]]
+
+
+class CachedClient:
+    """Read-through cache of whole partitions in front of a table client.
+
+    query and get_item are answered from the cached partition; put_item,
+    update_item and delete_item invalidate it once the write has landed.
+    A projected query with no cached partition is sent to the table with its
+    ProjectionExpression and not cached. Everything else goes straight to
+    the wrapped client.
+
+    A partition read is only cached if no write to it was invalidated while
+    the read was in flight, so a read racing a local write cannot put the
+    older items back. Writes made by other containers are seen once an entry
+    expires, so the cache TTL is the staleness budget. Readers that know the
+    partition's change counter pass it as version and never get older items.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        cache: TTLCache[str, Partition],
+        key_names: tuple[str, str],
+    ) -> None:
+        """Wrap a client whose table has the given (partition, sort) keys.
+
+        Any cache with TTLCache's get, set, invalidate and stats will do.
+        """
+        self._client = client
+        self._cache = cache
+        self._partition_key, self._sort_key = key_names
+        # Partition key -> [reads in flight, invalidation generation]; only
+        # partitions with reads in flight are tracked
+        self._reads: dict[str, list[int]] = {}
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+    def stats(self) -> dict[str, int]:
+        """Get the cache's hit/miss/eviction counters and size."""
+        return self._cache.stats()
+
+    def query(
+        self,
+        key_name: str,
+        key_value: str,
+        projection: list[str] | None = None,
+        version: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """Query all items of a partition, from the cache when possible.
+
+        Args:
+            key_name: Partition key attribute
+            key_value: Partition key value
+            projection: Attributes to return, defaults to all
+            version: The partition's current change counter; an entry read
+                under another counter is not used
+        """
+        entry = self._cached(key_value, version)
+        if entry is None:
+            if projection:
+                return self._client.query(key_name, key_value, projection)
+            entry = self._read_partition(key_name, key_value, version)
+        items = entry[1]
+        if not projection:
+            return list(items)
+        return [
+            {name: item[name] for name in projection if name in item} for item in items
+        ]
+
+    def get_item(
+        self, key: dict[str, Any], version: int | None = None
+    ) -> dict[str, Any] | None:
+        """Get a single item, from its cached partition when there is one.
+
+        Args:
+            key: Primary key of the item
+            version: The partition's current change counter; an entry read
+                under another counter is not used
+        """
+        entry = self._cached(key[self._partition_key], version)
+        if entry is None:
+            return self._client.get_item(key)
+        sort_value = key[self._sort_key]
+        return next(
+            (item for item in entry[1] if item[self._sort_key] == sort_value), None
+        )
+
+    def put_item(self, item: dict[str, Any]) -> None:
+        """Put an item and drop its cached partition."""
+        try:
+            self._client.put_item(item)
+        finally:
+            self._invalidate(item[self._partition_key])
+
+    def update_item(
+        self, key: dict[str, Any], updates: dict[str, Any]
+    ) -> dict[str, Any] | None:
+        """Update an item and drop its cached partition."""
+        try:
+            return self._client.update_item(key, updates)
+        finally:
+            self._invalidate(key[self._partition_key])
+
+    def delete_item(self, key: dict[str, Any]) -> bool:
+        """Delete an item and drop its cached partition."""
+        try:
+            return self._client.delete_item(key)
+        finally:
+            self._invalidate(key[self._partition_key])
+
+    def _cached(self, key_value: str, version: int | None) -> Partition | None:
+        """Get a cached partition, if any, read under version when given."""
+        return self._cache.get(
+            key_value, None if version is None else lambda e: e[0] == version
+        )
+
+    def _read_partition(
+        self, key_name: str, key_value: str, version: int | None
+    ) -> Partition:
+        """Read a whole partition and cache it unless a write raced the read."""
+        with self._lock:
+            reads = self._reads.setdefault(key_value, [0, 0])
+            reads[0] += 1
+            generation = reads[1]
+        entry: Partition | None = None
+        try:
+            entry = (version, self._client.query(key_name, key_value))
+            return entry
+        finally:
+            with self._lock:
+                # Checked under the lock, so no invalidation slips in before set
+                if entry is not None and reads[1] == generation:
+                    self._cache.set(key_value, entry)
+                reads[0] -= 1
+                if reads[0] == 0:
+                    del self._reads[key_value]
+
+    def _invalidate(self, key_value: str) -> None:
+        """Drop a cached partition and void reads of it still in flight."""
+        with self._lock:
+            reads = self._reads.get(key_value)
+            if reads is not None:
+                reads[1] += 1
+            self._cache.invalidate(key_value)
@@ -1,8 +1,9 @@
 """Data models for Roadmaps API."""
 
 from enum import Enum
+from functools import lru_cache
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, create_model
 
 
 class TimestampMixin(BaseModel):
@@ -52,3 +53,25 @@ class RoadmapResponse(RoadmapBase, TimestampMixin):
 
     milestone_id: str
     goal_id: str
+
+
+@lru_cache(maxsize=64)
+def roadmap_fields_model(fields: tuple[str, ...]) -> type[BaseModel]:
+    """Build a RoadmapResponse variant with only the given fields, for fields=."""
+    return create_model(
+        "RoadmapFieldsResponse",
+        **{
+            name: (
+                RoadmapResponse.model_fields[name].annotation,
+                RoadmapResponse.model_fields[name],
+            )
+            for name in fields
+        },
+    )
+
+
+class RoadmapPageResponse(BaseModel):
+    """One page of milestones; pass next_cursor as cursor to get the next page."""
+
+    items: list[RoadmapResponse]
+    next_cursor: str | None = None
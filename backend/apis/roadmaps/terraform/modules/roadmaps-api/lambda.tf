@@ -11,6 +11,7 @@ resource "aws_lambda_function" "roadmaps" {
   environment {
     variables = {
       ROADMAPS_TABLE_NAME = var.dynamodb_table
+      VERSIONS_TABLE_NAME = var.versions_table
       AWS_REGION          = var.aws_region
       DEBUG               = var.environment == "dev" ? "true" : "false"
     }
@@ -61,9 +62,13 @@ resource "aws_iam_policy" "lambda" {
           "dynamodb:UpdateItem",
           "dynamodb:DeleteItem",
           "dynamodb:Query",
-          "dynamodb:Scan"
+          "dynamodb:Scan",
+          "dynamodb:BatchGetItem"
+        ]
+        Resource = [
+          "arn:aws:dynamodb:${var.aws_region}:${data.aws_caller_identity.current.account_id}:table/${var.dynamodb_table}",
+          "arn:aws:dynamodb:${var.aws_region}:${data.aws_caller_identity.current.account_id}:table/${var.versions_table}"
         ]
-        Resource = "arn:aws:dynamodb:${var.aws_region}:${data.aws_caller_identity.current.account_id}:table/${var.dynamodb_table}"
       }
     ]
   })
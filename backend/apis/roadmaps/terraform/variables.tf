@@ -39,3 +39,9 @@ variable "dynamodb_table" {
   type        = string
   default     = "personal-growth-tracker-roadmaps"
 }
+
+variable "versions_table" {
+  description = "DynamoDB per-goal change counter table name"
+  type        = string
+  default     = "personal-growth-tracker-versions"
+}
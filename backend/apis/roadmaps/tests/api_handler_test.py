@@ -1,5 +1,6 @@
 """Tests for Roadmaps API handler."""
 
+from decimal import Decimal
 from unittest.mock import patch
 
 import pytest
@@ -45,6 +46,23 @@ class TestListRoadmaps:
         assert len(data) == 1
         assert data[0]["title"] == "Setup environment"
 
+    def test_list_roadmaps_decimal_numbers(self, client, mock_dynamodb):
+        """Test that DynamoDB Decimal numbers are rendered as JSON integers."""
+        mock_dynamodb.query.return_value = [
+            {
+                "goal_id": "goal-1",
+                "milestone_id": "milestone-1",
+                "title": "Setup",
+                "order": Decimal("1"),
+            }
+        ]
+
+        response = client.get("/api/v1/roadmaps?goal_id=goal-1")
+
+        assert response.status_code == 200
+        assert response.json()[0]["order"] == 1
+        assert b'"order":1' in response.content
+
     def test_list_roadmaps_empty(self, client, mock_dynamodb):
         """Test empty roadmap list."""
         mock_dynamodb.query.return_value = []
@@ -54,6 +72,174 @@ class TestListRoadmaps:
         assert response.status_code == 200
         assert response.json() == []
 
+    def test_list_roadmaps_by_ids(self, client, mock_dynamodb):
+        """Test that ids are fetched in one batch and returned in order."""
+        mock_dynamodb.batch_get.return_value = [
+            {
+                "goal_id": "goal-1",
+                "milestone_id": milestone_id,
+                "title": "Setup",
+                "status": "completed",
+                "order": 1,
+                "created_at": "2024-01-01T00:00:00Z",
+                "updated_at": "2024-01-01T00:00:00Z",
+            }
+            for milestone_id in ("milestone-2", "milestone-1")
+        ]
+
+        response = client.get(
+            "/api/v1/roadmaps?goal_id=goal-1&ids=milestone-1,milestone-2,missing,milestone-1"
+        )
+
+        assert response.status_code == 200
+        assert [item["milestone_id"] for item in response.json()] == [
+            "milestone-1",
+            "milestone-2",
+        ]
+        [keys] = mock_dynamodb.batch_get.call_args.args
+        assert keys == [
+            {"goal_id": "goal-1", "milestone_id": "milestone-1"},
+            {"goal_id": "goal-1", "milestone_id": "milestone-2"},
+            {"goal_id": "goal-1", "milestone_id": "missing"},
+        ]
+        mock_dynamodb.query.assert_not_called()
+
+    @pytest.mark.parametrize("ids", [",", ",".join(str(i) for i in range(501))])
+    def test_list_roadmaps_by_ids_invalid(self, client, mock_dynamodb, ids):
+        """Test that empty and oversized id lists are rejected."""
+        response = client.get(f"/api/v1/roadmaps?goal_id=goal-1&ids={ids}")
+
+        assert response.status_code == 422
+        mock_dynamodb.batch_get.assert_not_called()
+
+    def test_list_roadmaps_page(self, client, mock_dynamodb):
+        """Test that limit returns one page and a cursor for the next."""
+        mock_dynamodb.query_page.return_value = (
+            [
+                {
+                    "goal_id": "goal-1",
+                    "milestone_id": "milestone-1",
+                    "title": "Setup environment",
+                    "status": "completed",
+                    "order": 1,
+                    "created_at": "2024-01-01T00:00:00Z",
+                    "updated_at": "2024-01-01T00:00:00Z",
+                }
+            ],
+            {"goal_id": "goal-1", "milestone_id": "milestone-1"},
+        )
+
+        response = client.get("/api/v1/roadmaps?goal_id=goal-1&limit=1")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [item["milestone_id"] for item in data["items"]] == ["milestone-1"]
+        mock_dynamodb.query_page.assert_called_once_with(
+            "goal_id", "goal-1", 1, None, None
+        )
+
+        mock_dynamodb.query_page.return_value = ([], None)
+        response = client.get(
+            f"/api/v1/roadmaps?goal_id=goal-1&cursor={data['next_cursor']}"
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"items": [], "next_cursor": None}
+        mock_dynamodb.query_page.assert_called_with(
+            "goal_id",
+            "goal-1",
+            50,
+            {"goal_id": "goal-1", "milestone_id": "milestone-1"},
+            None,
+        )
+        mock_dynamodb.query.assert_not_called()
+
+    @pytest.mark.parametrize(
+        "params",
+        ["cursor=garbage", "limit=0", "limit=101", "ids=milestone-1&limit=10"],
+    )
+    def test_list_roadmaps_page_invalid(self, client, mock_dynamodb, params):
+        """Test that bad cursors, limits and ids with paging are rejected."""
+        response = client.get(f"/api/v1/roadmaps?goal_id=goal-1&{params}")
+
+        assert response.status_code == 422
+        mock_dynamodb.query_page.assert_not_called()
+
+    def test_list_roadmaps_fields(self, client, mock_dynamodb):
+        """Test that fields becomes a projection and trims the response."""
+        mock_dynamodb.query.return_value = [
+            {"goal_id": "goal-1", "milestone_id": "milestone-1", "order": 1}
+        ]
+
+        response = client.get("/api/v1/roadmaps?goal_id=goal-1&fields=order")
+
+        assert response.status_code == 200
+        assert response.json() == [
+            {"goal_id": "goal-1", "milestone_id": "milestone-1", "order": 1}
+        ]
+        [_, _, projection] = mock_dynamodb.query.call_args.args
+        assert sorted(projection) == sorted(["goal_id", "milestone_id", "order"])
+
+    def test_list_roadmaps_unknown_fields(self, client, mock_dynamodb):
+        """Test that fields outside the response model are rejected."""
+        response = client.get("/api/v1/roadmaps?goal_id=goal-1&fields=order,secret")
+
+        assert response.status_code == 422
+        assert response.json()["detail"] == "Unknown fields: secret"
+        mock_dynamodb.query.assert_not_called()
+
+    def test_list_roadmaps_not_modified(self, client, mock_dynamodb):
+        """Test that a matching If-None-Match is answered from the counter."""
+        mock_dynamodb.get_version.return_value = 3
+        mock_dynamodb.query.return_value = [
+            {
+                "goal_id": "goal-1",
+                "milestone_id": "milestone-1",
+                "title": "Setup",
+                "updated_at": "2024-01-01",
+            }
+        ]
+
+        response = client.get("/api/v1/roadmaps?goal_id=goal-1")
+        etag = response.headers["ETag"]
+
+        assert etag.startswith('W/"')
+        assert response.headers["Cache-Control"] == "private, no-cache"
+
+        mock_dynamodb.query.reset_mock()
+        response = client.get(
+            "/api/v1/roadmaps?goal_id=goal-1", headers={"If-None-Match": etag}
+        )
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["ETag"] == etag
+        mock_dynamodb.query.assert_not_called()
+        mock_dynamodb.get_version.assert_called_with("goal-1")
+
+    def test_list_roadmaps_modified(self, client, mock_dynamodb):
+        """Test that a stale If-None-Match gets the full list and a new ETag."""
+        mock_dynamodb.get_version.return_value = 3
+        mock_dynamodb.query.return_value = [
+            {
+                "goal_id": "goal-1",
+                "milestone_id": "milestone-1",
+                "title": "Setup",
+                "updated_at": "2024-01-01",
+            }
+        ]
+        etag = client.get("/api/v1/roadmaps?goal_id=goal-1").headers["ETag"]
+
+        mock_dynamodb.get_version.return_value = 4
+        response = client.get(
+            "/api/v1/roadmaps?goal_id=goal-1", headers={"If-None-Match": etag}
+        )
+
+        assert response.status_code == 200
+        assert response.json()[0]["milestone_id"] == "milestone-1"
+        assert response.headers["ETag"] != etag
+        assert mock_dynamodb.query.call_args.kwargs == {"version": 4}
+
 
 class TestGetRoadmap:
     """Tests for get roadmap endpoint."""
@@ -83,6 +269,24 @@ class TestGetRoadmap:
 
         assert response.status_code == 404
 
+    def test_get_roadmap_not_modified(self, client, mock_dynamodb):
+        """Test that a matching If-None-Match gets an empty 304."""
+        mock_dynamodb.get_item.return_value = {
+            "goal_id": "goal-1",
+            "milestone_id": "milestone-1",
+            "title": "Setup",
+            "updated_at": "2024-01-01",
+        }
+        etag = client.get("/api/v1/roadmaps/milestone-1?goal_id=goal-1").headers["ETag"]
+
+        response = client.get(
+            "/api/v1/roadmaps/milestone-1?goal_id=goal-1",
+            headers={"If-None-Match": f'W/"x", {etag}'},
+        )
+
+        assert response.status_code == 304
+        assert response.content == b""
+
 
 class TestCreateRoadmap:
     """Tests for create roadmap endpoint."""
@@ -119,7 +323,7 @@ class TestUpdateRoadmap:
 
     def test_update_roadmap_success(self, client, mock_dynamodb):
         """Test successful roadmap update."""
-        mock_dynamodb.get_item.return_value = {
+        existing = {
             "goal_id": "goal-1",
             "milestone_id": "milestone-1",
             "title": "Setup environment",
@@ -128,6 +332,10 @@ class TestUpdateRoadmap:
             "created_at": "2024-01-01T00:00:00Z",
             "updated_at": "2024-01-01T00:00:00Z",
         }
+        mock_dynamodb.update_item.side_effect = lambda key, updates: {
+            **existing,
+            **updates,
+        }
 
         response = client.put(
             "/api/v1/roadmaps/milestone-1?goal_id=goal-1",
@@ -139,7 +347,7 @@ class TestUpdateRoadmap:
 
     def test_update_roadmap_not_found(self, client, mock_dynamodb):
         """Test update non-existent roadmap."""
-        mock_dynamodb.get_item.return_value = None
+        mock_dynamodb.update_item.return_value = None
 
         response = client.put(
             "/api/v1/roadmaps/nonexistent?goal_id=goal-1",
@@ -154,20 +362,15 @@ class TestDeleteRoadmap:
 
     def test_delete_roadmap_success(self, client, mock_dynamodb):
         """Test successful roadmap deletion."""
-        mock_dynamodb.get_item.return_value = {
-            "goal_id": "goal-1",
-            "milestone_id": "milestone-1",
-            "title": "Setup environment",
-        }
-
         response = client.delete("/api/v1/roadmaps/milestone-1?goal_id=goal-1")
 
         assert response.status_code == 204
         mock_dynamodb.delete_item.assert_called_once()
+        mock_dynamodb.get_item.assert_not_called()
 
     def test_delete_roadmap_not_found(self, client, mock_dynamodb):
         """Test delete non-existent roadmap."""
-        mock_dynamodb.get_item.return_value = None
+        mock_dynamodb.delete_item.return_value = False
 
         response = client.delete("/api/v1/roadmaps/nonexistent?goal_id=goal-1")
 
@@ -28,11 +28,31 @@ def dynamodb_table():
         yield table
 
 
+@pytest.fixture
+def versions_table(dynamodb_table):
+    """Create the mock versions table next to the service table."""
+    dynamodb = boto3.resource("dynamodb", region_name="ap-northeast-1")
+    table = dynamodb.create_table(
+        TableName="personal-growth-tracker-versions",
+        KeySchema=[
+            {"AttributeName": "owner_id", "KeyType": "HASH"},
+            {"AttributeName": "scope", "KeyType": "RANGE"},
+        ],
+        AttributeDefinitions=[
+            {"AttributeName": "owner_id", "AttributeType": "S"},
+            {"AttributeName": "scope", "AttributeType": "S"},
+        ],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    table.wait_until_exists()
+    return table
+
+
 class TestRoadmapsClient:
     """Tests for RoadmapsClient."""
 
     @mock_aws
-    def test_put_and_get_item(self, dynamodb_table):
+    def test_put_and_get_item(self, versions_table):
         """Test putting and getting an item."""
         from client import RoadmapsClient
 
@@ -41,6 +61,9 @@ class TestRoadmapsClient:
             mock_settings.return_value.roadmaps_table_name = (
                 "personal-growth-tracker-roadmaps"
             )
+            mock_settings.return_value.versions_table_name = (
+                "personal-growth-tracker-versions"
+            )
 
             client = RoadmapsClient()
             item = {
@@ -56,7 +79,7 @@ class TestRoadmapsClient:
             assert result["title"] == "Setup environment"
 
     @mock_aws
-    def test_delete_item(self, dynamodb_table):
+    def test_delete_item(self, versions_table):
         """Test deleting an item."""
         from client import RoadmapsClient
 
@@ -65,6 +88,9 @@ class TestRoadmapsClient:
             mock_settings.return_value.roadmaps_table_name = (
                 "personal-growth-tracker-roadmaps"
             )
+            mock_settings.return_value.versions_table_name = (
+                "personal-growth-tracker-versions"
+            )
 
             client = RoadmapsClient()
             item = {
@@ -81,7 +107,28 @@ class TestRoadmapsClient:
             assert result is None
 
     @mock_aws
-    def test_query(self, dynamodb_table):
+    def test_delete_item_not_found(self, versions_table):
+        """Test deleting a missing item reports it as not found."""
+        from client import RoadmapsClient
+
+        with patch("client.get_settings") as mock_settings:
+            mock_settings.return_value.aws_region = "ap-northeast-1"
+            mock_settings.return_value.roadmaps_table_name = (
+                "personal-growth-tracker-roadmaps"
+            )
+            mock_settings.return_value.versions_table_name = (
+                "personal-growth-tracker-versions"
+            )
+
+            client = RoadmapsClient()
+
+            assert (
+                client.delete_item({"goal_id": "goal-1", "milestone_id": "missing"})
+                is False
+            )
+
+    @mock_aws
+    def test_query(self, versions_table):
         """Test querying items by partition key."""
         from client import RoadmapsClient
 
@@ -90,6 +137,9 @@ class TestRoadmapsClient:
             mock_settings.return_value.roadmaps_table_name = (
                 "personal-growth-tracker-roadmaps"
             )
+            mock_settings.return_value.versions_table_name = (
+                "personal-growth-tracker-versions"
+            )
 
             client = RoadmapsClient()
             client.put_item(
@@ -104,3 +154,251 @@ class TestRoadmapsClient:
 
             results = client.query("goal_id", "goal-1")
             assert len(results) == 2
+
+    @mock_aws
+    def test_update_item(self, versions_table):
+        """Test updating an existing item in place."""
+        from client import RoadmapsClient
+
+        with patch("client.get_settings") as mock_settings:
+            mock_settings.return_value.aws_region = "ap-northeast-1"
+            mock_settings.return_value.roadmaps_table_name = (
+                "personal-growth-tracker-roadmaps"
+            )
+            mock_settings.return_value.versions_table_name = (
+                "personal-growth-tracker-versions"
+            )
+
+            client = RoadmapsClient()
+            client.put_item(
+                {
+                    "goal_id": "goal-1",
+                    "milestone_id": "milestone-1",
+                    "title": "Milestone 1",
+                }
+            )
+
+            key = {"goal_id": "goal-1", "milestone_id": "milestone-1"}
+            result = client.update_item(key, {"title": "Updated"})
+
+            assert result["title"] == "Updated"
+            assert client.get_item(key)["title"] == "Updated"
+
+    @mock_aws
+    def test_update_item_not_found(self, versions_table):
+        """Test updating a missing item does not create it."""
+        from client import RoadmapsClient
+
+        with patch("client.get_settings") as mock_settings:
+            mock_settings.return_value.aws_region = "ap-northeast-1"
+            mock_settings.return_value.roadmaps_table_name = (
+                "personal-growth-tracker-roadmaps"
+            )
+            mock_settings.return_value.versions_table_name = (
+                "personal-growth-tracker-versions"
+            )
+
+            client = RoadmapsClient()
+            key = {"goal_id": "goal-1", "milestone_id": "missing"}
+
+            assert client.update_item(key, {"title": "Updated"}) is None
+            assert client.get_item(key) is None
+
+    @mock_aws
+    def test_batch_get(self, dynamodb_table):
+        """Test that many keys are fetched across chunks with a projection."""
+        from client import RoadmapsClient
+
+        with dynamodb_table.batch_writer() as batch:
+            for i in range(150):
+                batch.put_item(
+                    Item={
+                        "goal_id": "goal-1",
+                        "milestone_id": f"milestone-{i}",
+                        "title": f"T{i}",
+                    }
+                )
+
+        with patch("client.get_settings") as mock_settings:
+            mock_settings.return_value.aws_region = "ap-northeast-1"
+            client = RoadmapsClient("personal-growth-tracker-roadmaps")
+            keys = [
+                {"goal_id": "goal-1", "milestone_id": f"milestone-{i}"}
+                for i in range(150)
+            ]
+
+            items = client.batch_get(
+                [*keys, keys[0], {"goal_id": "goal-1", "milestone_id": "missing"}],
+                projection=["milestone_id"],
+            )
+
+        assert len(items) == 150
+        assert all(item.keys() == {"milestone_id"} for item in items)
+
+    @mock_aws
+    def test_query_follows_pages(self, dynamodb_table):
+        """Test that query keeps reading until there is no LastEvaluatedKey."""
+        from client import RoadmapsClient
+
+        with patch("client.get_settings") as mock_settings:
+            mock_settings.return_value.aws_region = "ap-northeast-1"
+            client = RoadmapsClient("personal-growth-tracker-roadmaps")
+            last_key = {"goal_id": "goal-1", "milestone_id": "milestone-1"}
+            with patch.object(
+                client,
+                "query_page",
+                side_effect=[
+                    ([{"milestone_id": "milestone-1"}], last_key),
+                    ([{"milestone_id": "milestone-2"}], None),
+                ],
+            ) as query_page:
+                results = client.query("goal_id", "goal-1")
+
+        assert [item["milestone_id"] for item in results] == [
+            "milestone-1",
+            "milestone-2",
+        ]
+        assert query_page.call_args.args == ("goal_id", "goal-1", None, last_key, None)
+
+    @mock_aws
+    def test_query_projection(self, dynamodb_table):
+        """Test that a projection returns only the named attributes."""
+        from client import RoadmapsClient
+
+        dynamodb_table.put_item(
+            Item={
+                "goal_id": "goal-1",
+                "milestone_id": "milestone-1",
+                "order": 1,
+                "description": "Long text",
+            }
+        )
+
+        with patch("client.get_settings") as mock_settings:
+            mock_settings.return_value.aws_region = "ap-northeast-1"
+            client = RoadmapsClient("personal-growth-tracker-roadmaps")
+            items = client.query("goal_id", "goal-1", ["milestone_id", "order"])
+
+        assert items == [{"milestone_id": "milestone-1", "order": 1}]
+
+    @mock_aws
+    def test_query_page_cursor_round_trip(self, dynamodb_table):
+        """Test walking every page through encoded cursors."""
+        from client import RoadmapsClient, decode_cursor, encode_cursor
+
+        with dynamodb_table.batch_writer() as batch:
+            for i in range(5):
+                batch.put_item(
+                    Item={"goal_id": "goal-1", "milestone_id": f"milestone-{i}"}
+                )
+
+        with patch("client.get_settings") as mock_settings:
+            mock_settings.return_value.aws_region = "ap-northeast-1"
+            client = RoadmapsClient("personal-growth-tracker-roadmaps")
+            seen, start_key = [], None
+            while True:
+                items, last_key = client.query_page("goal_id", "goal-1", 2, start_key)
+                seen.extend(item["milestone_id"] for item in items)
+                cursor = encode_cursor(last_key)
+                if cursor is None:
+                    break
+                start_key = decode_cursor(
+                    cursor, ("goal_id", "milestone_id"), goal_id="goal-1"
+                )
+
+        assert seen == [f"milestone-{i}" for i in range(5)]
+
+    @pytest.mark.parametrize(
+        "cursor",
+        [
+            "not-a-cursor!",
+            "WzFd",  # A JSON list
+            "eyJnb2FsX2lkIjoiZ29hbC0xIn0",  # No sort key
+        ],
+    )
+    def test_decode_cursor_invalid(self, cursor):
+        """Test that malformed cursors are rejected."""
+        from client import decode_cursor
+
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            decode_cursor(cursor, ("goal_id", "milestone_id"), goal_id="goal-1")
+
+    def test_decode_cursor_other_partition(self):
+        """Test that a cursor cannot continue another partition's query."""
+        from client import decode_cursor, encode_cursor
+
+        cursor = encode_cursor({"goal_id": "goal-2", "milestone_id": "milestone-1"})
+
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            decode_cursor(cursor, ("goal_id", "milestone_id"), goal_id="goal-1")
+
+    @mock_aws
+    def test_version_counter(self, versions_table):
+        """Test that bumps add up per owner and unwritten owners read as 0."""
+        from client import RoadmapsClient
+
+        with patch("client.get_settings") as mock_settings:
+            mock_settings.return_value.aws_region = "ap-northeast-1"
+            client = RoadmapsClient(
+                "personal-growth-tracker-roadmaps",
+                versions_table_name="personal-growth-tracker-versions",
+            )
+
+            assert client.get_version("goal-1") == 0
+            assert client.bump_version("goal-1") == 1
+            assert client.bump_version("goal-1") == 2
+            assert client.get_version("goal-1") == 2
+            assert client.get_version("other") == 0
+
+        item = versions_table.get_item(Key={"owner_id": "goal-1", "scope": "roadmaps"})[
+            "Item"
+        ]
+        assert item["version"] == 2
+
+    @mock_aws
+    def test_writes_bump_owner_version(self, versions_table):
+        """Test that each landed write bumps its owner's counter once."""
+        from client import RoadmapsClient
+
+        with patch("client.get_settings") as mock_settings:
+            mock_settings.return_value.aws_region = "ap-northeast-1"
+            client = RoadmapsClient(
+                "personal-growth-tracker-roadmaps",
+                versions_table_name="personal-growth-tracker-versions",
+            )
+            key = {"goal_id": "goal-1", "milestone_id": "item-1"}
+            missing = {"goal_id": "goal-1", "milestone_id": "missing"}
+
+            client.put_item({**key, "title": "A"})
+            client.update_item(key, {"title": "B"})
+            client.update_item(missing, {"title": "B"})
+            client.delete_item(key)
+            client.delete_item(missing)
+
+            assert client.get_version("goal-1") == 3
+
+
+class TestClientRegistry:
+    """Tests for the process-wide table registry."""
+
+    def test_clients_share_table(self):
+        """Test that clients for the same table reuse one handle and pool."""
+        from client import RoadmapsClient
+
+        first = RoadmapsClient("registry-test")._table
+        second = RoadmapsClient("registry-test")._table
+
+        assert first is second
+        assert RoadmapsClient("registry-other")._table.meta.client is first.meta.client
+        assert first.meta.client.meta.config.max_pool_connections == 32
+        assert first.meta.client.meta.config.tcp_keepalive is True
+
+    def test_endpoint_is_part_of_key(self):
+        """Test that another endpoint gets its own resource."""
+        from client import get_table
+
+        default = get_table("registry-test", "ap-northeast-1")
+        local = get_table("registry-test", "ap-northeast-1", "http://localhost:8000")
+
+        assert local is not default
+        assert local.meta.client.meta.endpoint_url == "http://localhost:8000"
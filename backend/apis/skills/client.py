@@ -1,20 +1,43 @@
 """DynamoDB client for Skills API."""
 
-from functools import lru_cache
-from typing import Any
+import asyncio
+import base64
+import json
+import random
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, lru_cache, partial
+from typing import Any, TypeVar
 
 import boto3
 from boto3.dynamodb.conditions import Key
+from botocore.config import Config
+from botocore.exceptions import ClientError
 from pydantic_settings import BaseSettings
 
+T = TypeVar("T")
+
 
 class Settings(BaseSettings):
     """Skills API settings."""
 
     aws_region: str = "ap-northeast-1"
     skills_table_name: str = "personal-growth-tracker-skills"
+    # Shared by every API; holds one change counter per (owner_id, scope)
+    versions_table_name: str = "personal-growth-tracker-versions"
     debug: bool = False
     cors_origins: list[str] = ["*"]
+    # Threads available for blocking DynamoDB calls made from async handlers
+    db_max_workers: int = 16
+    # Render responses with orjson when it is installed (optional dependency)
+    orjson_responses: bool = False
+    # Whole partitions cached per warm container; writes here invalidate them,
+    # writes made by other containers go unseen for up to the TTL (the
+    # staleness budget, 0 disables the cache). Lists check the change counter.
+    partition_cache_ttl_seconds: float = 5.0
+    partition_cache_max_size: int = 256
 
     class Config:
         env_prefix = ""
@@ -27,14 +50,241 @@ def get_settings() -> Settings:
     return Settings()
 
 
+@lru_cache
+def get_executor() -> ThreadPoolExecutor:
+    """Get the bounded thread pool that runs blocking DynamoDB calls."""
+    return ThreadPoolExecutor(
+        max_workers=get_settings().db_max_workers, thread_name_prefix="dynamodb"
+    )
+
+
+async def run_sync(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking client call on the bounded executor.
+
+    Keeps boto3 I/O off the event loop, so one slow DynamoDB request does not
+    stall the other requests served by the same worker.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), partial(func, *args, **kwargs))
+
+
+# Shared by every client in the process: one resource per (region, endpoint)
+# keeps one botocore session and HTTP connection pool per DynamoDB endpoint.
+# The pool is sized above db_max_workers so executor threads never wait for a
+# connection.
+DYNAMODB_CONFIG = Config(
+    max_pool_connections=32,
+    tcp_keepalive=True,
+    retries={"mode": "standard", "max_attempts": 3},
+)
+
+_registry_lock = threading.Lock()
+_resources: dict[tuple[str, str | None], Any] = {}
+_tables: dict[tuple[str, str | None, str], Any] = {}
+
+
+def get_dynamodb_resource(region: str, endpoint_url: str | None = None) -> Any:
+    """Get the process-wide DynamoDB resource for a region and endpoint."""
+    key = (region, endpoint_url)
+    resource = _resources.get(key)
+    if resource is None:
+        with _registry_lock:
+            resource = _resources.get(key)
+            if resource is None:
+                # A dedicated session, since the default boto3 session is not
+                # thread-safe and the first call may come from any thread
+                resource = boto3.session.Session().resource(
+                    "dynamodb",
+                    region_name=region,
+                    endpoint_url=endpoint_url,
+                    config=DYNAMODB_CONFIG,
+                )
+                _resources[key] = resource
+    return resource
+
+
+def get_table(table_name: str, region: str, endpoint_url: str | None = None) -> Any:
+    """Get the process-wide Table for (region, endpoint, table)."""
+    key = (region, endpoint_url, table_name)
+    table = _tables.get(key)
+    if table is None:
+        table = get_dynamodb_resource(region, endpoint_url).Table(table_name)
+        table = _tables.setdefault(key, table)
+    return table
+
+
+# Scope of this API's counters in the versions table
+VERSION_SCOPE = "skills"
+# Partition key whose value owns a counter; every write bumps its owner's
+VERSION_OWNER_KEY = "user_id"
+
+# BatchGetItem accepts at most 100 keys per request
+BATCH_GET_CHUNK_SIZE = 100
+BATCH_GET_MAX_WORKERS = 4
+BATCH_GET_MAX_ATTEMPTS = 8
+BATCH_GET_BACKOFF_BASE_SECONDS = 0.05
+BATCH_GET_BACKOFF_MAX_SECONDS = 2.0
+
+
+def batch_get_with_retry(
+    client: Any, table_name: str, keys: list[dict[str, Any]], **kwargs: Any
+) -> list[dict[str, Any]]:
+    """Read up to BATCH_GET_CHUNK_SIZE keys, re-requesting unprocessed ones.
+
+    Args:
+        client: DynamoDB client (e.g. a table's meta.client)
+        table_name: Table the keys belong to
+        keys: At most BATCH_GET_CHUNK_SIZE primary keys
+        **kwargs: Extra per-table options, e.g. ProjectionExpression
+
+    Returns:
+        The items found, in no particular order
+
+    Raises:
+        RuntimeError: If keys are still unprocessed after all attempts
+    """
+    request_items = {table_name: {"Keys": keys, **kwargs}}
+    items: list[dict[str, Any]] = []
+    for attempt in range(BATCH_GET_MAX_ATTEMPTS):
+        response = client.batch_get_item(RequestItems=request_items)
+        items.extend(response["Responses"].get(table_name, []))
+        request_items = response.get("UnprocessedKeys")
+        if not request_items:
+            return items
+        if attempt < BATCH_GET_MAX_ATTEMPTS - 1:
+            # Exponential backoff with full jitter
+            backoff = min(
+                BATCH_GET_BACKOFF_BASE_SECONDS * 2**attempt,
+                BATCH_GET_BACKOFF_MAX_SECONDS,
+            )
+            time.sleep(random.uniform(0, backoff))
+    unprocessed = len(request_items[table_name]["Keys"])
+    raise RuntimeError(
+        f"BatchGetItem left {unprocessed} unprocessed keys in {table_name}"
+    )
+
+
+def projection_expression(projection: Iterable[str] | None) -> dict[str, Any]:
+    """Build ProjectionExpression arguments with every name aliased.
+
+    Aliases keep reserved words such as "name", "level" and "order" usable.
+
+    Returns:
+        Keyword arguments for query or BatchGetItem, empty for all attributes
+    """
+    if not projection:
+        return {}
+    names = {f"#p{i}": name for i, name in enumerate(projection)}
+    return {"ProjectionExpression": ", ".join(names), "ExpressionAttributeNames": names}
+
+
+def batch_get_items(
+    client: Any,
+    table_name: str,
+    keys: Iterable[dict[str, Any]],
+    projection: Iterable[str] | None = None,
+) -> list[dict[str, Any]]:
+    """Get many items by key, fetching BatchGetItem chunks concurrently.
+
+    Args:
+        client: DynamoDB client (e.g. a table's meta.client)
+        table_name: Table the keys belong to
+        keys: Primary keys; duplicates are fetched once
+        projection: Attributes to return, defaults to all
+
+    Returns:
+        The items found, in no particular order
+    """
+    unique_keys = list({tuple(sorted(key.items())): key for key in keys}.values())
+    options = projection_expression(projection)
+
+    chunks = [
+        unique_keys[i : i + BATCH_GET_CHUNK_SIZE]
+        for i in range(0, len(unique_keys), BATCH_GET_CHUNK_SIZE)
+    ]
+    if len(chunks) <= 1:
+        return [
+            item
+            for chunk in chunks
+            for item in batch_get_with_retry(client, table_name, chunk, **options)
+        ]
+    with ThreadPoolExecutor(
+        max_workers=min(BATCH_GET_MAX_WORKERS, len(chunks))
+    ) as executor:
+        results = executor.map(
+            lambda chunk: batch_get_with_retry(client, table_name, chunk, **options),
+            chunks,
+        )
+        return [item for items in results for item in items]
+
+
+def encode_cursor(key: dict[str, Any] | None) -> str | None:
+    """Encode a LastEvaluatedKey as an opaque, URL-safe pagination cursor."""
+    if not key:
+        return None
+    raw = json.dumps(key, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(
+    cursor: str, key_names: Iterable[str], **expected: str
+) -> dict[str, Any]:
+    """Decode a cursor made by encode_cursor back into an ExclusiveStartKey.
+
+    Args:
+        cursor: Cursor from a previous page
+        key_names: Attributes of the table's primary key, which a cursor must
+            carry and nothing else
+        **expected: Key attributes the cursor must carry, e.g. the partition
+            being listed, so that a cursor cannot start another user's query
+
+    Raises:
+        ValueError: If the cursor is malformed or does not match expected
+    """
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError as e:
+        raise ValueError("Invalid cursor") from e
+    if (
+        not isinstance(key, dict)
+        or set(key) != set(key_names)
+        or not all(isinstance(value, str) for value in key.values())
+        or any(key.get(name) != value for name, value in expected.items())
+    ):
+        raise ValueError("Invalid cursor")
+    return key
+
+
 class SkillsClient:
     """DynamoDB client for Skills operations."""
 
-    def __init__(self, table_name: str | None = None) -> None:
-        """Initialize client with table name."""
+    def __init__(
+        self,
+        table_name: str | None = None,
+        endpoint_url: str | None = None,
+        versions_table_name: str | None = None,
+    ) -> None:
+        """Initialize client with table name.
+
+        The table comes from the process-wide registry on first use, so
+        building a client is cheap and does not load the DynamoDB service
+        model at import time.
+        """
         settings = get_settings()
-        self._dynamodb = boto3.resource("dynamodb", region_name=settings.aws_region)
-        self._table = self._dynamodb.Table(table_name or settings.skills_table_name)
+        self._region = settings.aws_region
+        self._endpoint_url = endpoint_url
+        self._table_name = table_name or settings.skills_table_name
+        self._versions_table_name = versions_table_name or settings.versions_table_name
+
+    @cached_property
+    def _table(self) -> Any:
+        """DynamoDB table, created on first use."""
+        return get_table(self._table_name, self._region, self._endpoint_url)
+
+    @cached_property
+    def _versions_table(self) -> Any:
+        """Versions table, created on first use."""
+        return get_table(self._versions_table_name, self._region, self._endpoint_url)
 
     def get_item(self, key: dict[str, Any]) -> dict[str, Any] | None:
         """Get a single item by key."""
@@ -42,17 +292,163 @@ class SkillsClient:
         return response.get("Item")
 
     def put_item(self, item: dict[str, Any]) -> None:
-        """Put an item into the table."""
+        """Put an item into the table and bump its owner's change counter."""
         self._table.put_item(Item=item)
+        self.bump_version(item[VERSION_OWNER_KEY])
 
-    def delete_item(self, key: dict[str, Any]) -> None:
-        """Delete an item by key."""
-        self._table.delete_item(Key=key)
+    def update_item(
+        self, key: dict[str, Any], updates: dict[str, Any]
+    ) -> dict[str, Any] | None:
+        """Update attributes of an existing item in a single round trip.
 
-    def query(self, key_name: str, key_value: str) -> list[dict[str, Any]]:
-        """Query items by partition key."""
-        response = self._table.query(KeyConditionExpression=Key(key_name).eq(key_value))
-        return response.get("Items", [])
+        The owner's change counter is bumped once the update has landed.
+
+        Returns:
+            The item after the update, or None if no item exists for the key
+        """
+        names = {"#key": next(iter(key))}
+        values = {}
+        assignments = []
+        for i, (name, value) in enumerate(updates.items()):
+            names[f"#f{i}"] = name
+            values[f":v{i}"] = value
+            assignments.append(f"#f{i} = :v{i}")
+
+        try:
+            response = self._table.update_item(
+                Key=key,
+                UpdateExpression="SET " + ", ".join(assignments),
+                ConditionExpression="attribute_exists(#key)",
+                ExpressionAttributeNames=names,
+                ExpressionAttributeValues=values,
+                ReturnValues="ALL_NEW",
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                return None
+            raise
+        self.bump_version(key[VERSION_OWNER_KEY])
+        return response["Attributes"]
+
+    def delete_item(self, key: dict[str, Any]) -> bool:
+        """Delete an item by key in a single round trip.
+
+        The owner's change counter is bumped once the delete has landed.
+
+        Returns:
+            True if the item was deleted, False if no item exists for the key
+        """
+        try:
+            self._table.delete_item(
+                Key=key,
+                ConditionExpression="attribute_exists(#key)",
+                ExpressionAttributeNames={"#key": next(iter(key))},
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                return False
+            raise
+        self.bump_version(key[VERSION_OWNER_KEY])
+        return True
+
+    def batch_get(
+        self, keys: Iterable[dict[str, Any]], projection: Iterable[str] | None = None
+    ) -> list[dict[str, Any]]:
+        """Get many items by key with BatchGetItem.
+
+        Args:
+            keys: Primary keys; missing items are left out of the result
+            projection: Attributes to return, defaults to all
+
+        Returns:
+            The items found, in no particular order
+        """
+        return batch_get_items(
+            self._table.meta.client, self._table_name, keys, projection
+        )
+
+    def query(
+        self, key_name: str, key_value: str, projection: list[str] | None = None
+    ) -> list[dict[str, Any]]:
+        """Query all items by partition key, following LastEvaluatedKey."""
+        items: list[dict[str, Any]] = []
+        start_key = None
+        while True:
+            page, start_key = self.query_page(
+                key_name, key_value, None, start_key, projection
+            )
+            items.extend(page)
+            if start_key is None:
+                return items
+
+    def query_page(
+        self,
+        key_name: str,
+        key_value: str,
+        limit: int | None,
+        start_key: dict[str, Any] | None = None,
+        projection: list[str] | None = None,
+    ) -> tuple[list[dict[str, Any]], dict[str, Any] | None]:
+        """Query one page of items by partition key.
+
+        Args:
+            key_name: Partition key attribute
+            key_value: Partition key value
+            limit: Maximum number of items evaluated, or None for a full page
+            start_key: LastEvaluatedKey of the previous page
+            projection: Attributes to return, defaults to all
+
+        Returns:
+            The items and the key to continue from, or None after the last page
+        """
+        kwargs: dict[str, Any] = {
+            "KeyConditionExpression": Key(key_name).eq(key_value),
+            **projection_expression(projection),
+        }
+        if limit:
+            kwargs["Limit"] = limit
+        if start_key:
+            kwargs["ExclusiveStartKey"] = start_key
+        response = self._table.query(**kwargs)
+        return response.get("Items", []), response.get("LastEvaluatedKey")
+
+    def get_version(self, owner_id: str) -> int:
+        """Get the change counter of a user's skills with one small GetItem.
+
+        The read is strongly consistent, so a write is visible to the next
+        read of its counter. Read the counter before the data it validates:
+        data read first may predate a write whose bump is then seen.
+
+        Returns:
+            The counter, or 0 if nothing has been written for the user yet
+        """
+        response = self._versions_table.get_item(
+            Key={"owner_id": owner_id, "scope": VERSION_SCOPE},
+            ProjectionExpression="#version",
+            ExpressionAttributeNames={"#version": "version"},
+            ConsistentRead=True,
+        )
+        return int(response.get("Item", {}).get("version", 0))
+
+    def bump_version(self, owner_id: str) -> int:
+        """Atomically increment a user's change counter after a write.
+
+        Called by every write method after its write. If the bump fails, the
+        error is raised even though the write landed, so the request fails
+        and can be retried instead of readers silently validating against a
+        counter that misses the write.
+
+        Returns:
+            The new counter
+        """
+        response = self._versions_table.update_item(
+            Key={"owner_id": owner_id, "scope": VERSION_SCOPE},
+            UpdateExpression="ADD #version :one",
+            ExpressionAttributeNames={"#version": "version"},
+            ExpressionAttributeValues={":one": 1},
+            ReturnValues="UPDATED_NEW",
+        )
+        return int(response["Attributes"]["version"])
 
     def scan(self) -> list[dict[str, Any]]:
         """Scan all items in the table."""
@@ -7,7 +7,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from mangum import Mangum
 
-from api_handler import router
+from api_handler import partition_cache, response_class, router
 from client import get_settings
 
 logger = logging.getLogger(__name__)
@@ -18,6 +18,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs" if settings.debug else None,
     redoc_url="/redoc" if settings.debug else None,
+    default_response_class=response_class,
 )
 
 # CORS middleware
@@ -50,4 +51,10 @@ async def health_check() -> dict[str, str]:
     return {"status": "healthy", "api": "skills"}
 
 
+@app.get("/health/cache")
+async def cache_stats() -> dict[str, dict[str, int]]:
+    """In-process cache counters for this container."""
+    return {"partitions": partition_cache.stats()}
+
+
 handler = Mangum(app, lifespan="off")
@@ -1,6 +1,8 @@
 """Data models for Skills API."""
 
-from pydantic import BaseModel, Field
+from functools import lru_cache
+
+from pydantic import BaseModel, Field, create_model
 
 
 class TimestampMixin(BaseModel):
@@ -39,3 +41,25 @@ class SkillResponse(SkillBase, TimestampMixin):
 
     skill_id: str
     user_id: str
+
+
+@lru_cache(maxsize=64)
+def skill_fields_model(fields: tuple[str, ...]) -> type[BaseModel]:
+    """Build a SkillResponse variant with only the given fields, for fields=."""
+    return create_model(
+        "SkillFieldsResponse",
+        **{
+            name: (
+                SkillResponse.model_fields[name].annotation,
+                SkillResponse.model_fields[name],
+            )
+            for name in fields
+        },
+    )
+
+
+class SkillPageResponse(BaseModel):
+    """One page of skills; pass next_cursor as cursor to get the next page."""
+
+    items: list[SkillResponse]
+    next_cursor: str | None = None
@@ -32,3 +32,8 @@ variable "dynamodb_table" {
   description = "DynamoDB table name"
   type        = string
 }
+
+variable "versions_table" {
+  description = "DynamoDB per-user change counter table name"
+  type        = string
+}
@@ -1,5 +1,6 @@
 """Tests for Skills API handler."""
 
+from decimal import Decimal
 from unittest.mock import patch
 
 import pytest
@@ -45,6 +46,24 @@ class TestListSkills:
         assert len(data) == 1
         assert data[0]["name"] == "Python"
 
+    def test_list_skills_decimal_numbers(self, client, mock_dynamodb):
+        """Test that DynamoDB Decimal numbers are rendered as JSON integers."""
+        mock_dynamodb.query.return_value = [
+            {
+                "user_id": "user-1",
+                "skill_id": "skill-1",
+                "name": "Python",
+                "category": "Programming",
+                "level": Decimal("80"),
+            }
+        ]
+
+        response = client.get("/api/v1/skills?user_id=user-1")
+
+        assert response.status_code == 200
+        assert response.json()[0]["level"] == 80
+        assert b'"level":80' in response.content
+
     def test_list_skills_empty(self, client, mock_dynamodb):
         """Test empty skill list."""
         mock_dynamodb.query.return_value = []
@@ -54,6 +73,167 @@ class TestListSkills:
         assert response.status_code == 200
         assert response.json() == []
 
+    def test_list_skills_by_ids(self, client, mock_dynamodb):
+        """Test that ids are fetched in one batch and returned in order."""
+        mock_dynamodb.batch_get.return_value = [
+            {
+                "user_id": "user-1",
+                "skill_id": skill_id,
+                "name": "Python",
+                "level": 80,
+                "category": "Programming",
+                "created_at": "2024-01-01T00:00:00Z",
+                "updated_at": "2024-01-01T00:00:00Z",
+            }
+            for skill_id in ("skill-2", "skill-1")
+        ]
+
+        response = client.get(
+            "/api/v1/skills?user_id=user-1&ids=skill-1,skill-2,missing,skill-1"
+        )
+
+        assert response.status_code == 200
+        assert [item["skill_id"] for item in response.json()] == ["skill-1", "skill-2"]
+        [keys] = mock_dynamodb.batch_get.call_args.args
+        assert keys == [
+            {"user_id": "user-1", "skill_id": "skill-1"},
+            {"user_id": "user-1", "skill_id": "skill-2"},
+            {"user_id": "user-1", "skill_id": "missing"},
+        ]
+        mock_dynamodb.query.assert_not_called()
+
+    @pytest.mark.parametrize("ids", [",", ",".join(str(i) for i in range(501))])
+    def test_list_skills_by_ids_invalid(self, client, mock_dynamodb, ids):
+        """Test that empty and oversized id lists are rejected."""
+        response = client.get(f"/api/v1/skills?user_id=user-1&ids={ids}")
+
+        assert response.status_code == 422
+        mock_dynamodb.batch_get.assert_not_called()
+
+    def test_list_skills_page(self, client, mock_dynamodb):
+        """Test that limit returns one page and a cursor for the next."""
+        mock_dynamodb.query_page.return_value = (
+            [
+                {
+                    "user_id": "user-1",
+                    "skill_id": "skill-1",
+                    "name": "Python",
+                    "level": 80,
+                    "category": "Programming",
+                    "created_at": "2024-01-01T00:00:00Z",
+                    "updated_at": "2024-01-01T00:00:00Z",
+                }
+            ],
+            {"user_id": "user-1", "skill_id": "skill-1"},
+        )
+
+        response = client.get("/api/v1/skills?user_id=user-1&limit=1")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [item["skill_id"] for item in data["items"]] == ["skill-1"]
+        mock_dynamodb.query_page.assert_called_once_with(
+            "user_id", "user-1", 1, None, None
+        )
+
+        mock_dynamodb.query_page.return_value = ([], None)
+        response = client.get(
+            f"/api/v1/skills?user_id=user-1&cursor={data['next_cursor']}"
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"items": [], "next_cursor": None}
+        mock_dynamodb.query_page.assert_called_with(
+            "user_id", "user-1", 50, {"user_id": "user-1", "skill_id": "skill-1"}, None
+        )
+        mock_dynamodb.query.assert_not_called()
+
+    @pytest.mark.parametrize(
+        "params",
+        ["cursor=garbage", "limit=0", "limit=101", "ids=skill-1&limit=10"],
+    )
+    def test_list_skills_page_invalid(self, client, mock_dynamodb, params):
+        """Test that bad cursors, limits and ids with paging are rejected."""
+        response = client.get(f"/api/v1/skills?user_id=user-1&{params}")
+
+        assert response.status_code == 422
+        mock_dynamodb.query_page.assert_not_called()
+
+    def test_list_skills_fields(self, client, mock_dynamodb):
+        """Test that fields becomes a projection and trims the response."""
+        mock_dynamodb.query.return_value = [
+            {"user_id": "user-1", "skill_id": "skill-1", "name": "Python"}
+        ]
+
+        response = client.get("/api/v1/skills?user_id=user-1&fields=name")
+
+        assert response.status_code == 200
+        assert response.json() == [
+            {"user_id": "user-1", "skill_id": "skill-1", "name": "Python"}
+        ]
+        [_, _, projection] = mock_dynamodb.query.call_args.args
+        assert sorted(projection) == sorted(["user_id", "skill_id", "name"])
+
+    def test_list_skills_unknown_fields(self, client, mock_dynamodb):
+        """Test that fields outside the response model are rejected."""
+        response = client.get("/api/v1/skills?user_id=user-1&fields=name,secret")
+
+        assert response.status_code == 422
+        assert response.json()["detail"] == "Unknown fields: secret"
+        mock_dynamodb.query.assert_not_called()
+
+    def test_list_skills_not_modified(self, client, mock_dynamodb):
+        """Test that a matching If-None-Match is answered from the counter."""
+        mock_dynamodb.get_version.return_value = 3
+        mock_dynamodb.query.return_value = [
+            {
+                "user_id": "user-1",
+                "skill_id": "skill-1",
+                "name": "Python",
+                "updated_at": "2024-01-01",
+            }
+        ]
+
+        response = client.get("/api/v1/skills?user_id=user-1")
+        etag = response.headers["ETag"]
+
+        assert etag.startswith('W/"')
+        assert response.headers["Cache-Control"] == "private, no-cache"
+
+        mock_dynamodb.query.reset_mock()
+        response = client.get(
+            "/api/v1/skills?user_id=user-1", headers={"If-None-Match": etag}
+        )
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["ETag"] == etag
+        mock_dynamodb.query.assert_not_called()
+        mock_dynamodb.get_version.assert_called_with("user-1")
+
+    def test_list_skills_modified(self, client, mock_dynamodb):
+        """Test that a stale If-None-Match gets the full list and a new ETag."""
+        mock_dynamodb.get_version.return_value = 3
+        mock_dynamodb.query.return_value = [
+            {
+                "user_id": "user-1",
+                "skill_id": "skill-1",
+                "name": "Python",
+                "updated_at": "2024-01-01",
+            }
+        ]
+        etag = client.get("/api/v1/skills?user_id=user-1").headers["ETag"]
+
+        mock_dynamodb.get_version.return_value = 4
+        response = client.get(
+            "/api/v1/skills?user_id=user-1", headers={"If-None-Match": etag}
+        )
+
+        assert response.status_code == 200
+        assert response.json()[0]["skill_id"] == "skill-1"
+        assert response.headers["ETag"] != etag
+        assert mock_dynamodb.query.call_args.kwargs == {"version": 4}
+
 
 class TestGetSkill:
     """Tests for get skill endpoint."""
@@ -83,6 +263,24 @@ class TestGetSkill:
 
         assert response.status_code == 404
 
+    def test_get_skill_not_modified(self, client, mock_dynamodb):
+        """Test that a matching If-None-Match gets an empty 304."""
+        mock_dynamodb.get_item.return_value = {
+            "user_id": "user-1",
+            "skill_id": "skill-1",
+            "name": "Python",
+            "updated_at": "2024-01-01",
+        }
+        etag = client.get("/api/v1/skills/skill-1?user_id=user-1").headers["ETag"]
+
+        response = client.get(
+            "/api/v1/skills/skill-1?user_id=user-1",
+            headers={"If-None-Match": f'W/"x", {etag}'},
+        )
+
+        assert response.status_code == 304
+        assert response.content == b""
+
 
 class TestCreateSkill:
     """Tests for create skill endpoint."""
@@ -119,7 +317,7 @@ class TestUpdateSkill:
 
     def test_update_skill_success(self, client, mock_dynamodb):
         """Test successful skill update."""
-        mock_dynamodb.get_item.return_value = {
+        existing = {
             "user_id": "user-1",
             "skill_id": "skill-1",
             "name": "Python",
@@ -127,6 +325,10 @@ class TestUpdateSkill:
             "created_at": "2024-01-01T00:00:00Z",
             "updated_at": "2024-01-01T00:00:00Z",
         }
+        mock_dynamodb.update_item.side_effect = lambda key, updates: {
+            **existing,
+            **updates,
+        }
 
         response = client.put(
             "/api/v1/skills/skill-1?user_id=user-1",
@@ -138,7 +340,7 @@ class TestUpdateSkill:
 
     def test_update_skill_not_found(self, client, mock_dynamodb):
         """Test update non-existent skill."""
-        mock_dynamodb.get_item.return_value = None
+        mock_dynamodb.update_item.return_value = None
 
         response = client.put(
             "/api/v1/skills/nonexistent?user_id=user-1",
@@ -153,20 +355,15 @@ class TestDeleteSkill:
 
     def test_delete_skill_success(self, client, mock_dynamodb):
         """Test successful skill deletion."""
-        mock_dynamodb.get_item.return_value = {
-            "user_id": "user-1",
-            "skill_id": "skill-1",
-            "name": "Python",
-        }
-
         response = client.delete("/api/v1/skills/skill-1?user_id=user-1")
 
         assert response.status_code == 204
         mock_dynamodb.delete_item.assert_called_once()
+        mock_dynamodb.get_item.assert_not_called()
 
     def test_delete_skill_not_found(self, client, mock_dynamodb):
         """Test delete non-existent skill."""
-        mock_dynamodb.get_item.return_value = None
+        mock_dynamodb.delete_item.return_value = False
 
         response = client.delete("/api/v1/skills/nonexistent?user_id=user-1")
 
@@ -28,11 +28,31 @@ def dynamodb_table():
         yield table
 
 
+@pytest.fixture
+def versions_table(dynamodb_table):
+    """Create the mock versions table next to the service table."""
+    dynamodb = boto3.resource("dynamodb", region_name="ap-northeast-1")
+    table = dynamodb.create_table(
+        TableName="personal-growth-tracker-versions",
+        KeySchema=[
+            {"AttributeName": "owner_id", "KeyType": "HASH"},
+            {"AttributeName": "scope", "KeyType": "RANGE"},
+        ],
+        AttributeDefinitions=[
+            {"AttributeName": "owner_id", "AttributeType": "S"},
+            {"AttributeName": "scope", "AttributeType": "S"},
+        ],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    table.wait_until_exists()
+    return table
+
+
 class TestSkillsClient:
     """Tests for SkillsClient."""
 
     @mock_aws
-    def test_put_and_get_item(self, dynamodb_table):
+    def test_put_and_get_item(self, versions_table):
         """Test putting and getting an item."""
         from client import SkillsClient
 
@@ -41,6 +61,9 @@ class TestSkillsClient:
             mock_settings.return_value.skills_table_name = (
                 "personal-growth-tracker-skills"
             )
+            mock_settings.return_value.versions_table_name = (
+                "personal-growth-tracker-versions"
+            )
 
             client = SkillsClient()
             item = {
@@ -54,7 +77,7 @@ class TestSkillsClient:
             assert result["name"] == "Python"
 
     @mock_aws
-    def test_delete_item(self, dynamodb_table):
+    def test_delete_item(self, versions_table):
         """Test deleting an item."""
         from client import SkillsClient
 
@@ -63,6 +86,9 @@ class TestSkillsClient:
             mock_settings.return_value.skills_table_name = (
                 "personal-growth-tracker-skills"
             )
+            mock_settings.return_value.versions_table_name = (
+                "personal-growth-tracker-versions"
+            )
 
             client = SkillsClient()
             item = {
@@ -77,7 +103,28 @@ class TestSkillsClient:
             assert result is None
 
     @mock_aws
-    def test_query(self, dynamodb_table):
+    def test_delete_item_not_found(self, versions_table):
+        """Test deleting a missing item reports it as not found."""
+        from client import SkillsClient
+
+        with patch("client.get_settings") as mock_settings:
+            mock_settings.return_value.aws_region = "ap-northeast-1"
+            mock_settings.return_value.skills_table_name = (
+                "personal-growth-tracker-skills"
+            )
+            mock_settings.return_value.versions_table_name = (
+                "personal-growth-tracker-versions"
+            )
+
+            client = SkillsClient()
+
+            assert (
+                client.delete_item({"user_id": "user-1", "skill_id": "missing"})
+                is False
+            )
+
+    @mock_aws
+    def test_query(self, versions_table):
         """Test querying items by partition key."""
         from client import SkillsClient
 
@@ -86,6 +133,9 @@ class TestSkillsClient:
             mock_settings.return_value.skills_table_name = (
                 "personal-growth-tracker-skills"
             )
+            mock_settings.return_value.versions_table_name = (
+                "personal-growth-tracker-versions"
+            )
 
             client = SkillsClient()
             client.put_item(
@@ -98,3 +148,239 @@ class TestSkillsClient:
 
             results = client.query("user_id", "user-1")
             assert len(results) == 2
+
+    @mock_aws
+    def test_update_item(self, versions_table):
+        """Test updating an existing item in place."""
+        from client import SkillsClient
+
+        with patch("client.get_settings") as mock_settings:
+            mock_settings.return_value.aws_region = "ap-northeast-1"
+            mock_settings.return_value.skills_table_name = (
+                "personal-growth-tracker-skills"
+            )
+            mock_settings.return_value.versions_table_name = (
+                "personal-growth-tracker-versions"
+            )
+
+            client = SkillsClient()
+            client.put_item(
+                {"user_id": "user-1", "skill_id": "skill-1", "name": "Python"}
+            )
+
+            key = {"user_id": "user-1", "skill_id": "skill-1"}
+            result = client.update_item(key, {"name": "Updated"})
+
+            assert result["name"] == "Updated"
+            assert client.get_item(key)["name"] == "Updated"
+
+    @mock_aws
+    def test_update_item_not_found(self, versions_table):
+        """Test updating a missing item does not create it."""
+        from client import SkillsClient
+
+        with patch("client.get_settings") as mock_settings:
+            mock_settings.return_value.aws_region = "ap-northeast-1"
+            mock_settings.return_value.skills_table_name = (
+                "personal-growth-tracker-skills"
+            )
+            mock_settings.return_value.versions_table_name = (
+                "personal-growth-tracker-versions"
+            )
+
+            client = SkillsClient()
+            key = {"user_id": "user-1", "skill_id": "missing"}
+
+            assert client.update_item(key, {"name": "Updated"}) is None
+            assert client.get_item(key) is None
+
+    @mock_aws
+    def test_batch_get(self, dynamodb_table):
+        """Test that many keys are fetched across chunks with a projection."""
+        from client import SkillsClient
+
+        with dynamodb_table.batch_writer() as batch:
+            for i in range(150):
+                batch.put_item(
+                    Item={
+                        "user_id": "user-1",
+                        "skill_id": f"skill-{i}",
+                        "name": f"T{i}",
+                    }
+                )
+
+        with patch("client.get_settings") as mock_settings:
+            mock_settings.return_value.aws_region = "ap-northeast-1"
+            client = SkillsClient("personal-growth-tracker-skills")
+            keys = [{"user_id": "user-1", "skill_id": f"skill-{i}"} for i in range(150)]
+
+            items = client.batch_get(
+                [*keys, keys[0], {"user_id": "user-1", "skill_id": "missing"}],
+                projection=["skill_id"],
+            )
+
+        assert len(items) == 150
+        assert all(item.keys() == {"skill_id"} for item in items)
+
+    @mock_aws
+    def test_query_follows_pages(self, dynamodb_table):
+        """Test that query keeps reading until there is no LastEvaluatedKey."""
+        from client import SkillsClient
+
+        with patch("client.get_settings") as mock_settings:
+            mock_settings.return_value.aws_region = "ap-northeast-1"
+            client = SkillsClient("personal-growth-tracker-skills")
+            last_key = {"user_id": "user-1", "skill_id": "skill-1"}
+            with patch.object(
+                client,
+                "query_page",
+                side_effect=[
+                    ([{"skill_id": "skill-1"}], last_key),
+                    ([{"skill_id": "skill-2"}], None),
+                ],
+            ) as query_page:
+                results = client.query("user_id", "user-1")
+
+        assert [item["skill_id"] for item in results] == ["skill-1", "skill-2"]
+        assert query_page.call_args.args == ("user_id", "user-1", None, last_key, None)
+
+    @mock_aws
+    def test_query_projection(self, dynamodb_table):
+        """Test that a projection returns only the named attributes."""
+        from client import SkillsClient
+
+        dynamodb_table.put_item(
+            Item={
+                "user_id": "user-1",
+                "skill_id": "skill-1",
+                "name": "Python",
+                "category": "Long text",
+            }
+        )
+
+        with patch("client.get_settings") as mock_settings:
+            mock_settings.return_value.aws_region = "ap-northeast-1"
+            client = SkillsClient("personal-growth-tracker-skills")
+            items = client.query("user_id", "user-1", ["skill_id", "name"])
+
+        assert items == [{"skill_id": "skill-1", "name": "Python"}]
+
+    @mock_aws
+    def test_query_page_cursor_round_trip(self, dynamodb_table):
+        """Test walking every page through encoded cursors."""
+        from client import SkillsClient, decode_cursor, encode_cursor
+
+        with dynamodb_table.batch_writer() as batch:
+            for i in range(5):
+                batch.put_item(Item={"user_id": "user-1", "skill_id": f"skill-{i}"})
+
+        with patch("client.get_settings") as mock_settings:
+            mock_settings.return_value.aws_region = "ap-northeast-1"
+            client = SkillsClient("personal-growth-tracker-skills")
+            seen, start_key = [], None
+            while True:
+                items, last_key = client.query_page("user_id", "user-1", 2, start_key)
+                seen.extend(item["skill_id"] for item in items)
+                cursor = encode_cursor(last_key)
+                if cursor is None:
+                    break
+                start_key = decode_cursor(
+                    cursor, ("user_id", "skill_id"), user_id="user-1"
+                )
+
+        assert seen == [f"skill-{i}" for i in range(5)]
+
+    @pytest.mark.parametrize(
+        "cursor",
+        [
+            "not-a-cursor!",
+            "WzFd",  # A JSON list
+            "eyJ1c2VyX2lkIjoidXNlci0xIn0",  # No sort key
+        ],
+    )
+    def test_decode_cursor_invalid(self, cursor):
+        """Test that malformed cursors are rejected."""
+        from client import decode_cursor
+
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            decode_cursor(cursor, ("user_id", "skill_id"), user_id="user-1")
+
+    def test_decode_cursor_other_partition(self):
+        """Test that a cursor cannot continue another partition's query."""
+        from client import decode_cursor, encode_cursor
+
+        cursor = encode_cursor({"user_id": "user-2", "skill_id": "skill-1"})
+
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            decode_cursor(cursor, ("user_id", "skill_id"), user_id="user-1")
+
+    @mock_aws
+    def test_version_counter(self, versions_table):
+        """Test that bumps add up per owner and unwritten owners read as 0."""
+        from client import SkillsClient
+
+        with patch("client.get_settings") as mock_settings:
+            mock_settings.return_value.aws_region = "ap-northeast-1"
+            client = SkillsClient(
+                "personal-growth-tracker-skills",
+                versions_table_name="personal-growth-tracker-versions",
+            )
+
+            assert client.get_version("user-1") == 0
+            assert client.bump_version("user-1") == 1
+            assert client.bump_version("user-1") == 2
+            assert client.get_version("user-1") == 2
+            assert client.get_version("other") == 0
+
+        item = versions_table.get_item(Key={"owner_id": "user-1", "scope": "skills"})[
+            "Item"
+        ]
+        assert item["version"] == 2
+
+    @mock_aws
+    def test_writes_bump_owner_version(self, versions_table):
+        """Test that each landed write bumps its owner's counter once."""
+        from client import SkillsClient
+
+        with patch("client.get_settings") as mock_settings:
+            mock_settings.return_value.aws_region = "ap-northeast-1"
+            client = SkillsClient(
+                "personal-growth-tracker-skills",
+                versions_table_name="personal-growth-tracker-versions",
+            )
+            key = {"user_id": "user-1", "skill_id": "item-1"}
+            missing = {"user_id": "user-1", "skill_id": "missing"}
+
+            client.put_item({**key, "name": "A"})
+            client.update_item(key, {"name": "B"})
+            client.update_item(missing, {"name": "B"})
+            client.delete_item(key)
+            client.delete_item(missing)
+
+            assert client.get_version("user-1") == 3
+
+
+class TestClientRegistry:
+    """Tests for the process-wide table registry."""
+
+    def test_clients_share_table(self):
+        """Test that clients for the same table reuse one handle and pool."""
+        from client import SkillsClient
+
+        first = SkillsClient("registry-test")._table
+        second = SkillsClient("registry-test")._table
+
+        assert first is second
+        assert SkillsClient("registry-other")._table.meta.client is first.meta.client
+        assert first.meta.client.meta.config.max_pool_connections == 32
+        assert first.meta.client.meta.config.tcp_keepalive is True
+
+    def test_endpoint_is_part_of_key(self):
+        """Test that another endpoint gets its own resource."""
+        from client import get_table
+
+        default = get_table("registry-test", "ap-northeast-1")
+        local = get_table("registry-test", "ap-northeast-1", "http://localhost:8000")
+
+        assert local is not default
+        assert local.meta.client.meta.endpoint_url == "http://localhost:8000"
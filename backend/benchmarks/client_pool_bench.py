@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Compare per-request DynamoDB clients with the shared client registry.
+
+Points the Goals client at a local stub DynamoDB endpoint and times a
+GetItem round trip three ways: building a boto3 resource per request (what
+the handlers used to do), reusing one client built per container, and
+reusing the process-wide registry through new client objects per request.
+
+Usage:
+    python benchmarks/client_pool_bench.py [--requests 200]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+from collections.abc import Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import boto3
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "apis" / "goals"))
+
+from client import GoalsClient  # noqa: E402
+
+TABLE = "bench-goals"
+KEY = {"user_id": "user-1", "goal_id": "goal-1"}
+
+
+class StubDynamoDB(BaseHTTPRequestHandler):
+    """DynamoDB stand-in answering every request with an empty item."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-amz-json-1.0")
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+def timed(requests: int, get_item: Callable[[], object]) -> list[float]:
+    """Run get_item repeatedly and return each latency in milliseconds."""
+    latencies = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        get_item()
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+def main() -> None:
+    """Run the benchmark and print latency percentiles per strategy."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "bench")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "bench")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubDynamoDB)
+    threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+    ).start()
+    endpoint_url = f"http://127.0.0.1:{server.server_port}"
+
+    def per_request_resource() -> object:
+        table = boto3.resource(
+            "dynamodb", region_name="ap-northeast-1", endpoint_url=endpoint_url
+        ).Table(TABLE)
+        return table.get_item(Key=KEY)
+
+    shared = GoalsClient(TABLE, endpoint_url)
+
+    def shared_client() -> object:
+        return shared.get_item(KEY)
+
+    def registry() -> object:
+        return GoalsClient(TABLE, endpoint_url).get_item(KEY)
+
+    print(f"{args.requests} GetItem requests against a local stub")
+    for name, get_item in [
+        ("per-request resource", per_request_resource),
+        ("shared client", shared_client),
+        ("registry, new client", registry),
+    ]:
+        latencies = timed(args.requests, get_item)
+        p50 = statistics.median(latencies)
+        p99 = statistics.quantiles(latencies, n=100)[98]
+        print(f"{name:<22} p50 {p50:7.2f} ms  p99 {p99:7.2f} ms")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
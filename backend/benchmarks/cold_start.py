@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Measure the import time of each API's Lambda entry point.
+
+Every service's main module is imported in a fresh interpreter with
+``python -X importtime``, which is what a Lambda cold start pays before the
+first request. The median over several runs is compared with a per-service
+budget and the slowest modules are listed, so that an eager import or a
+client built at import time shows up as a regression.
+
+Usage:
+    python benchmarks/cold_start.py [--runs 5] [--top 5] [--budget-scale 1.0]
+        [service ...]
+
+Exits with status 1 when a service exceeds its budget.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+APIS_DIR = Path(__file__).resolve().parent.parent / "apis"
+
+# Median import time of main in milliseconds. FastAPI and boto3 account for
+# most of it; set with headroom over a local run, scale for slower machines.
+BUDGET_MS = {
+    "goals": 700,
+    "skills": 700,
+    "roadmaps": 700,
+    "habits": 700,
+}
+DEFAULT_BUDGET_MS = 700
+
+
+def import_times(service: str) -> dict[str, tuple[int, int]]:
+    """Import a service's main module once and parse -X importtime output.
+
+    Returns:
+        Module name -> (self, cumulative) import time in microseconds
+    """
+    env = {**os.environ, "AWS_DEFAULT_REGION": "ap-northeast-1"}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=APIS_DIR / service,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        if not self_us.strip().isdigit():
+            continue  # Header line
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def main() -> None:
+    """Run the harness and print per-service results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("services", nargs="*", help="Defaults to every API")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=5, help="Slowest modules shown")
+    parser.add_argument("--budget-scale", type=float, default=1.0)
+    args = parser.parse_args()
+
+    services = args.services or sorted(
+        p.parent.name for p in APIS_DIR.glob("*/main.py")
+    )
+    over_budget = []
+    for service in services:
+        runs = [import_times(service) for _ in range(args.runs)]
+        median_ms = statistics.median(run["main"][1] for run in runs) / 1000
+        budget_ms = BUDGET_MS.get(service, DEFAULT_BUDGET_MS) * args.budget_scale
+        status = "ok" if median_ms <= budget_ms else "OVER BUDGET"
+        if median_ms > budget_ms:
+            over_budget.append(service)
+        print(
+            f"{service:<10} {median_ms:7.1f} ms median of {args.runs} "
+            f"(budget {budget_ms:.0f} ms) {status}"
+        )
+
+        slowest = sorted(runs[-1].items(), key=lambda item: item[1][0], reverse=True)[
+            : args.top
+        ]
+        for name, (self_us, cumulative_us) in slowest:
+            print(
+                f"    {self_us / 1000:7.1f} ms self {cumulative_us / 1000:7.1f} ms "
+                f"cumulative  {name}"
+            )
+
+    if over_budget:
+        print(f"Over budget: {', '.join(over_budget)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""Measure the CPU spent rendering list responses, per endpoint.
+
+For every endpoint that returns items read from DynamoDB, the response body
+is rendered two ways from the same items:
+
+- legacy: build a response model per item, then let FastAPI validate and
+  serialise the result again for response_model (what the handlers did)
+- fast: validate the items once with a TypeAdapter and dump JSON bytes
+
+Each service is measured in its own interpreter, because the APIs share
+module names. Numbers come back as Decimal, as they do from boto3.
+
+Usage:
+    python benchmarks/response_bench.py [--items 100] [--iterations 200]
+        [service ...]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+
+APIS_DIR = Path(__file__).resolve().parent.parent / "apis"
+SERVICES = ["goals", "skills", "roadmaps", "habits"]
+
+TIMESTAMPS = {
+    "created_at": "2024-01-01T00:00:00+00:00",
+    "updated_at": "2024-01-02T00:00:00+00:00",
+}
+
+
+def goal_items(n: int) -> list[dict[str, Any]]:
+    """Goals as stored in DynamoDB."""
+    return [
+        {
+            "user_id": "user-1",
+            "goal_id": f"goal-{i}",
+            "title": f"Goal {i}",
+            "description": "Read one chapter a day " * 4,
+            "target_date": "2024-12-31",
+            "status": "in_progress",
+            "priority": Decimal(i % 10),
+            **TIMESTAMPS,
+        }
+        for i in range(n)
+    ]
+
+
+def skill_items(n: int) -> list[dict[str, Any]]:
+    """Skills as stored in DynamoDB."""
+    return [
+        {
+            "user_id": "user-1",
+            "skill_id": f"skill-{i}",
+            "name": f"Skill {i}",
+            "category": "Programming",
+            "level": Decimal(i % 100 + 1),
+            "description": "Practice katas every morning " * 4,
+            **TIMESTAMPS,
+        }
+        for i in range(n)
+    ]
+
+
+def milestone_items(n: int) -> list[dict[str, Any]]:
+    """Roadmap milestones as stored in DynamoDB."""
+    return [
+        {
+            "goal_id": "goal-1",
+            "milestone_id": f"milestone-{i}",
+            "title": f"Milestone {i}",
+            "description": "Finish the exercises " * 4,
+            "target_date": "2024-06-30",
+            "status": "not_started",
+            "order": Decimal(i),
+            **TIMESTAMPS,
+        }
+        for i in range(n)
+    ]
+
+
+def habit_items(n: int) -> list[dict[str, Any]]:
+    """Habits as stored in DynamoDB."""
+    return [
+        {
+            "user_id": "user-1",
+            "habit_id": f"habit-{i}",
+            "name": f"Habit {i}",
+            "description": "Ten minutes after lunch " * 4,
+            "frequency": "daily",
+            "reminder_time": "21:00",
+            "reminder_enabled": True,
+            "color": "#22c55e",
+            "is_active": True,
+            **TIMESTAMPS,
+        }
+        for i in range(n)
+    ]
+
+
+def log_items(n: int) -> list[dict[str, Any]]:
+    """Logs of one habit as stored in DynamoDB."""
+    return [
+        {
+            "habit_id": "habit-1",
+            "user_id": "user-1",
+            "date": f"2024-{i // 28 % 12 + 1:02d}-{i % 28 + 1:02d}",
+            "completed": True,
+            "note": "Done",
+            "created_at": TIMESTAMPS["created_at"],
+        }
+        for i in range(n)
+    ]
+
+
+def cases(
+    service: str, n: int
+) -> list[tuple[str, Callable[[], Any], Callable[[], Any]]]:
+    """Return (endpoint, legacy render, fast render) for a service."""
+    import api_handler as h
+    import models as m
+
+    def route_field(app_routes: list[Any], path: str) -> Any:
+        return next(
+            r.response_field
+            for r in app_routes
+            if getattr(r, "path", None) == path and "GET" in r.methods
+        )
+
+    def legacy(path: str, build: Callable[[], Any], routes: Any = None) -> Callable:
+        field = route_field(routes or h.router.routes, path)
+        return lambda: _legacy_render(field, build())
+
+    def fast(adapter: Any, content: Callable[[], Any]) -> Callable:
+        return lambda: h._json_response(adapter, content()).body
+
+    def page(items: list[dict[str, Any]]) -> dict[str, Any]:
+        return {"items": items, "next_cursor": "eyJ9"}
+
+    if service == "habits":
+        import main
+        from contribution import (
+            calculate_contribution_level,
+            encode_contributions,
+            generate_year_dates,
+        )
+
+        habits, logs = habit_items(n), log_items(n)
+        counts = {f"2024-01-{d:02d}": d % 4 for d in range(1, 32)}
+        today = {
+            "date": "2024-01-15",
+            "logs": {f"habit-{i}": logs[0] if i % 2 else None for i in range(n)},
+        }
+        return [
+            (
+                "GET /habits",
+                legacy("/habits", lambda: [m.HabitResponse(**i) for i in habits]),
+                fast(h.habit_list_adapter, lambda: habits),
+            ),
+            (
+                "GET /habits?limit",
+                legacy(
+                    "/habits",
+                    lambda: m.HabitPageResponse(
+                        items=[m.HabitResponse(**i) for i in habits],
+                        next_cursor="eyJ9",
+                    ),
+                ),
+                fast(h.habit_page_adapter, lambda: page(habits)),
+            ),
+            (
+                "GET /habits/{id}/logs",
+                legacy(
+                    "/habits/{habit_id}/logs",
+                    lambda: [m.HabitLogResponse(**i) for i in logs],
+                ),
+                fast(h.habit_log_list_adapter, lambda: logs),
+            ),
+            (
+                "GET /habits/today",
+                legacy(
+                    "/habits/today",
+                    lambda: m.HabitDailyStatusResponse(
+                        date=today["date"],
+                        logs={
+                            k: m.HabitLogResponse(**v) if v else None
+                            for k, v in today["logs"].items()
+                        },
+                    ),
+                ),
+                fast(h.daily_status_adapter, lambda: today),
+            ),
+            (
+                "GET /habits/contributions",
+                legacy(
+                    "/api/v1/habits/contributions",
+                    lambda: m.ContributionResponse(
+                        year=2024,
+                        total_contributions=sum(counts.values()),
+                        data=[
+                            m.ContributionData(
+                                date=d,
+                                count=counts.get(d, 0),
+                                level=calculate_contribution_level(counts.get(d, 0), 4),
+                            )
+                            for d in generate_year_dates(2024)
+                        ],
+                    ),
+                    main.app.routes,
+                ),
+                lambda: encode_contributions(counts, 2024, 4),
+            ),
+        ]
+
+    make_items, name = {
+        "goals": (goal_items, "Goal"),
+        "skills": (skill_items, "Skill"),
+        "roadmaps": (milestone_items, "Roadmap"),
+    }[service]
+    items, prefix = make_items(n), name.lower()
+    model = getattr(m, f"{name}Response")
+    page_model = getattr(m, f"{name}PageResponse")
+    return [
+        (
+            f"GET /{service}",
+            legacy(f"/{service}", lambda: [model(**i) for i in items]),
+            fast(getattr(h, f"{prefix}_list_adapter"), lambda: items),
+        ),
+        (
+            f"GET /{service}?limit",
+            legacy(
+                f"/{service}",
+                lambda: page_model(
+                    items=[model(**i) for i in items], next_cursor="eyJ9"
+                ),
+            ),
+            fast(getattr(h, f"{prefix}_page_adapter"), lambda: page(items)),
+        ),
+    ]
+
+
+def _legacy_render(field: Any, content: Any) -> bytes:
+    """Render content the way FastAPI does for a handler's return value."""
+    from fastapi.responses import JSONResponse
+    from fastapi.routing import serialize_response
+
+    # serialize_response never awaits for async endpoints, so step the
+    # coroutine directly rather than timing an event loop per call
+    coroutine = serialize_response(field=field, response_content=content)
+    try:
+        coroutine.send(None)
+    except StopIteration as done:
+        return JSONResponse(done.value).body
+    raise RuntimeError("serialize_response suspended")
+
+
+def cpu_us(render: Callable[[], Any], iterations: int) -> float:
+    """Return the mean process CPU time of render in microseconds."""
+    render()  # Warm up lazily built validators and serializers
+    started = time.process_time()
+    for _ in range(iterations):
+        render()
+    return (time.process_time() - started) / iterations * 1_000_000
+
+
+def worker(service: str, items: int, iterations: int) -> None:
+    """Measure one service in this interpreter and print JSON results."""
+    sys.path.insert(0, str(APIS_DIR / service))
+    results = []
+    for endpoint, legacy, fast in cases(service, items):
+        assert json.loads(legacy()) == json.loads(fast()), endpoint
+        results.append(
+            {
+                "endpoint": endpoint,
+                "legacy_us": cpu_us(legacy, iterations),
+                "fast_us": cpu_us(fast, iterations),
+            }
+        )
+    print(json.dumps(results))
+
+
+def main() -> None:
+    """Run every service's measurements and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("services", nargs="*", help="Defaults to every API")
+    parser.add_argument("--items", type=int, default=100, help="Items per response")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.worker, args.items, args.iterations)
+        return
+
+    print(f"{args.items} items per response, {args.iterations} iterations")
+    print(f"{'endpoint':<28} {'legacy':>10} {'fast':>10} {'saved':>7}")
+    for service in args.services or SERVICES:
+        output = subprocess.run(
+            [
+                sys.executable,
+                __file__,
+                "--worker",
+                service,
+                "--items",
+                str(args.items),
+                "--iterations",
+                str(args.iterations),
+            ],
+            cwd=APIS_DIR / service,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        for result in json.loads(output.splitlines()[-1]):
+            legacy_us, fast_us = result["legacy_us"], result["fast_us"]
+            print(
+                f"{result['endpoint']:<28} {legacy_us:8.0f}us {fast_us:8.0f}us "
+                f"{1 - fast_us / legacy_us:6.0%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""Measure cache hit rate and read capacity of change counter validation.
+
+Simulated browsers poll GET /goals of random users through the real goals
+API, backed by moto, and revalidate with the ETag of their last response;
+a share of the requests update or create a goal instead. Every 304 is a
+cache hit: the browser reuses its copy and the API reads only the user's
+change counter.
+
+moto does not size consumed capacity like DynamoDB, so read units are
+estimated from item sizes for three ways of answering each poll:
+
+- full query: no validation, every poll reads every goal
+- item versions: a (goal_id, updated_at) query decides, then the full query
+  on a miss; a projection still consumes the size of whole items
+- change counter: one strongly consistent GetItem decides, then the full
+  query on a miss (what the API does)
+
+The counter read is strongly consistent and costs a full unit, so users
+whose goals fit in one 4 KB unit read slightly more than before; the saving
+grows with the size of the list.
+
+Usage:
+    python benchmarks/version_bench.py [--users 20] [--goals 40]
+        [--requests 2000] [--write-ratio 0.01 0.05 0.2]
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+from collections import Counter
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+
+import boto3
+from moto import mock_aws
+
+APIS_DIR = Path(__file__).resolve().parent.parent / "apis"
+GOALS_TABLE = "personal-growth-tracker-goals"
+VERSIONS_TABLE = "personal-growth-tracker-versions"
+
+# DynamoDB reads in 4 KB units; eventually consistent queries cost half
+READ_UNIT_BYTES = 4096
+
+
+def item_size(item: dict[str, Any]) -> int:
+    """Approximate the stored size of an item as DynamoDB bills it."""
+    size = 0
+    for name, value in item.items():
+        size += len(name.encode())
+        if isinstance(value, bool) or value is None:
+            size += 1
+        elif isinstance(value, int | float | Decimal):
+            size += len(str(value).lstrip("-").replace(".", "")) // 2 + 1
+        else:
+            size += len(str(value).encode())
+    return size
+
+
+def query_rcus(items: list[dict[str, Any]]) -> float:
+    """Read units of an eventually consistent query returning items."""
+    total = sum(item_size(item) for item in items)
+    return max(1, math.ceil(total / READ_UNIT_BYTES)) * 0.5
+
+
+def create_tables() -> None:
+    """Create the goals and versions tables."""
+    dynamodb = boto3.resource("dynamodb", region_name="ap-northeast-1")
+    for name, hash_key, range_key in [
+        (GOALS_TABLE, "user_id", "goal_id"),
+        (VERSIONS_TABLE, "owner_id", "scope"),
+    ]:
+        dynamodb.create_table(
+            TableName=name,
+            KeySchema=[
+                {"AttributeName": hash_key, "KeyType": "HASH"},
+                {"AttributeName": range_key, "KeyType": "RANGE"},
+            ],
+            AttributeDefinitions=[
+                {"AttributeName": hash_key, "AttributeType": "S"},
+                {"AttributeName": range_key, "AttributeType": "S"},
+            ],
+            BillingMode="PAY_PER_REQUEST",
+        )
+
+
+def goal_body(i: int) -> dict[str, Any]:
+    """A goal as a user would submit it."""
+    return {
+        "title": f"Goal {i}",
+        "description": "Read one chapter a day and write a short summary " * 4,
+        "target_date": "2024-12-31",
+        "priority": i % 10,
+    }
+
+
+def run(
+    api: Any, users: int, goals: int, requests: int, write_ratio: float, seed: int
+) -> dict[str, float]:
+    """Run one workload and return counts and estimated read units."""
+    rng = random.Random(seed)
+    stored: dict[str, dict[str, dict[str, Any]]] = {}
+    for u in range(users):
+        user_id = f"user-{seed}-{u}"
+        stored[user_id] = {}
+        for i in range(goals):
+            item = api.post(f"/api/v1/goals?user_id={user_id}", json=goal_body(i))
+            stored[user_id][item.json()["goal_id"]] = item.json()
+
+    etags: dict[str, str] = {}
+    stats: Counter[str] = Counter()
+    for n in range(requests):
+        user_id = rng.choice(list(stored))
+        if rng.random() < write_ratio:
+            stats["writes"] += 1
+            if rng.random() < 0.5:
+                goal_id = rng.choice(list(stored[user_id]))
+                response = api.put(
+                    f"/api/v1/goals/{goal_id}?user_id={user_id}",
+                    json={"title": f"Updated {n}"},
+                )
+            else:
+                response = api.post(
+                    f"/api/v1/goals?user_id={user_id}", json=goal_body(n)
+                )
+            item = response.json()
+            stored[user_id][item["goal_id"]] = item
+            continue
+
+        stats["reads"] += 1
+        headers = {}
+        if user_id in etags:
+            headers["If-None-Match"] = etags[user_id]
+        response = api.get(f"/api/v1/goals?user_id={user_id}", headers=headers)
+        partition = query_rcus(list(stored[user_id].values()))
+        stats["full_query_rcus"] += partition
+        if response.status_code == 304:
+            stats["hits"] += 1
+            stats["item_versions_rcus"] += partition
+            stats["counter_rcus"] += 1
+            continue
+        assert response.status_code == 200, response.status_code
+        assert len(response.json()) == len(stored[user_id])
+        etags[user_id] = response.headers["ETag"]
+        revalidated = bool(headers)
+        stats["item_versions_rcus"] += partition * (2 if revalidated else 1)
+        stats["counter_rcus"] += 1 + partition
+    return stats
+
+
+def main() -> None:
+    """Run the workloads and print hit rates and read units per strategy."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--goals", type=int, default=40, help="Goals per user")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument(
+        "--write-ratio", type=float, nargs="+", default=[0.01, 0.05, 0.2]
+    )
+    args = parser.parse_args()
+
+    os.environ.setdefault("AWS_DEFAULT_REGION", "ap-northeast-1")
+    sys.path.insert(0, str(APIS_DIR / "goals"))
+    with mock_aws():
+        create_tables()
+        from fastapi.testclient import TestClient
+        from main import app
+
+        api = TestClient(app)
+        print(
+            f"{args.users} users x {args.goals} goals, {args.requests} requests; "
+            "read units per poll"
+        )
+        print(
+            f"{'writes':>6} {'hit rate':>9} {'full query':>11} "
+            f"{'item versions':>14} {'counter':>8} {'saved':>6} {'bump WCUs':>10}"
+        )
+        for seed, ratio in enumerate(args.write_ratio):
+            stats = run(api, args.users, args.goals, args.requests, ratio, seed)
+            reads = stats["reads"]
+            full, versions, counter = (
+                stats[key] / reads
+                for key in ("full_query_rcus", "item_versions_rcus", "counter_rcus")
+            )
+            print(
+                f"{ratio:6.0%} {stats['hits'] / reads:9.1%} {full:11.2f} "
+                f"{versions:14.2f} {counter:8.2f} {1 - counter / versions:6.0%} "
+                f"{stats['writes']:10.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -227,20 +227,13 @@ export function useTodayHabits() {
 
     setLogsLoading(true);
     try {
+      const status = await habitsService.getDailyStatus(today);
       const logsMap = new Map<string, HabitLog>();
-      await Promise.all(
-        habits.map(async (habit) => {
-          const logs = await habitsService.getLogs(
-            habit.habit_id,
-            today,
-            today
-          );
-          const firstLog = logs[0];
-          if (firstLog) {
-            logsMap.set(habit.habit_id, firstLog);
-          }
-        })
-      );
+      for (const [habitId, log] of Object.entries(status.logs)) {
+        if (log) {
+          logsMap.set(habitId, log);
+        }
+      }
       setTodayLogs(logsMap);
     } finally {
       setLogsLoading(false);
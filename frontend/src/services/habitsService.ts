@@ -5,6 +5,7 @@ import type {
   UpdateHabitInput,
   HabitLog,
   CreateHabitLogInput,
+  HabitDailyStatus,
   ContributionResponse,
 } from "@/types";
 
@@ -32,6 +33,11 @@ interface HabitLogApiResponse {
   note: string | null;
 }
 
+interface HabitDailyStatusApiResponse {
+  date: string;
+  logs: Record<string, HabitLogApiResponse | null>;
+}
+
 function mapResponseToHabit(response: HabitApiResponse): Habit {
   return {
     ...response,
@@ -90,6 +96,18 @@ export const habitsService = {
     return data.map(mapResponseToHabitLog);
   },
 
+  async getDailyStatus(date?: string): Promise<HabitDailyStatus> {
+    const dateParam = date ? `&date=${date}` : "";
+    const data = await apiClient.get<HabitDailyStatusApiResponse>(
+      `/habits/today?user_id=${USER_ID}${dateParam}`
+    );
+    const logs: HabitDailyStatus["logs"] = {};
+    for (const [habitId, log] of Object.entries(data.logs)) {
+      logs[habitId] = log ? mapResponseToHabitLog(log) : null;
+    }
+    return { date: data.date, logs };
+  },
+
   async createLog(
     habitId: string,
     data: CreateHabitLogInput
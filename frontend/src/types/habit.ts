@@ -41,6 +41,11 @@ export interface HabitLog {
   note: string | null;
 }
 
+export interface HabitDailyStatus {
+  date: string;
+  logs: Record<string, HabitLog | null>;
+}
+
 export interface CreateHabitLogInput {
   date: string;
   completed?: boolean;
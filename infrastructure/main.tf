@@ -81,14 +81,16 @@ module "dynamodb" {
 module "lambda" {
   source = "./modules/lambda"
 
-  project_name          = var.project_name
-  apis                  = var.apis
-  goals_table_name      = module.dynamodb.goals_table_name
-  roadmaps_table_name   = module.dynamodb.roadmaps_table_name
-  skills_table_name     = module.dynamodb.skills_table_name
-  habits_table_name     = module.dynamodb.habits_table_name
-  habit_logs_table_name = module.dynamodb.habit_logs_table_name
-  slack_webhook_url     = var.slack_webhook_url
+  project_name                   = var.project_name
+  apis                           = var.apis
+  goals_table_name               = module.dynamodb.goals_table_name
+  roadmaps_table_name            = module.dynamodb.roadmaps_table_name
+  skills_table_name              = module.dynamodb.skills_table_name
+  habits_table_name              = module.dynamodb.habits_table_name
+  habit_logs_table_name          = module.dynamodb.habit_logs_table_name
+  habit_contributions_table_name = module.dynamodb.habit_contributions_table_name
+  versions_table_name            = module.dynamodb.versions_table_name
+  slack_webhook_url              = var.slack_webhook_url
 }
 
 module "api_gateway" {
@@ -64,6 +64,19 @@ resource "aws_dynamodb_table" "habits" {
     name = "habit_id"
     type = "S"
   }
+
+  attribute {
+    name = "reminder_slot"
+    type = "N"
+  }
+
+  # Sparse: only habits with an enabled reminder carry reminder_slot
+  global_secondary_index {
+    name            = "reminder_slot-index"
+    hash_key        = "reminder_slot"
+    range_key       = "user_id"
+    projection_type = "ALL"
+  }
 }
 
 resource "aws_dynamodb_table" "habit_logs" {
@@ -95,6 +108,42 @@ resource "aws_dynamodb_table" "habit_logs" {
   }
 }
 
+resource "aws_dynamodb_table" "habit_contributions" {
+  name         = "personal-growth-tracker-habit-contributions"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "user_id"
+  range_key    = "year"
+
+  attribute {
+    name = "user_id"
+    type = "S"
+  }
+
+  attribute {
+    name = "year"
+    type = "N"
+  }
+}
+
+# One change counter per (owner_id, scope), shared by every API; writes bump
+# it so readers can validate cached lists with a single GetItem
+resource "aws_dynamodb_table" "versions" {
+  name         = "personal-growth-tracker-versions"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "owner_id"
+  range_key    = "scope"
+
+  attribute {
+    name = "owner_id"
+    type = "S"
+  }
+
+  attribute {
+    name = "scope"
+    type = "S"
+  }
+}
+
 output "goals_table_name" {
   value = aws_dynamodb_table.goals.name
 }
@@ -114,3 +163,11 @@ output "habits_table_name" {
 output "habit_logs_table_name" {
   value = aws_dynamodb_table.habit_logs.name
 }
+
+output "habit_contributions_table_name" {
+  value = aws_dynamodb_table.habit_contributions.name
+}
+
+output "versions_table_name" {
+  value = aws_dynamodb_table.versions.name
+}
@@ -41,6 +41,18 @@ variable "habit_logs_table_name" {
   default     = "personal-growth-tracker-habit-logs"
 }
 
+variable "habit_contributions_table_name" {
+  description = "DynamoDB habit contributions aggregate table name"
+  type        = string
+  default     = "personal-growth-tracker-habit-contributions"
+}
+
+variable "versions_table_name" {
+  description = "DynamoDB per-user change counter table name"
+  type        = string
+  default     = "personal-growth-tracker-versions"
+}
+
 variable "slack_webhook_url" {
   description = "Slack webhook URL for habit reminders"
   type        = string
@@ -49,9 +61,23 @@ variable "slack_webhook_url" {
 }
 
 variable "reminder_schedule" {
-  description = "Cron expression for habit reminder (default: 9pm JST daily)"
+  description = "Cron expression for habit reminder runs, one per reminder slot"
   type        = string
-  default     = "cron(0 12 * * ? *)" # 21:00 JST = 12:00 UTC
+  default     = "cron(0/15 * * * ? *)" # every 15 minutes, matches reminder_slot_minutes
+}
+
+variable "reminder_slot_minutes" {
+  description = "Width of a reminder slot in minutes; must match reminder_schedule"
+  type        = number
+  default     = 15
+}
+
+variable "reminder_digest_window_seconds" {
+  # Per-user messages are spaced ~1 s apart per webhook (Slack's rate limit),
+  # so a large run without digests outlasts the Lambda timeout
+  description = "Combine a run's reminders into one Slack digest per webhook (0 = one message per user)"
+  type        = number
+  default     = 10
 }
 
 data "aws_caller_identity" "current" {}
@@ -101,6 +127,7 @@ data "aws_iam_policy_document" "lambda_policy" {
       "dynamodb:DeleteItem",
       "dynamodb:Query",
       "dynamodb:Scan",
+      "dynamodb:BatchGetItem",
       "dynamodb:BatchWriteItem"
     ]
     resources = [
@@ -108,10 +135,20 @@ data "aws_iam_policy_document" "lambda_policy" {
       "arn:aws:dynamodb:*:*:table/${var.roadmaps_table_name}",
       "arn:aws:dynamodb:*:*:table/${var.skills_table_name}",
       "arn:aws:dynamodb:*:*:table/${var.habits_table_name}",
+      "arn:aws:dynamodb:*:*:table/${var.habits_table_name}/index/*",
       "arn:aws:dynamodb:*:*:table/${var.habit_logs_table_name}",
-      "arn:aws:dynamodb:*:*:table/${var.habit_logs_table_name}/index/*"
+      "arn:aws:dynamodb:*:*:table/${var.habit_logs_table_name}/index/*",
+      "arn:aws:dynamodb:*:*:table/${var.habit_contributions_table_name}",
+      "arn:aws:dynamodb:*:*:table/${var.versions_table_name}"
     ]
   }
+
+  # The habits API hands very large log deletions to an async invocation of itself
+  statement {
+    sid       = "HabitsSelfInvoke"
+    actions   = ["lambda:InvokeFunction"]
+    resources = ["arn:aws:lambda:*:*:function:${var.project_name}-habits"]
+  }
 }
 
 resource "aws_iam_role_policy" "lambda" {
@@ -171,13 +208,16 @@ resource "aws_lambda_function" "api" {
 
   environment {
     variables = {
-      GOALS_TABLE_NAME      = var.goals_table_name
-      ROADMAPS_TABLE_NAME   = var.roadmaps_table_name
-      SKILLS_TABLE_NAME     = var.skills_table_name
-      HABITS_TABLE_NAME     = var.habits_table_name
-      HABIT_LOGS_TABLE_NAME = var.habit_logs_table_name
-      SLACK_WEBHOOK_URL     = var.slack_webhook_url
-      DEBUG                 = "false"
+      GOALS_TABLE_NAME               = var.goals_table_name
+      ROADMAPS_TABLE_NAME            = var.roadmaps_table_name
+      SKILLS_TABLE_NAME              = var.skills_table_name
+      HABITS_TABLE_NAME              = var.habits_table_name
+      HABIT_LOGS_TABLE_NAME          = var.habit_logs_table_name
+      HABIT_CONTRIBUTIONS_TABLE_NAME = var.habit_contributions_table_name
+      VERSIONS_TABLE_NAME            = var.versions_table_name
+      SLACK_WEBHOOK_URL              = var.slack_webhook_url
+      REMINDER_SLOT_MINUTES          = var.reminder_slot_minutes
+      DEBUG                          = "false"
     }
   }
 
@@ -229,10 +269,14 @@ resource "aws_lambda_function" "habit_reminder" {
 
   environment {
     variables = {
-      HABITS_TABLE_NAME     = var.habits_table_name
-      HABIT_LOGS_TABLE_NAME = var.habit_logs_table_name
-      SLACK_WEBHOOK_URL     = var.slack_webhook_url
-      DEBUG                 = "false"
+      HABITS_TABLE_NAME              = var.habits_table_name
+      HABIT_LOGS_TABLE_NAME          = var.habit_logs_table_name
+      HABIT_CONTRIBUTIONS_TABLE_NAME = var.habit_contributions_table_name
+      VERSIONS_TABLE_NAME            = var.versions_table_name
+      SLACK_WEBHOOK_URL              = var.slack_webhook_url
+      REMINDER_SLOT_MINUTES          = var.reminder_slot_minutes
+      REMINDER_DIGEST_WINDOW_SECONDS = var.reminder_digest_window_seconds
+      DEBUG                          = "false"
     }
   }
 
@@ -268,7 +312,7 @@ resource "aws_cloudwatch_event_target" "habit_reminder" {
   rule      = aws_cloudwatch_event_rule.habit_reminder[0].name
   target_id = "habit-reminder-lambda"
   arn       = aws_lambda_function.habit_reminder[0].arn
-  input     = jsonencode({ user_id = "default" })
+  input     = jsonencode({ due_now = true })
 }
 
 resource "aws_lambda_permission" "habit_reminder" {